@@ -136,6 +136,7 @@ async def main():
         # Clear old data files
         files_to_delete = [
             "graph_chunk_entity_relation.graphml",
+            "graph_chunk_entity_relation.npz",
             "kv_store_doc_status.json",
             "kv_store_full_docs.json",
             "kv_store_text_chunks.json",
@@ -941,13 +941,19 @@ def create_app(args):
     # Configure rerank function based on args.rerank_bindingparameter
     rerank_model_func = None
     if args.rerank_binding != "null":
-        from lightrag.rerank import cohere_rerank, jina_rerank, ali_rerank
+        from lightrag.rerank import (
+            cohere_rerank,
+            jina_rerank,
+            ali_rerank,
+            local_rerank,
+        )
 
         # Map rerank binding to corresponding function
         rerank_functions = {
             "cohere": cohere_rerank,
             "jina": jina_rerank,
             "aliyun": ali_rerank,
+            "local": local_rerank,
         }
 
         # Select the appropriate rerank function based on binding
@@ -973,9 +979,22 @@ def create_app(args):
                     args.rerank_binding_host = default_base_url
 
         async def server_rerank_func(
-            query: str, documents: list, top_n: int = None, extra_body: dict = None
+            query: str,
+            documents: list,
+            top_n: int = None,
+            extra_body: dict = None,
+            document_ids: list = None,
         ):
             """Server rerank function with configuration from environment variables"""
+            if args.rerank_binding == "local":
+                # The local reranker caches scores by chunk id
+                return await selected_rerank_func(
+                    query=query,
+                    documents=documents,
+                    top_n=top_n,
+                    model=args.rerank_model,
+                    document_ids=document_ids,
+                )
             return await selected_rerank_func(
                 query=query,
                 documents=documents,
@@ -8,6 +8,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from enum import Enum
 import os
+import numpy as np
 from dotenv import load_dotenv
 from dataclasses import dataclass, field
 from typing import (
@@ -175,6 +176,14 @@ class QueryParam:
     containing citation information for the retrieved content.
     """
 
+    search_branch_timeout: float | None = (
+        float(os.getenv("SEARCH_BRANCH_TIMEOUT", "0")) or None
+    )
+    """Deadline in seconds for each concurrent retrieval branch (local, global, vector).
+    A branch that exceeds it is dropped and the query continues with the results of
+    the other branches. None waits for every branch.
+    """
+
 
 @dataclass
 class StorageNameSpace(ABC):
@@ -321,6 +330,29 @@ class BaseVectorStorage(StorageNameSpace, ABC):
         """
         pass
 
+    async def get_vector_matrix_by_ids(
+        self, ids: list[str]
+    ) -> tuple[list[str], np.ndarray]:
+        """Get vectors by their IDs stacked into a single float32 matrix
+
+        Storages that keep vectors in memory override this to fill the matrix
+        directly instead of going through lists of floats.
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            (found_ids, matrix): the unique IDs that have a vector and a
+            (len(found_ids), dim) float32 matrix whose rows follow found_ids
+        """
+        vectors = await self.get_vectors_by_ids(ids)
+        found_ids = [id for id in dict.fromkeys(ids) if id in vectors]
+        if not found_ids:
+            return [], np.empty((0, 0), dtype=np.float32)
+        return found_ids, np.asarray(
+            [vectors[id] for id in found_ids], dtype=np.float32
+        )
+
 
 @dataclass
 class BaseKVStorage(StorageNameSpace, ABC):
@@ -566,6 +598,34 @@ class BaseGraphStorage(StorageNameSpace, ABC):
             edge_data: A dictionary of edge properties
         """
 
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """Insert or update multiple nodes as a batch
+
+        Default implementation upserts nodes one by one.
+        Override this method for better performance in storage backends
+        that support batch operations.
+
+        Args:
+            nodes: List of (node_id, node_data) tuples
+        """
+        for node_id, node_data in nodes:
+            await self.upsert_node(node_id, node_data)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """Insert or update multiple edges as a batch
+
+        Default implementation upserts edges one by one.
+        Override this method for better performance in storage backends
+        that support batch operations.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+        """
+        for source_node_id, target_node_id, edge_data in edges:
+            await self.upsert_edge(source_node_id, target_node_id, edge_data)
+
     @abstractmethod
     async def delete_node(self, node_id: str) -> None:
         """Delete a node from the graph.
@@ -19,6 +19,9 @@ DEFAULT_MAX_GRAPH_NODES = 1000
 # Default values for extraction settings
 DEFAULT_SUMMARY_LANGUAGE = "English"  # Default language for document processing
 DEFAULT_MAX_GLEANING = 1
+# Pack chunks into one extraction call up to this many tokens (0 disables packing)
+DEFAULT_ENTITY_EXTRACT_PACK_TOKENS = 0
+DEFAULT_ENTITY_EXTRACT_PACK_MAX_CHUNKS = 8
 DEFAULT_ENTITY_NAME_MAX_LENGTH = 256
 
 # Number of description fragments to trigger LLM summary
@@ -53,6 +56,7 @@ DEFAULT_CHUNK_TOP_K = 20
 DEFAULT_MAX_ENTITY_TOKENS = 6000
 DEFAULT_MAX_RELATION_TOKENS = 8000
 DEFAULT_MAX_TOTAL_TOKENS = 30000
+DEFAULT_TOKEN_COUNT_CACHE_SIZE = 10000  # Texts whose token count is kept per process
 DEFAULT_COSINE_THRESHOLD = 0.2
 DEFAULT_RELATED_CHUNK_NUMBER = 5
 DEFAULT_KG_CHUNK_PICK_METHOD = "VECTOR"
@@ -65,6 +69,17 @@ DEFAULT_HISTORY_TURNS = 0
 DEFAULT_MIN_RERANK_SCORE = 0.0
 DEFAULT_RERANK_BINDING = "null"
 
+# Local cross-encoder rerank (RERANK_BINDING=local) defaults
+DEFAULT_RERANK_LOCAL_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+# sentence-transformers backend: onnx, torch or openvino
+DEFAULT_RERANK_LOCAL_BACKEND = "onnx"
+DEFAULT_RERANK_LOCAL_DEVICE = "cpu"
+DEFAULT_RERANK_LOCAL_BATCH_SIZE = 32
+DEFAULT_RERANK_LOCAL_MAX_LENGTH = 512
+# Cached (query, chunk) scores, 0 disables the cache
+DEFAULT_RERANK_LOCAL_CACHE_SIZE = 10000
+DEFAULT_RERANK_LOCAL_CACHE_TTL = 3600  # Seconds a cached score is reused
+
 # Default source ids limit in meta data for entity and relation
 DEFAULT_MAX_SOURCE_IDS_PER_ENTITY = 300
 DEFAULT_MAX_SOURCE_IDS_PER_RELATION = 300
@@ -94,12 +109,37 @@ DEFAULT_TEMPERATURE = 1.0
 # Async configuration defaults
 DEFAULT_MAX_ASYNC = 4  # Default maximum async operations
 DEFAULT_MAX_PARALLEL_INSERT = 2  # Default maximum parallel insert operations
+DEFAULT_GRAPH_UPSERT_BATCH_SIZE = 100  # Entities/relations per merge batch
+
+# Provider rate limits for LLM and embedding calls (0 means unlimited)
+DEFAULT_LLM_MAX_RPM = 0  # Requests per minute
+DEFAULT_LLM_MAX_TPM = 0  # Prompt tokens per minute
+DEFAULT_EMBEDDING_MAX_RPM = 0
+DEFAULT_EMBEDDING_MAX_TPM = 0
+# Back off on 429 responses, recover on success
+DEFAULT_LLM_ADAPTIVE_CONCURRENCY = False
+DEFAULT_LLM_LATENCY_TARGET = 0  # Average latency (s) before backing off, 0 disables
+DEFAULT_LLM_RATE_LIMIT_COOLDOWN = 5.0  # Seconds new calls pause after a 429 response
+
+# Chunking executor defaults
+DEFAULT_CHUNKING_EXECUTOR = "thread"  # Where chunking runs: thread, process or inline
+DEFAULT_CHUNKING_MAX_WORKERS = 2  # Worker threads or processes for chunking
+DEFAULT_CHUNKING_MAX_PENDING = 8  # Max documents queued for chunking at once
 
 # Embedding configuration defaults
 DEFAULT_EMBEDDING_FUNC_MAX_ASYNC = 8  # Default max async for embedding functions
 DEFAULT_EMBEDDING_BATCH_NUM = 10  # Default batch size for embedding computations
 # pragma: no cover  My80OmFIVnBZMlhsa0xUb3Y2bzZiRkowVlE9PTowMzY4MWRlZg==
 
+# In-process LLM cache front (0 entries disables it)
+DEFAULT_LLM_CACHE_FRONT_MAX_ENTRIES = 4096
+DEFAULT_LLM_CACHE_FRONT_TTL = 600  # Seconds an entry is served without a storage read
+
+# Semantic query cache (embedding_cache_config) defaults
+DEFAULT_EMBEDDING_CACHE_SIMILARITY_THRESHOLD = 0.95
+DEFAULT_EMBEDDING_CACHE_TTL = 86400  # Seconds a cached answer is served (0: forever)
+DEFAULT_EMBEDDING_CACHE_CANDIDATES = 10  # Nearest cached queries checked per lookup
+
 # Gunicorn worker timeout
 DEFAULT_TIMEOUT = 300
 
@@ -107,6 +147,12 @@ DEFAULT_TIMEOUT = 300
 DEFAULT_LLM_TIMEOUT = 180
 DEFAULT_EMBEDDING_TIMEOUT = 30
 
+# Connection pool of the long-lived LLM/embedding/rerank HTTP clients
+DEFAULT_LLM_HTTP_MAX_CONNECTIONS = 100
+DEFAULT_LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_LLM_HTTP_KEEPALIVE_EXPIRY = 30.0  # Seconds an idle connection is kept open
+DEFAULT_LLM_HTTP2 = True  # Only used when the h2 package is installed
+
 # Logging configuration defaults
 DEFAULT_LOG_MAX_BYTES = 10485760  # Default 10MB
 DEFAULT_LOG_BACKUP_COUNT = 5  # Default 5 backups
@@ -64,12 +64,19 @@ class FaissVectorDBStorage(BaseVectorStorage):
         self._dim = self.embedding_func.embedding_dim
 
         # Create an empty Faiss index for inner product (useful for normalized vectors = cosine similarity).
-        # If you have a large number of vectors, you might want IVF or other indexes.
-        # For demonstration, we use a simple IndexFlatIP.
-        self._index = faiss.IndexFlatIP(self._dim)
+        # The flat index is wrapped in IndexIDMap2 so vectors keep stable faiss IDs,
+        # can be removed in place and reconstructed without keeping a copy in metadata.
+        self._index = self._create_index()
         # Keep a local store for metadata, IDs, etc.
         # Maps <int faiss_id> → metadata (including your original ID).
         self._id_to_meta = {}
+        # Reverse map <custom id> → <int faiss_id> for O(1) lookups
+        self._custom_id_to_fid: dict[str, int] = {}
+        # Next faiss ID to assign; IDs are never reused within a session
+        self._next_fid = 0
+        # Secondary index <entity name> → {relation custom IDs} for relation namespaces,
+        # rebuilt from the persisted src_id/tgt_id metadata on load
+        self._entity_relation_index: dict[str, set[str]] = {}
 # type: ignore  MC80OmFIVnBZMlhsa0xUb3Y2bzZURTlKV2c9PTo5OGRkNjc1ZQ==
 
         self._load_faiss_index()
@@ -95,8 +102,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
                     f"[{self.workspace}] Process {os.getpid()} FAISS reloading {self.namespace} due to update by another process"
                 )
                 # Reload data
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
                 self._load_faiss_index()
                 self.storage_updated.value = False
             return self._index
@@ -162,7 +168,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # 2. Remove them
         # 3. Add the new vectors
         existing_ids_to_remove = []
-        for meta, emb in zip(list_data, embeddings):
+        for meta in list_data:
             faiss_internal_id = self._find_faiss_id_by_custom_id(meta["__id__"])
             if faiss_internal_id is not None:
                 existing_ids_to_remove.append(faiss_internal_id)
@@ -173,15 +179,16 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
         # Step 2: Add new vectors
         index = await self._get_index()
-        start_idx = index.ntotal
-        index.add(embeddings)
+        start_fid = self._next_fid
+        new_fids = np.arange(start_fid, start_fid + len(list_data), dtype=np.int64)
+        index.add_with_ids(embeddings, new_fids)
+        self._next_fid = start_fid + len(list_data)
 
-        # Step 3: Store metadata + vector for each new ID
-        for i, meta in enumerate(list_data):
-            fid = start_idx + i
-            # Store the raw vector so we can rebuild if something is removed
-            meta["__vector__"] = embeddings[i].tolist()
-            self._id_to_meta.update({fid: meta})
+        # Step 3: Store metadata for each new ID (vectors live only in the index)
+        for fid, meta in zip(new_fids.tolist(), list_data):
+            self._id_to_meta[fid] = meta
+            self._custom_id_to_fid[meta["__id__"]] = fid
+            self._index_relation(meta)
 
         logger.debug(
             f"[{self.workspace}] Upserted {len(list_data)} vectors into Faiss index."
@@ -222,12 +229,10 @@ class FaissVectorDBStorage(BaseVectorStorage):
             if dist < self.cosine_better_than_threshold:
                 continue
 
-            meta = self._id_to_meta.get(idx, {})
-            # Filter out __vector__ from query results to avoid returning large vector data
-            filtered_meta = {k: v for k, v in meta.items() if k != "__vector__"}
+            meta = self._id_to_meta.get(int(idx), {})
             results.append(
                 {
-                    **filtered_meta,
+                    **meta,
                     "id": meta.get("__id__"),
                     "distance": float(dist),
                     "created_at": meta.get("__created_at__"),
@@ -287,8 +292,9 @@ class FaissVectorDBStorage(BaseVectorStorage):
         """
         logger.debug(f"[{self.workspace}] Searching relations for entity {entity_name}")
         relations = []
-        for fid, meta in self._id_to_meta.items():
-            if meta.get("src_id") == entity_name or meta.get("tgt_id") == entity_name:
+        for relation_id in self._entity_relation_index.get(entity_name, ()):
+            fid = self._find_faiss_id_by_custom_id(relation_id)
+            if fid is not None:
                 relations.append(fid)
 
         logger.debug(
@@ -304,40 +310,70 @@ class FaissVectorDBStorage(BaseVectorStorage):
     # Internal helper methods
     # --------------------------------------------------------------------------------
 
+    def _create_index(self):
+        """
+        Create an empty inner product index that supports explicit IDs and removal.
+        """
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(self._dim))
+
+    def _reset_index(self):
+        """
+        Reset the index and all in-memory lookup structures to an empty state.
+        """
+        self._index = self._create_index()
+        self._id_to_meta = {}
+        self._custom_id_to_fid = {}
+        self._next_fid = 0
+        self._entity_relation_index = {}
+
+    def _index_relation(self, meta: dict[str, Any]):
+        """
+        Register a relation's endpoints in the entity → relation ID index.
+        """
+        for entity_name in {meta.get("src_id"), meta.get("tgt_id")}:
+            if entity_name is not None:
+                self._entity_relation_index.setdefault(entity_name, set()).add(
+                    meta["__id__"]
+                )
+
+    def _unindex_relation(self, meta: dict[str, Any]):
+        """
+        Remove a relation's endpoints from the entity → relation ID index.
+        """
+        for entity_name in {meta.get("src_id"), meta.get("tgt_id")}:
+            relation_ids = self._entity_relation_index.get(entity_name)
+            if relation_ids is not None:
+                relation_ids.discard(meta["__id__"])
+                if not relation_ids:
+                    del self._entity_relation_index[entity_name]
+
     def _find_faiss_id_by_custom_id(self, custom_id: str):
         """
         Return the Faiss internal ID for a given custom ID, or None if not found.
         """
-        for fid, meta in self._id_to_meta.items():
-            if meta.get("__id__") == custom_id:
-                return fid
-        return None
+        return self._custom_id_to_fid.get(custom_id)
 # noqa  Mi80OmFIVnBZMlhsa0xUb3Y2bzZURTlKV2c9PTo5OGRkNjc1ZQ==
 
     async def _remove_faiss_ids(self, fid_list):
         """
         Remove a list of internal Faiss IDs from the index.
-        Because IndexFlatIP doesn't support 'removals',
-        we rebuild the index excluding those vectors.
+        All IDs are removed in a single IndexIDMap2.remove_ids pass, so the
+        cost is one compaction of the flat storage regardless of how many IDs
+        are deleted, and the remaining vectors keep their faiss IDs.
         """
-        keep_fids = [fid for fid in self._id_to_meta if fid not in fid_list]
-
-        # Rebuild the index
-        vectors_to_keep = []
-        new_id_to_meta = {}
-        for new_fid, old_fid in enumerate(keep_fids):
-            vec_meta = self._id_to_meta[old_fid]
-            vectors_to_keep.append(vec_meta["__vector__"])  # stored as list
-            new_id_to_meta[new_fid] = vec_meta
+        fids = {int(fid) for fid in fid_list}
+        if not fids:
+            return
 
         async with self._storage_lock:
-            # Re-init index
-            self._index = faiss.IndexFlatIP(self._dim)
-            if vectors_to_keep:
-                arr = np.array(vectors_to_keep, dtype=np.float32)
-                self._index.add(arr)
-
-            self._id_to_meta = new_id_to_meta
+            self._index.remove_ids(np.fromiter(fids, dtype=np.int64, count=len(fids)))
+            for fid in fids:
+                meta = self._id_to_meta.pop(fid, None)
+                if meta is not None:
+                    custom_id = meta.get("__id__")
+                    if self._custom_id_to_fid.get(custom_id) == fid:
+                        del self._custom_id_to_fid[custom_id]
+                        self._unindex_relation(meta)
 
     def _save_faiss_index(self):
         """
@@ -346,7 +382,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
         faiss.write_index(self._index, self._faiss_index_file)
 
         # Save metadata dict to JSON. Convert all keys to strings for JSON storage.
-        # _id_to_meta is { int: { '__id__': doc_id, '__vector__': [float,...], ... } }
+        # _id_to_meta is { int: { '__id__': doc_id, ... } }; vectors are stored in the index file only.
         # We'll keep the int -> dict, but JSON requires string keys.
         serializable_dict = {}
         for fid, meta in self._id_to_meta.items():
@@ -369,16 +405,41 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
         try:
             # Load the Faiss index
-            self._index = faiss.read_index(self._faiss_index_file)
+            index = faiss.read_index(self._faiss_index_file)
             # Load metadata
             with open(self._meta_file, "r", encoding="utf-8") as f:
                 stored_dict = json.load(f)
 
             # Convert string keys back to int
-            self._id_to_meta = {}
+            id_to_meta = {}
             for fid_str, meta in stored_dict.items():
                 fid = int(fid_str)
-                self._id_to_meta[fid] = meta
+                # Vectors were duplicated into metadata by older versions
+                meta.pop("__vector__", None)
+                id_to_meta[fid] = meta
+
+            if not isinstance(index, faiss.IndexIDMap2):
+                # Legacy IndexFlatIP file: faiss IDs are the sequential positions
+                logger.info(
+                    f"[{self.workspace}] Migrating legacy Faiss index for {self.namespace} to IndexIDMap2"
+                )
+                legacy_index = index
+                index = self._create_index()
+                if legacy_index.ntotal > 0:
+                    index.add_with_ids(
+                        legacy_index.reconstruct_n(0, legacy_index.ntotal),
+                        np.arange(legacy_index.ntotal, dtype=np.int64),
+                    )
+
+            self._index = index
+            self._id_to_meta = id_to_meta
+            self._custom_id_to_fid = {
+                meta["__id__"]: fid for fid, meta in id_to_meta.items()
+            }
+            self._next_fid = max(id_to_meta, default=-1) + 1
+            self._entity_relation_index = {}
+            for meta in id_to_meta.values():
+                self._index_relation(meta)
 
             logger.info(
                 f"[{self.workspace}] Faiss index loaded with {self._index.ntotal} vectors from {self._faiss_index_file}"
@@ -388,8 +449,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 f"[{self.workspace}] Failed to load Faiss index or metadata: {e}"
             )
             logger.warning(f"[{self.workspace}] Starting with an empty Faiss index.")
-            self._index = faiss.IndexFlatIP(self._dim)
-            self._id_to_meta = {}
+            self._reset_index()
 
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
@@ -399,8 +459,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 logger.warning(
                     f"[{self.workspace}] Storage for FAISS {self.namespace} was updated by another process, reloading..."
                 )
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
                 self._load_faiss_index()
                 self.storage_updated.value = False
                 return False  # Return error
@@ -441,10 +500,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
         if not metadata:
             return None
 
-        # Filter out __vector__ from metadata to avoid returning large vector data
-        filtered_metadata = {k: v for k, v in metadata.items() if k != "__vector__"}
         return {
-            **filtered_metadata,
+            **metadata,
             "id": metadata.get("__id__"),
             "created_at": metadata.get("__created_at__"),
         }
@@ -468,12 +525,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
             if fid is not None:
                 metadata = self._id_to_meta.get(fid)
                 if metadata:
-                    # Filter out __vector__ from metadata to avoid returning large vector data
-                    filtered_metadata = {
-                        k: v for k, v in metadata.items() if k != "__vector__"
-                    }
                     record = {
-                        **filtered_metadata,
+                        **metadata,
                         "id": metadata.get("__id__"),
                         "created_at": metadata.get("__created_at__"),
                     }
@@ -498,14 +551,29 @@ class FaissVectorDBStorage(BaseVectorStorage):
         for id in ids:
             # Find the Faiss internal ID for the custom ID
             fid = self._find_faiss_id_by_custom_id(id)
-            if fid is not None and fid in self._id_to_meta:
-                metadata = self._id_to_meta[fid]
-                # Get the stored vector from metadata
-                if "__vector__" in metadata:
-                    vectors_dict[id] = metadata["__vector__"]
+            if fid is not None:
+                # Reconstruct the (normalized) vector from the index storage
+                vectors_dict[id] = self._index.reconstruct(fid).tolist()
 
         return vectors_dict
 
+    async def get_vector_matrix_by_ids(
+        self, ids: list[str]
+    ) -> tuple[list[str], np.ndarray]:
+        """Get vectors by their IDs reconstructed from the index in one batch"""
+        found_ids = []
+        fids = []
+        for id in dict.fromkeys(ids):
+            fid = self._find_faiss_id_by_custom_id(id)
+            if fid is not None:
+                found_ids.append(id)
+                fids.append(fid)
+
+        if not fids:
+            return [], np.empty((0, 0), dtype=np.float32)
+        matrix = self._index.reconstruct_batch(np.asarray(fids, dtype=np.int64))
+        return found_ids, np.asarray(matrix, dtype=np.float32)
+
     async def drop(self) -> dict[str, str]:
         """Drop all vector data from storage and clean up resources
 
@@ -525,8 +593,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
         try:
             async with self._storage_lock:
                 # Reset the index
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
 
                 # Remove storage files if they exist
                 if os.path.exists(self._faiss_index_file):
@@ -534,7 +601,6 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 if os.path.exists(self._meta_file):
                     os.remove(self._meta_file)
 
-                self._id_to_meta = {}
                 self._load_faiss_index()
 
                 # Notify other processes
@@ -3,6 +3,7 @@ Copyright (c) 2025 Dean Wu. All rights reserved.
 AuroraAI Project.
 """
 
+import json
 import os
 from dataclasses import dataclass
 from typing import Any, final
@@ -11,6 +12,8 @@ from lightrag.base import (
     BaseKVStorage,
 )
 from lightrag.utils import (
+    SanitizingJSONEncoder,
+    get_env_value,
     load_json,
     logger,
     write_json,
@@ -43,7 +46,20 @@ class JsonKVStorage(BaseKVStorage):
         os.makedirs(workspace_dir, exist_ok=True)
         self._file_name = os.path.join(workspace_dir, f"kv_store_{self.namespace}.json")
 
+        # Append-only log mode: flushes append changed/deleted keys to a log segment
+        # next to the snapshot file instead of rewriting the whole snapshot
+        self._append_log = get_env_value("JSON_KV_APPEND_LOG", False, bool)
+        # Compact the log into the snapshot once it outgrows this fraction of the snapshot
+        self._log_compact_ratio = get_env_value("JSON_KV_LOG_COMPACT_RATIO", 0.5, float)
+        self._log_compact_min_bytes = get_env_value(
+            "JSON_KV_LOG_COMPACT_MIN_BYTES", 1024 * 1024, int
+        )
+        self._log_file_name = os.path.join(
+            workspace_dir, f"kv_store_{self.namespace}.log.jsonl"
+        )
+
         self._data = None
+        self._dirty_keys = None
         self._storage_lock = None
         self.storage_updated = None
 # pragma: no cover  MC80OmFIVnBZMlhsa0xUb3Y2bzZOM2RQYWc9PTpiZWFhMGI4Ng==
@@ -64,8 +80,19 @@ class JsonKVStorage(BaseKVStorage):
             self._data = await get_namespace_data(
                 self.namespace, workspace=self.workspace
             )
+            # Keys changed since the last flush, shared so any process can flush them
+            self._dirty_keys = await get_namespace_data(
+                f"{self.namespace}_dirty_keys", workspace=self.workspace
+            )
             if need_init:
                 loaded_data = load_json(self._file_name) or {}
+                if self._append_log:
+                    self._replay_log(loaded_data)
+                elif os.path.exists(self._log_file_name):
+                    # Log mode was switched off: fold the pending log into the snapshot
+                    if self._replay_log(loaded_data):
+                        write_json(loaded_data, self._file_name)
+                    os.remove(self._log_file_name)
                 async with self._storage_lock:
                     # Migrate legacy cache structure if needed
                     if self.namespace.endswith("_cache"):
@@ -82,7 +109,10 @@ class JsonKVStorage(BaseKVStorage):
 
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
-            if self.storage_updated.value:
+            if self.storage_updated.value and self._append_log:
+                self._flush_log()
+                await clear_all_update_flags(self.namespace, workspace=self.workspace)
+            elif self.storage_updated.value:
                 data_dict = (
                     dict(self._data) if hasattr(self._data, "_getvalue") else self._data
                 )
@@ -182,6 +212,8 @@ class JsonKVStorage(BaseKVStorage):
                 v["_id"] = k
 
             self._data.update(data)
+            if self._append_log:
+                self._dirty_keys.update(dict.fromkeys(data))
             await set_all_update_flags(self.namespace, workspace=self.workspace)
 
     async def delete(self, ids: list[str]) -> None:
@@ -203,6 +235,8 @@ class JsonKVStorage(BaseKVStorage):
                 result = self._data.pop(doc_id, None)
                 if result is not None:
                     any_deleted = True
+                    if self._append_log:
+                        self._dirty_keys[doc_id] = None
 
             if any_deleted:
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
@@ -233,6 +267,10 @@ class JsonKVStorage(BaseKVStorage):
         try:
             async with self._storage_lock:
                 self._data.clear()
+                if self._append_log:
+                    # Nothing to replay after a drop: start from an empty snapshot
+                    self._dirty_keys.clear()
+                    self._compact_log()
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
 
             await self.index_done_callback()
@@ -244,6 +282,113 @@ class JsonKVStorage(BaseKVStorage):
             logger.error(f"[{self.workspace}] Error dropping {self.namespace}: {e}")
             return {"status": "error", "message": str(e)}
 
+    def _replay_log(self, data: dict) -> int:
+        """Apply the append-only log segment on top of snapshot data in place
+
+        A torn trailing record (e.g. after a crash mid-append) is skipped.
+
+        Returns:
+            Number of log records applied
+        """
+        if not os.path.exists(self._log_file_name):
+            return 0
+
+        applied = 0
+        with open(self._log_file_name, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(
+                        f"[{self.workspace}] Skipping corrupt record at line {line_no} of {self._log_file_name}"
+                    )
+                    continue
+                if record.get("op") == "delete":
+                    data.pop(record["key"], None)
+                else:
+                    data[record["key"]] = record["value"]
+                applied += 1
+
+        logger.info(
+            f"[{self.workspace}] Replayed {applied} log records for {self.namespace}"
+        )
+        return applied
+
+    def _flush_log(self) -> None:
+        """Append all dirty keys to the log segment, compacting it when it grows too large
+
+        Must be called with the storage lock held. Cost scales with the number of
+        changed keys; a full snapshot is only written on compaction.
+        """
+        dirty_keys = list(self._dirty_keys.keys())
+        if not dirty_keys:
+            return
+
+        lines = []
+        sanitized_keys = []
+        for key in dirty_keys:
+            value = self._data.get(key)
+            if value is None:
+                record = {"op": "delete", "key": key}
+            else:
+                record = {"op": "upsert", "key": key, "value": value}
+            line = json.dumps(record, ensure_ascii=False)
+            try:
+                line.encode("utf-8")
+            except UnicodeEncodeError:
+                line = json.dumps(record, ensure_ascii=False, cls=SanitizingJSONEncoder)
+                sanitized_keys.append(key)
+            lines.append(line)
+
+        with open(self._log_file_name, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        for key in dirty_keys:
+            self._dirty_keys.pop(key, None)
+
+        # Update shared memory with sanitized values for the affected keys only
+        for key, line in zip(dirty_keys, lines):
+            if key in sanitized_keys:
+                self._data[key] = json.loads(line)["value"]
+
+        logger.debug(
+            f"[{self.workspace}] Process {os.getpid()} KV appended {len(lines)} records to {self.namespace} log"
+        )
+
+        log_size = os.path.getsize(self._log_file_name)
+        snapshot_size = (
+            os.path.getsize(self._file_name) if os.path.exists(self._file_name) else 0
+        )
+        if log_size >= max(
+            self._log_compact_min_bytes, snapshot_size * self._log_compact_ratio
+        ):
+            self._compact_log()
+
+    def _compact_log(self) -> None:
+        """Fold the current data into a fresh snapshot and truncate the log segment
+
+        Must be called with the storage lock held. The snapshot is written before
+        the log is removed; replaying a log that is already part of the snapshot
+        is idempotent, so a crash in between does not lose or corrupt data.
+        """
+        data_dict = dict(self._data) if hasattr(self._data, "_getvalue") else self._data
+        needs_reload = write_json(data_dict, self._file_name)
+        if needs_reload:
+            cleaned_data = load_json(self._file_name)
+            if cleaned_data is not None:
+                self._data.clear()
+                self._data.update(cleaned_data)
+        if os.path.exists(self._log_file_name):
+            os.remove(self._log_file_name)
+
+        logger.info(
+            f"[{self.workspace}] Process {os.getpid()} KV compacted {len(data_dict)} records into {self.namespace} snapshot"
+        )
+
     async def _migrate_legacy_cache_structure(self, data: dict) -> dict:
         """Migrate legacy nested cache structure to flattened structure
 
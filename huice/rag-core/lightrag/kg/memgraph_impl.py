@@ -672,6 +672,129 @@ class MemgraphStorage(BaseGraphStorage):
                 )
                 raise
 
+    async def _execute_write_with_retry(self, execute_upsert, operation: str) -> None:
+        """Run a write transaction, retrying transient conflicts like upsert_node does"""
+        max_retries = 100
+        initial_wait_time = 0.2
+        backoff_factor = 1.1
+        jitter_factor = 0.1
+
+        for attempt in range(max_retries):
+            try:
+                async with self._driver.session(database=self._DATABASE) as session:
+                    await session.execute_write(execute_upsert)
+                    return
+            except (TransientError, ResultFailedError) as e:
+                root_cause = e
+                while hasattr(root_cause, "__cause__") and root_cause.__cause__:
+                    root_cause = root_cause.__cause__
+
+                is_transient = (
+                    isinstance(root_cause, TransientError)
+                    or isinstance(e, TransientError)
+                    or "TransientError" in str(e)
+                    or "Cannot resolve conflicting transactions" in str(e)
+                )
+                if not is_transient:
+                    logger.error(
+                        f"[{self.workspace}] Non-transient error during {operation}: {str(e)}"
+                    )
+                    raise
+                if attempt == max_retries - 1:
+                    logger.error(
+                        f"[{self.workspace}] Memgraph transient error during {operation} after {max_retries} retries: {str(e)}"
+                    )
+                    raise
+                jitter = random.uniform(0, jitter_factor) * initial_wait_time
+                wait_time = initial_wait_time * (backoff_factor**attempt) + jitter
+                logger.warning(
+                    f"[{self.workspace}] {operation} failed. Attempt #{attempt + 1} retrying in {wait_time:.3f} seconds... Error: {str(e)}"
+                )
+                await asyncio.sleep(wait_time)
+            except Exception as e:
+                logger.error(
+                    f"[{self.workspace}] Unexpected error during {operation}: {str(e)}"
+                )
+                raise
+
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """
+        Upsert nodes with UNWIND in a single transaction.
+
+        Labels cannot be parameterized, so one UNWIND statement is run per entity type.
+
+        Args:
+            nodes: List of (node_id, node_data) tuples
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        if not nodes:
+            return
+        workspace_label = self._get_workspace_label()
+        rows_by_type: dict[str, list[dict]] = {}
+        for node_id, node_data in nodes:
+            if "entity_id" not in node_data:
+                raise ValueError(
+                    "Memgraph: node properties must contain an 'entity_id' field"
+                )
+            rows_by_type.setdefault(node_data["entity_type"], []).append(
+                {"entity_id": node_id, "properties": node_data}
+            )
+
+        async def execute_upsert(tx: AsyncManagedTransaction):
+            for entity_type, rows in rows_by_type.items():
+                query = f"""
+                UNWIND $rows AS row
+                MERGE (n:`{workspace_label}` {{entity_id: row.entity_id}})
+                SET n += row.properties
+                SET n:`{entity_type}`
+                """
+                result = await tx.run(query, rows=rows)
+                await result.consume()  # Ensure result is fully consumed
+
+        await self._execute_write_with_retry(execute_upsert, "batch node upsert")
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Upsert edges with UNWIND in a single transaction.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        if not edges:
+            return
+        workspace_label = self._get_workspace_label()
+        rows = [
+            {
+                "source_entity_id": source_node_id,
+                "target_entity_id": target_node_id,
+                "properties": edge_data,
+            }
+            for source_node_id, target_node_id, edge_data in edges
+        ]
+
+        async def execute_upsert(tx: AsyncManagedTransaction):
+            query = f"""
+            UNWIND $rows AS row
+            MATCH (source:`{workspace_label}` {{entity_id: row.source_entity_id}})
+            WITH source, row
+            MATCH (target:`{workspace_label}` {{entity_id: row.target_entity_id}})
+            MERGE (source)-[r:DIRECTED]-(target)
+            SET r += row.properties
+            """
+            result = await tx.run(query, rows=rows)
+            await result.consume()  # Ensure result is fully consumed
+
+        await self._execute_write_with_retry(execute_upsert, "batch edge upsert")
+
     async def delete_node(self, node_id: str) -> None:
         """Delete a node with the specified label
 
@@ -1094,6 +1094,70 @@ class MongoGraphStorage(BaseGraphStorage):
             upsert=True,
         )
 
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """
+        Insert or update node documents with a single bulk_write.
+        """
+        operations = []
+        for node_id, node_data in nodes:
+            update_doc = {"$set": {**node_data}}
+            if node_data.get("source_id", ""):
+                update_doc["$set"]["source_ids"] = node_data["source_id"].split(
+                    GRAPH_FIELD_SEP
+                )
+            operations.append(UpdateOne({"_id": node_id}, update_doc, upsert=True))
+
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Upsert edges with one bulk_write for their source nodes and one for the edges.
+        """
+        if not edges:
+            return
+
+        # Ensure source nodes exist, same as upsert_edge
+        source_ids = dict.fromkeys(source for source, _, _ in edges)
+        await self.collection.bulk_write(
+            [
+                UpdateOne({"_id": node_id}, {"$set": {}}, upsert=True)
+                for node_id in source_ids
+            ],
+            ordered=False,
+        )
+
+        operations = []
+        for source_node_id, target_node_id, edge_data in edges:
+            edge_doc = {
+                **edge_data,
+                "source_node_id": source_node_id,
+                "target_node_id": target_node_id,
+            }
+            if edge_data.get("source_id", ""):
+                edge_doc["source_ids"] = edge_data["source_id"].split(GRAPH_FIELD_SEP)
+            operations.append(
+                UpdateOne(
+                    {
+                        "$or": [
+                            {
+                                "source_node_id": source_node_id,
+                                "target_node_id": target_node_id,
+                            },
+                            {
+                                "source_node_id": target_node_id,
+                                "target_node_id": source_node_id,
+                            },
+                        ]
+                    },
+                    {"$set": edge_doc},
+                    upsert=True,
+                )
+            )
+        await self.edge_collection.bulk_write(operations)
+
     #
     # -------------------------------------------------------------------------
     # DELETION
@@ -63,10 +63,49 @@ class NanoVectorDBStorage(BaseVectorStorage):
 
         self._max_batch_size = self.global_config["embedding_batch_num"]
 
+        # Secondary index <entity name> → {relation IDs} for relation namespaces,
+        # rebuilt from the persisted src_id/tgt_id fields whenever the client is loaded
+        self._entity_relation_index: dict[str, set[str]] = {}
+        self._relation_endpoints: dict[str, tuple[str | None, str | None]] = {}
+
+        self._load_client()
+
+    def _load_client(self):
+        """(Re)create the NanoVectorDB client from disk and rebuild in-memory indexes"""
         self._client = NanoVectorDB(
             self.embedding_func.embedding_dim,
             storage_file=self._client_file_name,
         )
+        self._entity_relation_index = {}
+        self._relation_endpoints = {}
+        for dp in getattr(self._client, "_NanoVectorDB__storage")["data"]:
+            self._index_relation(dp)
+
+    def _index_relation(self, dp: dict[str, Any]):
+        """Register a relation's endpoints in the entity → relation ID index"""
+        if "src_id" not in dp and "tgt_id" not in dp:
+            return
+        relation_id = dp["__id__"]
+        self._unindex_relation(relation_id)
+        endpoints = (dp.get("src_id"), dp.get("tgt_id"))
+        self._relation_endpoints[relation_id] = endpoints
+        for entity_name in set(endpoints):
+            if entity_name is not None:
+                self._entity_relation_index.setdefault(entity_name, set()).add(
+                    relation_id
+                )
+
+    def _unindex_relation(self, relation_id: str):
+        """Remove a relation from the entity → relation ID index"""
+        endpoints = self._relation_endpoints.pop(relation_id, None)
+        if endpoints is None:
+            return
+        for entity_name in set(endpoints):
+            relation_ids = self._entity_relation_index.get(entity_name)
+            if relation_ids is not None:
+                relation_ids.discard(relation_id)
+                if not relation_ids:
+                    del self._entity_relation_index[entity_name]
 
     async def initialize(self):
         """Initialize storage data"""
@@ -89,10 +128,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
                     f"[{self.workspace}] Process {os.getpid()} reloading {self.namespace} due to update by another process"
                 )
                 # Reload data
-                self._client = NanoVectorDB(
-                    self.embedding_func.embedding_dim,
-                    storage_file=self._client_file_name,
-                )
+                self._load_client()
                 # Reset update flag
                 self.storage_updated.value = False
 
@@ -139,6 +175,8 @@ class NanoVectorDBStorage(BaseVectorStorage):
                 d["__vector__"] = embeddings[i]
             client = await self._get_client()
             results = client.upsert(datas=list_data)
+            for d in list_data:
+                self._index_relation(d)
             return results
         else:
             # sometimes the embedding is not returned correctly. just log it.
@@ -199,6 +237,8 @@ class NanoVectorDBStorage(BaseVectorStorage):
             before_count = len(client)
 
             client.delete(ids)
+            for id in ids:
+                self._unindex_relation(id)
 
             # Calculate actual deleted count
             after_count = len(client)
@@ -251,20 +291,15 @@ class NanoVectorDBStorage(BaseVectorStorage):
 
         try:
             client = await self._get_client()
-            storage = getattr(client, "_NanoVectorDB__storage")
-            relations = [
-                dp
-                for dp in storage["data"]
-                if dp["src_id"] == entity_name or dp["tgt_id"] == entity_name
-            ]
+            ids_to_delete = list(self._entity_relation_index.get(entity_name, ()))
             logger.debug(
-                f"[{self.workspace}] Found {len(relations)} relations for entity {entity_name}"
+                f"[{self.workspace}] Found {len(ids_to_delete)} relations for entity {entity_name}"
             )
-            ids_to_delete = [relation["__id__"] for relation in relations]
 
             if ids_to_delete:
-                client = await self._get_client()
                 client.delete(ids_to_delete)
+                for relation_id in ids_to_delete:
+                    self._unindex_relation(relation_id)
                 logger.debug(
                     f"[{self.workspace}] Deleted {len(ids_to_delete)} relations for {entity_name}"
                 )
@@ -286,10 +321,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
                 logger.warning(
                     f"[{self.workspace}] Storage for {self.namespace} was updated by another process, reloading..."
                 )
-                self._client = NanoVectorDB(
-                    self.embedding_func.embedding_dim,
-                    storage_file=self._client_file_name,
-                )
+                self._load_client()
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
@@ -394,6 +426,29 @@ class NanoVectorDBStorage(BaseVectorStorage):
 
         return vectors_dict
 
+    async def get_vector_matrix_by_ids(
+        self, ids: list[str]
+    ) -> tuple[list[str], np.ndarray]:
+        """Get vectors by their IDs decoded straight into one float32 matrix"""
+        if not ids:
+            return [], np.empty((0, 0), dtype=np.float32)
+
+        client = await self._get_client()
+        results = client.get(list(dict.fromkeys(ids)))
+
+        found_ids = []
+        rows = []
+        for result in results:
+            if result and "vector" in result and "__id__" in result:
+                # Decompress vector data (Base64 + zlib + Float16 compressed)
+                decompressed = zlib.decompress(base64.b64decode(result["vector"]))
+                rows.append(np.frombuffer(decompressed, dtype=np.float16))
+                found_ids.append(result["__id__"])
+
+        if not rows:
+            return [], np.empty((0, 0), dtype=np.float32)
+        return found_ids, np.vstack(rows).astype(np.float32)
+
     async def drop(self) -> dict[str, str]:
         """Drop all vector data from storage and clean up resources
 
@@ -416,10 +471,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
                 if os.path.exists(self._client_file_name):
                     os.remove(self._client_file_name)
 
-                self._client = NanoVectorDB(
-                    self.embedding_func.embedding_dim,
-                    storage_file=self._client_file_name,
-                )
+                self._load_client()
 # fmt: off  My80OmFIVnBZMlhsa0xUb3Y2bzZSREp1ZHc9PTpiNDAyMzk1Zg==
 
                 # Notify other processes that data has been updated
@@ -3,17 +3,28 @@ Copyright (c) 2025 Dean Wu. All rights reserved.
 AuroraAI Project.
 """
 
+import bisect
+import heapq
+import io
+import json
 import os
 from dataclasses import dataclass
-from typing import final
+from typing import Any, final
+
+import numpy as np
 
 from lightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
-from lightrag.utils import logger
+from lightrag.utils import get_env_value, logger
 from lightrag.base import BaseGraphStorage
 import networkx as nx
 from .shared_storage import (
+    get_namespace_deltas,
     get_namespace_lock,
+    get_namespace_snapshot_position,
     get_update_flag,
+    mark_namespace_snapshot,
+    publish_namespace_deltas,
+    reset_namespace_deltas,
     set_all_update_flags,
 )
 
@@ -24,6 +35,218 @@ from dotenv import load_dotenv
 # the OS environment variables take precedence over the .env file
 load_dotenv(dotenv_path=".env", override=False)
 
+# Version of the binary graph snapshot layout written by write_nx_graph_binary
+BINARY_GRAPH_FORMAT_VERSION = 1
+
+
+def _pack_strings(values: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Pack strings into one UTF-8 blob plus character offsets"""
+    text = "".join(values)
+    blob = np.frombuffer(text.encode("utf-8", "surrogatepass"), dtype=np.uint8)
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum([len(v) for v in values], out=offsets[1:])
+    return blob, offsets
+
+
+def _unpack_strings(blob: np.ndarray, offsets: np.ndarray) -> list[str]:
+    """Inverse of _pack_strings"""
+    text = blob.tobytes().decode("utf-8", "surrogatepass")
+    bounds = offsets.tolist()
+    return [text[bounds[i] : bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+
+def _column_kind(values: list[Any]) -> str:
+    """Pick the narrowest column type that holds all values losslessly"""
+    if all(type(v) is str for v in values):
+        return "str"
+    if all(type(v) is bool for v in values):
+        return "bool"
+    if all(type(v) is int and -(2**63) <= v < 2**63 for v in values):
+        return "int"
+    if all(type(v) in (int, float) for v in values):
+        return "float"
+    return "json"
+
+
+def _pack_columns(
+    rows: list[dict[str, Any]], prefix: str, arrays: dict[str, np.ndarray]
+) -> list[list[str]]:
+    """Store row attributes as typed columns with a presence mask per key
+
+    Returns:
+        [[attribute_key, kind], ...] describing the columns, in array order
+    """
+    keys = list(dict.fromkeys(k for row in rows for k in row))
+    columns = []
+    for i, key in enumerate(keys):
+        mask = np.fromiter((key in row for row in rows), dtype=bool, count=len(rows))
+        values = [row[key] for row in rows if key in row]
+        kind = _column_kind(values)
+        name = f"{prefix}{i}"
+        arrays[f"{name}_mask"] = mask
+        if kind == "str":
+            arrays[f"{name}_blob"], arrays[f"{name}_off"] = _pack_strings(values)
+        elif kind == "json":
+            arrays[f"{name}_blob"], arrays[f"{name}_off"] = _pack_strings(
+                [json.dumps(v, ensure_ascii=False) for v in values]
+            )
+        else:
+            dtype = {"bool": bool, "int": np.int64, "float": np.float64}[kind]
+            arrays[f"{name}_data"] = np.asarray(values, dtype=dtype)
+        columns.append([key, kind])
+    return columns
+
+
+def _unpack_columns(
+    columns: list[list[str]], prefix: str, arrays, row_count: int
+) -> list[dict[str, Any]]:
+    """Inverse of _pack_columns"""
+    rows: list[dict[str, Any]] = [{} for _ in range(row_count)]
+    for i, (key, kind) in enumerate(columns):
+        name = f"{prefix}{i}"
+        if kind == "str":
+            values = _unpack_strings(arrays[f"{name}_blob"], arrays[f"{name}_off"])
+        elif kind == "json":
+            values = [
+                json.loads(v)
+                for v in _unpack_strings(arrays[f"{name}_blob"], arrays[f"{name}_off"])
+            ]
+        else:
+            values = arrays[f"{name}_data"].tolist()
+        row_indices = np.flatnonzero(arrays[f"{name}_mask"]).tolist()
+        for row_idx, value in zip(row_indices, values):
+            rows[row_idx][key] = value
+    return rows
+
+
+class _LabelIndex:
+    """In-memory index over node labels for label search and popular labels
+
+    - trigrams: trigram of the padded lowercase label -> labels, for contains-matches
+    - sorted labels: (lowercase label, label) pairs kept sorted, for prefix matches
+    - degree heap: lazily invalidated max-heap of (-degree, label), for popular labels
+    """
+
+    def __init__(self):
+        self._lower: dict[str, str] = {}
+        self._trigrams: dict[str, set[str]] = {}
+        self._sorted: list[tuple[str, str]] = []
+        self._degrees: dict[str, int] = {}
+        self._heap: list[tuple[int, str]] = []
+
+    @staticmethod
+    def _label_trigrams(label_lower: str) -> set[str]:
+        # Padding gives labels shorter than three characters trigrams as well
+        padded = f"\x00{label_lower}\x00"
+        return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+    def rebuild(self, graph: nx.Graph) -> None:
+        self._lower = {str(node): str(node).lower() for node in graph.nodes()}
+        self._trigrams = {}
+        for label, label_lower in self._lower.items():
+            for trigram in self._label_trigrams(label_lower):
+                self._trigrams.setdefault(trigram, set()).add(label)
+        self._sorted = sorted(
+            (label_lower, label) for label, label_lower in self._lower.items()
+        )
+        self._degrees = {str(node): degree for node, degree in graph.degree()}
+        self._heap = [(-degree, label) for label, degree in self._degrees.items()]
+        heapq.heapify(self._heap)
+
+    def add(self, label: str) -> None:
+        if label in self._lower:
+            return
+        label_lower = label.lower()
+        self._lower[label] = label_lower
+        for trigram in self._label_trigrams(label_lower):
+            self._trigrams.setdefault(trigram, set()).add(label)
+        bisect.insort(self._sorted, (label_lower, label))
+        self._degrees[label] = 0
+        heapq.heappush(self._heap, (0, label))
+
+    def remove(self, label: str) -> None:
+        label_lower = self._lower.pop(label, None)
+        if label_lower is None:
+            return
+        for trigram in self._label_trigrams(label_lower):
+            labels = self._trigrams.get(trigram)
+            if labels is not None:
+                labels.discard(label)
+                if not labels:
+                    del self._trigrams[trigram]
+        pos = bisect.bisect_left(self._sorted, (label_lower, label))
+        if pos < len(self._sorted) and self._sorted[pos] == (label_lower, label):
+            del self._sorted[pos]
+        # The heap entry becomes stale and is dropped lazily
+        del self._degrees[label]
+
+    def set_degree(self, label: str, degree: int) -> None:
+        if label not in self._lower or self._degrees[label] == degree:
+            return
+        self._degrees[label] = degree
+        heapq.heappush(self._heap, (-degree, label))
+        if len(self._heap) > 2 * len(self._degrees) + 1024:
+            # Too many stale entries, rebuild the heap from current degrees
+            self._heap = [(-d, label) for label, d in self._degrees.items()]
+            heapq.heapify(self._heap)
+
+    def popular(self, limit: int) -> list[str]:
+        result = []
+        valid_entries = []
+        while self._heap and len(result) < limit:
+            neg_degree, label = heapq.heappop(self._heap)
+            if self._degrees.get(label) != -neg_degree or label in result:
+                continue  # Stale entry for a removed node or an old degree
+            result.append(label)
+            valid_entries.append((neg_degree, label))
+        for entry in valid_entries:
+            heapq.heappush(self._heap, entry)
+        return result
+
+    def _prefix_matches(self, query_lower: str) -> list[str]:
+        matches = []
+        pos = bisect.bisect_left(self._sorted, (query_lower,))
+        while pos < len(self._sorted) and self._sorted[pos][0].startswith(query_lower):
+            matches.append(self._sorted[pos][1])
+            pos += 1
+        return matches
+
+    def _contains_matches(self, query_lower: str) -> set[str]:
+        if len(query_lower) >= 3:
+            posting_lists = []
+            for i in range(len(query_lower) - 2):
+                labels = self._trigrams.get(query_lower[i : i + 3])
+                if not labels:
+                    return set()
+                posting_lists.append(labels)
+            posting_lists.sort(key=len)
+            candidates = set(posting_lists[0]).intersection(*posting_lists[1:])
+        else:
+            # Short queries: union the labels of every trigram containing the query
+            candidates = set()
+            for trigram, labels in self._trigrams.items():
+                if query_lower in trigram:
+                    candidates.update(labels)
+        return {label for label in candidates if query_lower in self._lower[label]}
+
+    def search(self, query_lower: str, limit: int) -> list[tuple[str, int]]:
+        """Return up to limit (label, score) pairs using the search_labels scoring"""
+        matches = [
+            (label, 1000 if self._lower[label] == query_lower else 500)
+            for label in self._prefix_matches(query_lower)
+        ]
+        # Contains-only matches always score below prefix matches
+        if len(matches) < limit:
+            prefix_labels = {label for label, _ in matches}
+            for label in self._contains_matches(query_lower) - prefix_labels:
+                label_lower = self._lower[label]
+                score = 100 - len(label)
+                if f" {query_lower}" in label_lower or f"_{query_lower}" in label_lower:
+                    score += 50
+                matches.append((label, score))
+        matches.sort(key=lambda x: (-x[1], x[0]))
+        return matches[:limit]
+
 
 @final
 @dataclass
@@ -42,6 +265,84 @@ class NetworkXStorage(BaseGraphStorage):
         )
         nx.write_graphml(graph, file_name)
 
+    @staticmethod
+    def load_nx_graph_binary(file_name) -> nx.Graph:
+        """Load a graph written by write_nx_graph_binary, or None if the file is missing"""
+        if not os.path.exists(file_name):
+            return None
+
+        with np.load(file_name, allow_pickle=False) as arrays:
+            header = json.loads(arrays["header"].tobytes().decode("utf-8"))
+            if header["version"] > BINARY_GRAPH_FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported binary graph format version {header['version']} in {file_name}"
+                )
+            node_ids = _unpack_strings(arrays["node_blob"], arrays["node_off"])
+            node_attrs = _unpack_columns(
+                header["node_columns"], "node_col", arrays, len(node_ids)
+            )
+            sources = arrays["edge_src"].tolist()
+            targets = arrays["edge_tgt"].tolist()
+            edge_attrs = _unpack_columns(
+                header["edge_columns"], "edge_col", arrays, len(sources)
+            )
+
+        graph = nx.DiGraph() if header.get("directed") else nx.Graph()
+        graph.graph.update(header.get("graph", {}))
+        graph.add_nodes_from(zip(node_ids, node_attrs))
+        graph.add_edges_from(
+            (node_ids[s], node_ids[t], attrs)
+            for s, t, attrs in zip(sources, targets, edge_attrs)
+        )
+        return graph
+
+    @staticmethod
+    def write_nx_graph_binary(graph: nx.Graph, file_name, workspace="_"):
+        """Write a compact columnar snapshot of the graph
+
+        Node IDs are interned into one string table, edges are stored as two
+        index arrays into that table, and attributes are stored per key as typed
+        columns. The file is a numpy .npz archive and is replaced atomically.
+        """
+        logger.info(
+            f"[{workspace}] Writing binary graph with {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges"
+        )
+        node_ids = list(graph.nodes())
+        node_index = {node: i for i, node in enumerate(node_ids)}
+        edges = list(graph.edges(data=True))
+
+        arrays: dict[str, np.ndarray] = {}
+        arrays["node_blob"], arrays["node_off"] = _pack_strings(
+            [str(node) for node in node_ids]
+        )
+        arrays["edge_src"] = np.fromiter(
+            (node_index[u] for u, _, _ in edges), dtype=np.int64, count=len(edges)
+        )
+        arrays["edge_tgt"] = np.fromiter(
+            (node_index[v] for _, v, _ in edges), dtype=np.int64, count=len(edges)
+        )
+        header = {
+            "version": BINARY_GRAPH_FORMAT_VERSION,
+            "directed": graph.is_directed(),
+            "graph": dict(graph.graph),
+            "node_columns": _pack_columns(
+                [attrs for _, attrs in graph.nodes(data=True)], "node_col", arrays
+            ),
+            "edge_columns": _pack_columns(
+                [attrs for _, _, attrs in edges], "edge_col", arrays
+            ),
+        }
+        arrays["header"] = np.frombuffer(
+            json.dumps(header, ensure_ascii=False).encode("utf-8"), dtype=np.uint8
+        )
+
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+        tmp_file = f"{file_name}.tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(buffer.getbuffer())
+        os.replace(tmp_file, file_name)
+
     def __post_init__(self):
         working_dir = self.global_config["working_dir"]
         if self.workspace:
@@ -56,21 +357,92 @@ class NetworkXStorage(BaseGraphStorage):
         self._graphml_xml_file = os.path.join(
             workspace_dir, f"graph_{self.namespace}.graphml"
         )
+        self._binary_graph_file = os.path.join(
+            workspace_dir, f"graph_{self.namespace}.npz"
+        )
+        # "graphml" (default) keeps the file read by the visualization tools, "binary"
+        # opts into compact .npz snapshots
+        self._graph_format = get_env_value("NETWORKX_GRAPH_FORMAT", "graphml").lower()
+        if self._graph_format not in ("binary", "graphml"):
+            raise ValueError(
+                f"Invalid NETWORKX_GRAPH_FORMAT '{self._graph_format}', expected 'binary' or 'graphml'"
+            )
+        # In binary mode, additionally export GraphML on every save (for external visualization tools)
+        self._graphml_export = get_env_value("NETWORKX_GRAPHML_EXPORT", False, bool)
+        # Node/edge deltas kept in shared storage for peers to catch up incrementally;
+        # a peer that falls further behind than this reloads the persisted graph, and
+        # the graph is saved early once more unsaved deltas than this pile up
+        self._max_sync_deltas = get_env_value("NETWORKX_SYNC_MAX_DELTAS", 10000, int)
         self._storage_lock = None
         self.storage_updated = None
         self._graph = None
+        self._label_index = _LabelIndex()
+        # Position in the shared delta log reflected by self._graph
+        self._sync_epoch = 0
+        self._applied_seq = 0
 
         # Load initial graph
-        preloaded_graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
+        preloaded_graph = self._load_graph()
         if preloaded_graph is not None:
             logger.info(
-                f"[{self.workspace}] Loaded graph from {self._graphml_xml_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
+                f"[{self.workspace}] Loaded graph from {self._graph_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
             )
         else:
             logger.info(
-                f"[{self.workspace}] Created new empty graph file: {self._graphml_xml_file}"
+                f"[{self.workspace}] Created new empty graph file: {self._graph_file}"
+            )
+        self._set_graph(preloaded_graph or nx.Graph())
+
+    def _set_graph(self, graph: nx.Graph) -> None:
+        """Replace the in-memory graph and rebuild the label index for it"""
+        self._graph = graph
+        self._label_index.rebuild(graph)
+
+    @property
+    def _graph_file(self) -> str:
+        """Path of the primary persisted graph file for the configured format"""
+        if self._graph_format == "binary":
+            return self._binary_graph_file
+        return self._graphml_xml_file
+
+    def _load_graph(self) -> nx.Graph | None:
+        """Load the persisted graph in the configured format
+
+        In binary mode an existing GraphML file is used as a migration source
+        until the first binary snapshot has been written.
+        """
+        if self._graph_format == "graphml":
+            return NetworkXStorage.load_nx_graph(self._graphml_xml_file)
+        if os.path.exists(self._binary_graph_file):
+            return NetworkXStorage.load_nx_graph_binary(self._binary_graph_file)
+        graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
+        if graph is not None:
+            logger.info(
+                f"[{self.workspace}] Migrating {self._graphml_xml_file} to binary graph format on next save"
+            )
+        return graph
+
+    def _write_graph(self) -> None:
+        """Persist the graph in the configured format, plus the optional GraphML export"""
+        if self._graph_format == "graphml":
+            NetworkXStorage.write_nx_graph(
+                self._graph, self._graphml_xml_file, self.workspace
+            )
+            return
+
+        NetworkXStorage.write_nx_graph_binary(
+            self._graph, self._binary_graph_file, self.workspace
+        )
+        if self._graphml_export:
+            NetworkXStorage.write_nx_graph(
+                self._graph, self._graphml_xml_file, self.workspace
+            )
+        elif os.path.exists(self._graphml_xml_file):
+            # Retire the migrated GraphML file so a stale copy is never loaded again
+            os.replace(self._graphml_xml_file, f"{self._graphml_xml_file}.bak")
+            logger.info(
+                f"[{self.workspace}] Migrated graph to {self._binary_graph_file}, legacy GraphML kept as {self._graphml_xml_file}.bak"
             )
-        self._graph = preloaded_graph or nx.Graph()
 
     async def initialize(self):
         """Initialize storage data"""
@@ -82,24 +454,122 @@ class NetworkXStorage(BaseGraphStorage):
         self._storage_lock = get_namespace_lock(
             self.namespace, workspace=self.workspace
         )
+        async with self._storage_lock:
+            epoch, snapshot_seq = await get_namespace_snapshot_position(
+                self.namespace, workspace=self.workspace
+            )
+            if epoch or snapshot_seq:
+                # A peer persisted the graph after it was loaded in __post_init__
+                await self._reload_graph()
 
     async def _get_graph(self):
-        """Check if the storage should be reloaded"""
+        """Bring the in-memory graph up to date with other processes and return it"""
         # Acquire lock to prevent concurrent read and write
         async with self._storage_lock:
-            # Check if data needs to be reloaded
-            if self.storage_updated.value:
-                logger.info(
-                    f"[{self.workspace}] Process {os.getpid()} reloading graph {self._graphml_xml_file} due to modifications by another process"
-                )
-                # Reload data
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
+            await self._sync_graph()
+            return self._graph
+
+    async def _sync_graph(self) -> None:
+        """Apply node/edge deltas published by other processes
+
+        Falls back to reloading the persisted graph only when this process has
+        fallen behind the retained delta window or the data was dropped.
+        Must be called with the storage lock held.
+        """
+        result = await get_namespace_deltas(
+            self.namespace,
+            self._applied_seq,
+            self._sync_epoch,
+            workspace=self.workspace,
+        )
+        if result is None:
+            logger.info(
+                f"[{self.workspace}] Process {os.getpid()} reloading graph {self._graph_file} due to modifications by another process"
+            )
+            await self._reload_graph()
+        else:
+            latest_seq, deltas = result
+            for delta in deltas:
+                self._apply_delta(delta)
+            self._applied_seq = latest_seq
+            if deltas:
+                logger.debug(
+                    f"[{self.workspace}] Process {os.getpid()} applied {len(deltas)} graph deltas from other processes"
                 )
-                # Reset update flag
-                self.storage_updated.value = False
+        # Deltas already cover the changes announced by the update flag
+        self.storage_updated.value = False
 
-            return self._graph
+    async def _reload_graph(self) -> None:
+        """Reload the persisted graph and replay deltas published after it was saved
+
+        Must be called with the storage lock held; snapshots are only written under
+        the same lock, so the file and its snapshot position are consistent.
+        """
+        epoch, snapshot_seq = await get_namespace_snapshot_position(
+            self.namespace, workspace=self.workspace
+        )
+        self._set_graph(self._load_graph() or nx.Graph())
+        self._sync_epoch = epoch
+        self._applied_seq = snapshot_seq
+        result = await get_namespace_deltas(
+            self.namespace, snapshot_seq, epoch, workspace=self.workspace
+        )
+        if result is not None:
+            latest_seq, deltas = result
+            for delta in deltas:
+                self._apply_delta(delta)
+            self._applied_seq = latest_seq
+
+    def _apply_delta(self, delta: tuple) -> None:
+        """Apply one node/edge delta to the in-memory graph and label index"""
+        graph = self._graph
+        index = self._label_index
+        op = delta[0]
+        if op == "upsert_node":
+            graph.add_node(delta[1], **delta[2])
+            index.add(str(delta[1]))
+        elif op == "upsert_edge":
+            # add_edge creates missing endpoint nodes
+            graph.add_edge(delta[1], delta[2], **delta[3])
+            for node in (delta[1], delta[2]):
+                index.add(str(node))
+                index.set_degree(str(node), graph.degree(node))
+        elif op == "delete_node":
+            if graph.has_node(delta[1]):
+                neighbors = list(graph.neighbors(delta[1]))
+                graph.remove_node(delta[1])
+                index.remove(str(delta[1]))
+                for node in neighbors:
+                    if graph.has_node(node):
+                        index.set_degree(str(node), graph.degree(node))
+        elif op == "delete_edge":
+            if graph.has_edge(delta[1], delta[2]):
+                graph.remove_edge(delta[1], delta[2])
+                for node in (delta[1], delta[2]):
+                    index.set_degree(str(node), graph.degree(node))
+        else:
+            raise ValueError(f"Unknown graph delta operation: {op}")
+
+    async def _apply_and_publish(self, deltas: list[tuple]) -> None:
+        """Apply local changes and publish them for other processes in one critical section"""
+        if not deltas:
+            return
+        async with self._storage_lock:
+            await self._sync_graph()
+            for delta in deltas:
+                self._apply_delta(delta)
+            self._applied_seq, snapshot_due = await publish_namespace_deltas(
+                self.namespace,
+                deltas,
+                workspace=self.workspace,
+                max_retained=self._max_sync_deltas,
+            )
+            if snapshot_due:
+                # Unsaved deltas cannot be trimmed; persist them to bound the log
+                try:
+                    await self._save_snapshot()
+                except Exception as e:
+                    logger.error(f"[{self.workspace}] Error saving graph: {e}")
 
     async def has_node(self, node_id: str) -> bool:
         graph = await self._get_graph()
@@ -143,8 +613,7 @@ class NetworkXStorage(BaseGraphStorage):
         2. Only one process should updating the storage at a time before index_done_callback,
            KG-storage-log should be used to avoid data corruption
         """
-        graph = await self._get_graph()
-        graph.add_node(node_id, **node_data)
+        await self._apply_and_publish([("upsert_node", node_id, dict(node_data))])
 
     async def upsert_edge(
         self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
@@ -155,8 +624,9 @@ class NetworkXStorage(BaseGraphStorage):
         2. Only one process should updating the storage at a time before index_done_callback,
            KG-storage-log should be used to avoid data corruption
         """
-        graph = await self._get_graph()
-        graph.add_edge(source_node_id, target_node_id, **edge_data)
+        await self._apply_and_publish(
+            [("upsert_edge", source_node_id, target_node_id, dict(edge_data))]
+        )
 
     async def delete_node(self, node_id: str) -> None:
         """
@@ -167,7 +637,7 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         if graph.has_node(node_id):
-            graph.remove_node(node_id)
+            await self._apply_and_publish([("delete_node", node_id)])
             logger.debug(f"[{self.workspace}] Node {node_id} deleted from the graph")
         else:
             logger.warning(
@@ -186,9 +656,9 @@ class NetworkXStorage(BaseGraphStorage):
             nodes: List of node IDs to be deleted
         """
         graph = await self._get_graph()
-        for node in nodes:
-            if graph.has_node(node):
-                graph.remove_node(node)
+        await self._apply_and_publish(
+            [("delete_node", node) for node in nodes if graph.has_node(node)]
+        )
 
     async def remove_edges(self, edges: list[tuple[str, str]]):
         """Delete multiple edges
@@ -202,9 +672,13 @@ class NetworkXStorage(BaseGraphStorage):
             edges: List of edges to be deleted, each edge is a (source, target) tuple
         """
         graph = await self._get_graph()
-        for source, target in edges:
-            if graph.has_edge(source, target):
-                graph.remove_edge(source, target)
+        await self._apply_and_publish(
+            [
+                ("delete_edge", source, target)
+                for source, target in edges
+                if graph.has_edge(source, target)
+            ]
+        )
 
     async def get_all_labels(self) -> list[str]:
         """
@@ -230,14 +704,10 @@ class NetworkXStorage(BaseGraphStorage):
         Returns:
             List of labels sorted by degree (highest first)
         """
-        graph = await self._get_graph()
-
-        # Get degrees of all nodes and sort by degree descending
-        degrees = dict(graph.degree())
-        sorted_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)
+        await self._get_graph()
 
-        # Return top labels limited by the specified limit
-        popular_labels = [str(node) for node, _ in sorted_nodes[:limit]]
+        # Top labels come from the degree-ordered heap of the label index
+        popular_labels = self._label_index.popular(limit)
 
         logger.debug(
             f"[{self.workspace}] Retrieved {len(popular_labels)} popular labels (limit: {limit})"
@@ -256,44 +726,20 @@ class NetworkXStorage(BaseGraphStorage):
         Returns:
             List of matching labels sorted by relevance
         """
-        graph = await self._get_graph()
+        await self._get_graph()
         query_lower = query.lower().strip()
 
         if not query_lower:
             return []
 
-        # Collect matching nodes with relevance scores
-        matches = []
-        for node in graph.nodes():
-            node_str = str(node)
-            node_lower = node_str.lower()
-
-            # Skip if no match
-            if query_lower not in node_lower:
-                continue
-
-            # Calculate relevance score
-            # Exact match gets highest score
-            if node_lower == query_lower:
-                score = 1000
-            # Prefix match gets high score
-            elif node_lower.startswith(query_lower):
-                score = 500
-            # Contains match gets base score, with bonus for shorter strings
-            else:
-                # Shorter strings with matches are more relevant
-                score = 100 - len(node_str)
-                # Bonus for word boundary matches
-                if f" {query_lower}" in node_lower or f"_{query_lower}" in node_lower:
-                    score += 50
-
-            matches.append((node_str, score))
-
-        # Sort by relevance score (desc) then alphabetically
-        matches.sort(key=lambda x: (-x[1], x[0]))
+        # Relevance: exact match 1000, prefix match 500, contains match
+        # 100 - len(label) with a +50 bonus for word boundary matches.
+        # Prefix matches come from the sorted label array, contains matches
+        # from the trigram index, so only matching labels are scored.
+        matches = self._label_index.search(query_lower, limit)
 
         # Return top matches limited by the specified limit
-        search_results = [match[0] for match in matches[:limit]]
+        search_results = [match[0] for match in matches]
 
         logger.debug(
             f"[{self.workspace}] Search query '{query}' returned {len(search_results)} results (limit: {limit})"
@@ -511,31 +957,13 @@ class NetworkXStorage(BaseGraphStorage):
 
     async def index_done_callback(self) -> bool:
         """Save data to disk"""
-        async with self._storage_lock:
-            # Check if storage was updated by another process
-            if self.storage_updated.value:
-                # Storage was updated by another process, reload data instead of saving
-                logger.info(
-                    f"[{self.workspace}] Graph was updated by another process, reloading..."
-                )
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
-                # Reset update flag
-                self.storage_updated.value = False
-                return False  # Return error
-
         # Acquire lock and perform persistence
         async with self._storage_lock:
             try:
-                # Save data to disk
-                NetworkXStorage.write_nx_graph(
-                    self._graph, self._graphml_xml_file, self.workspace
-                )
-                # Notify other processes that data has been updated
-                await set_all_update_flags(self.namespace, workspace=self.workspace)
-                # Reset own update flag to avoid self-reloading
-                self.storage_updated.value = False
+                # Changes from other processes arrive as deltas, so after syncing the
+                # in-memory graph contains both their changes and ours
+                await self._sync_graph()
+                await self._save_snapshot()
                 return True  # Return success
             except Exception as e:
                 logger.error(f"[{self.workspace}] Error saving graph: {e}")
@@ -543,6 +971,24 @@ class NetworkXStorage(BaseGraphStorage):
 
         return True
 
+    async def _save_snapshot(self) -> None:
+        """Persist the synced graph and record it as the snapshot peers reload
+
+        Must be called with the storage lock held.
+        """
+        # Save data to disk
+        self._write_graph()
+        self._applied_seq = await mark_namespace_snapshot(
+            self.namespace,
+            self._applied_seq,
+            workspace=self.workspace,
+            max_retained=self._max_sync_deltas,
+        )
+        # Notify other processes that data has been updated
+        await set_all_update_flags(self.namespace, workspace=self.workspace)
+        # Reset own update flag to avoid self-reloading
+        self.storage_updated.value = False
+
     async def drop(self) -> dict[str, str]:
         """Drop all graph data from storage and clean up resources
 
@@ -560,19 +1006,24 @@ class NetworkXStorage(BaseGraphStorage):
         try:
             async with self._storage_lock:
                 # delete _client_file_name
-                if os.path.exists(self._graphml_xml_file):
-                    os.remove(self._graphml_xml_file)
-                self._graph = nx.Graph()
+                for file_name in (self._graphml_xml_file, self._binary_graph_file):
+                    if os.path.exists(file_name):
+                        os.remove(file_name)
+                self._set_graph(nx.Graph())
+                # Pending deltas refer to the dropped graph; peers must reload
+                self._sync_epoch, self._applied_seq = await reset_namespace_deltas(
+                    self.namespace, workspace=self.workspace
+                )
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
                 # Reset own update flag to avoid self-reloading
                 self.storage_updated.value = False
                 logger.info(
-                    f"[{self.workspace}] Process {os.getpid()} drop graph file:{self._graphml_xml_file}"
+                    f"[{self.workspace}] Process {os.getpid()} drop graph file:{self._graph_file}"
                 )
             return {"status": "success", "message": "data dropped"}
         except Exception as e:
             logger.error(
-                f"[{self.workspace}] Error dropping graph file:{self._graphml_xml_file}: {e}"
+                f"[{self.workspace}] Error dropping graph file:{self._graph_file}: {e}"
             )
             return {"status": "error", "message": str(e)}
\ No newline at end of file
@@ -14,6 +14,7 @@ from typing import Any, Awaitable, Callable, TypeVar, Union, final
 import numpy as np
 import configparser
 import ssl
+import struct
 import itertools
 
 from lightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
@@ -58,6 +59,24 @@ load_dotenv(dotenv_path=".env", override=False)
 T = TypeVar("T")
 
 
+def encode_vector(value: Any) -> bytes:
+    """Encode a vector in the pgvector binary format
+
+    The format is the dimension and an unused flag as int16, followed by the
+    values as big-endian float4. JSON strings like "[0.1,0.2]" are accepted too.
+    """
+    if isinstance(value, str):
+        value = json.loads(value)
+    array = np.asarray(value, dtype=">f4").ravel()
+    return struct.pack(">HH", array.size, 0) + array.tobytes()
+
+
+def decode_vector(data: bytes) -> list[float]:
+    """Decode a pgvector binary value into a list of floats"""
+    dim, _ = struct.unpack_from(">HH", data)
+    return np.frombuffer(data, dtype=">f4", count=dim, offset=4).tolist()
+
+
 class PostgreSQLDB:
     def __init__(self, config: dict[str, Any], **kwargs: Any):
         self.host = config["host"]
@@ -93,6 +112,9 @@ class PostgreSQLDB:
         # Statement LRU cache size (keep as-is, allow None for optional configuration)
         self.statement_cache_size = config.get("statement_cache_size")
 
+        # Rows sent per executemany call by the bulk upsert paths
+        self.upsert_batch_size = max(1, int(config.get("upsert_batch_size", 500)))
+
         if self.user is None or self.password is None or self.database is None:
             raise ValueError("Missing database user, password, or database")
 
@@ -209,6 +231,7 @@ class PostgreSQLDB:
             "port": self.port,
             "min_size": 1,
             "max_size": self.max,
+            "init": self.register_vector_codec,
         }
 
         # Only add statement_cache_size if it's configured
@@ -265,6 +288,8 @@ class PostgreSQLDB:
             try:
                 async with pool.acquire() as connection:
                     await self.configure_vector_extension(connection)
+                    # The first connection may predate the extension
+                    await self.register_vector_codec(connection)
             except Exception:
                 await pool.close()
                 raise
@@ -387,6 +412,28 @@ class PostgreSQLDB:
             logger.warning(f"Could not create VECTOR extension: {e}")
             # Don't raise - let the system continue without vector extension
 
+    @staticmethod
+    async def register_vector_codec(connection: asyncpg.Connection) -> None:
+        """Exchange pgvector values in binary form instead of parsing vector text
+
+        Vector parameters can then be passed as numpy arrays or lists, and vector
+        columns are returned as lists of floats. Skipped while the extension is missing.
+        """
+        schema = await connection.fetchval(
+            "SELECT n.nspname FROM pg_type t"
+            " JOIN pg_namespace n ON n.oid = t.typnamespace"
+            " WHERE t.typname = 'vector' LIMIT 1"
+        )
+        if schema is None:
+            return
+        await connection.set_type_codec(
+            "vector",
+            schema=schema,
+            encoder=encode_vector,
+            decoder=decode_vector,
+            format="binary",
+        )
+
     @staticmethod
     async def configure_age_extension(connection: asyncpg.Connection) -> None:
         """Create AGE extension if it doesn't exist for graph operations."""
@@ -431,18 +478,24 @@ class PostgreSQLDB:
             This method does not catch exceptions. Configuration errors will fail-fast,
             while transient connection errors will be retried by _run_with_retry.
         """
+        # The pool resets session settings on release, so they are applied per
+        # operation; both are sent in one round-trip
+        settings = []
         # Handle probes parameter - only set if non-empty value is provided
         if self.vchordrq_probes and str(self.vchordrq_probes).strip():
-            await connection.execute(f"SET vchordrq.probes TO '{self.vchordrq_probes}'")
+            settings.append(f"SET vchordrq.probes TO '{self.vchordrq_probes}'")
             logger.debug(f"PostgreSQL, VCHORDRQ probes set to: {self.vchordrq_probes}")
 
         # Handle epsilon parameter independently - check for None to allow 0.0 as valid value
         if self.vchordrq_epsilon is not None:
-            await connection.execute(f"SET vchordrq.epsilon TO {self.vchordrq_epsilon}")
+            settings.append(f"SET vchordrq.epsilon TO {self.vchordrq_epsilon}")
             logger.debug(
                 f"PostgreSQL, VCHORDRQ epsilon set to: {self.vchordrq_epsilon}"
             )
 
+        if settings:
+            await connection.execute("; ".join(settings))
+
     async def _migrate_llm_cache_schema(self):
         """Migrate LLM cache schema: add new columns and remove deprecated mode field"""
         try:
@@ -1523,6 +1576,32 @@ class PostgreSQLDB:
             logger.error(f"PostgreSQL database,\nsql:{sql},\ndata:{data},\nerror:{e}")
             raise
 
+    async def executemany(
+        self,
+        sql: str,
+        data: list[dict[str, Any]],
+        batch_size: int | None = None,
+    ) -> None:
+        """Execute sql once per parameter dict, sending the rows in batches
+
+        Each batch is a single asyncpg executemany call, which pipelines its rows
+        in one round-trip and applies them atomically.
+        """
+        batch_size = batch_size or self.upsert_batch_size
+        for start in range(0, len(data), batch_size):
+            rows = [tuple(item.values()) for item in data[start : start + batch_size]]
+
+            async def _operation(connection: asyncpg.Connection, rows=rows) -> Any:
+                return await connection.executemany(sql, rows)
+
+            try:
+                await self._run_with_retry(_operation)
+            except Exception as e:
+                logger.error(
+                    f"PostgreSQL database,\nsql:{sql},\nrows:{len(rows)},\nerror:{e}"
+                )
+                raise
+
 
 class ClientManager:
     _instances: dict[str, Any] = {"db": None, "ref_count": 0}
@@ -1626,6 +1705,12 @@ class ClientManager:
                 "POSTGRES_STATEMENT_CACHE_SIZE",
                 config.get("postgres", "statement_cache_size", fallback=None),
             ),
+            "upsert_batch_size": int(
+                os.environ.get(
+                    "POSTGRES_UPSERT_BATCH_SIZE",
+                    config.get("postgres", "upsert_batch_size", fallback="500"),
+                )
+            ),
             # Connection retry configuration
             "connection_retry_attempts": min(
                 10,
@@ -2005,11 +2090,13 @@ class PGKVStorage(BaseKVStorage):
         if not data:
             return
 
+        # Rows are collected per namespace and written in executemany batches
+        rows: list[dict[str, Any]] = []
         if is_namespace(self.namespace, NameSpace.KV_STORE_TEXT_CHUNKS):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            upsert_sql = SQL_TEMPLATES["upsert_text_chunk"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_text_chunk"]
                 _data = {
                     "workspace": self.workspace,
                     "id": k,
@@ -2022,20 +2109,20 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_FULL_DOCS):
+            upsert_sql = SQL_TEMPLATES["upsert_doc_full"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_doc_full"]
                 _data = {
                     "id": k,
                     "content": v["content"],
                     "doc_name": v.get("file_path", ""),  # Map file_path to doc_name
                     "workspace": self.workspace,
                 }
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_LLM_RESPONSE_CACHE):
+            upsert_sql = SQL_TEMPLATES["upsert_llm_response_cache"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_llm_response_cache"]
                 _data = {
                     "workspace": self.workspace,
                     "id": k,  # Use flattened key as id
@@ -2050,12 +2137,12 @@ class PGKVStorage(BaseKVStorage):
                     else None,
                 }
 
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_FULL_ENTITIES):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            upsert_sql = SQL_TEMPLATES["upsert_full_entities"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_full_entities"]
                 _data = {
                     "workspace": self.workspace,
                     "id": k,
@@ -2064,12 +2151,12 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_FULL_RELATIONS):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            upsert_sql = SQL_TEMPLATES["upsert_full_relations"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_full_relations"]
                 _data = {
                     "workspace": self.workspace,
                     "id": k,
@@ -2078,12 +2165,12 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_ENTITY_CHUNKS):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            upsert_sql = SQL_TEMPLATES["upsert_entity_chunks"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_entity_chunks"]
                 _data = {
                     "workspace": self.workspace,
                     "id": k,
@@ -2092,12 +2179,12 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_RELATION_CHUNKS):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            upsert_sql = SQL_TEMPLATES["upsert_relation_chunks"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_relation_chunks"]
                 _data = {
                     "workspace": self.workspace,
                     "id": k,
@@ -2106,7 +2193,10 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
+
+        if rows:
+            await self.db.executemany(upsert_sql, rows)
 
     async def index_done_callback(self) -> None:
         # PG handles persistence automatically
@@ -2232,7 +2322,7 @@ class PGVectorStorage(BaseVectorStorage):
                 "chunk_order_index": item["chunk_order_index"],
                 "full_doc_id": item["full_doc_id"],
                 "content": item["content"],
-                "content_vector": json.dumps(item["__vector__"].tolist()),
+                "content_vector": item["__vector__"],
                 "file_path": item["file_path"],
                 "create_time": current_time,
                 "update_time": current_time,
@@ -2260,7 +2350,7 @@ class PGVectorStorage(BaseVectorStorage):
             "id": item["__id__"],
             "entity_name": item["entity_name"],
             "content": item["content"],
-            "content_vector": json.dumps(item["__vector__"].tolist()),
+            "content_vector": item["__vector__"],
             "chunk_ids": chunk_ids,
             "file_path": item.get("file_path", None),
             "create_time": current_time,
@@ -2284,7 +2374,7 @@ class PGVectorStorage(BaseVectorStorage):
             "source_id": item["src_id"],
             "target_id": item["tgt_id"],
             "content": item["content"],
-            "content_vector": json.dumps(item["__vector__"].tolist()),
+            "content_vector": item["__vector__"],
             "chunk_ids": chunk_ids,
             "file_path": item.get("file_path", None),
             "create_time": current_time,
@@ -2318,6 +2408,7 @@ class PGVectorStorage(BaseVectorStorage):
         embeddings = np.concatenate(embeddings_list)
         for i, d in enumerate(list_data):
             d["__vector__"] = embeddings[i]
+        rows: list[dict[str, Any]] = []
         for item in list_data:
             if is_namespace(self.namespace, NameSpace.VECTOR_STORE_CHUNKS):
                 upsert_sql, data = self._upsert_chunks(item, current_time)
@@ -2327,8 +2418,9 @@ class PGVectorStorage(BaseVectorStorage):
                 upsert_sql, data = self._upsert_relationships(item, current_time)
             else:
                 raise ValueError(f"{self.namespace} is not supported")
+            rows.append(data)
 
-            await self.db.execute(upsert_sql, data)
+        await self.db.executemany(upsert_sql, rows)
 
     #################### query method ###############
     async def query(
@@ -2342,13 +2434,15 @@ class PGVectorStorage(BaseVectorStorage):
             )  # higher priority for query
             embedding = embeddings[0]
 
-        embedding_string = ",".join(map(str, embedding))
-
-        sql = SQL_TEMPLATES[self.namespace].format(embedding_string=embedding_string)
+        # The embedding is a bound parameter sent through the binary vector codec,
+        # so the SQL text stays constant per namespace and its prepared statement
+        # is reused from the connection's statement cache
+        sql = SQL_TEMPLATES[self.namespace]
         params = {
             "workspace": self.workspace,
             "closer_than_threshold": 1 - self.cosine_better_than_threshold,
             "top_k": top_k,
+            "embedding": np.asarray(embedding, dtype=np.float32),
         }
         results = await self.db.query(sql, params=list(params.values()), multirows=True)
         return results
@@ -2536,8 +2630,10 @@ class PGVectorStorage(BaseVectorStorage):
             for result in results:
                 if result and "content_vector" in result and "id" in result:
                     try:
-                        # Parse JSON string to get vector as list of floats
-                        vector_data = json.loads(result["content_vector"])
+                        # Decoded by the binary codec, or vector text without it
+                        vector_data = result["content_vector"]
+                        if isinstance(vector_data, str):
+                            vector_data = json.loads(vector_data)
                         if isinstance(vector_data, list):
                             vectors_dict[result["id"]] = vector_data
                     except (json.JSONDecodeError, TypeError) as e:
@@ -3648,23 +3744,7 @@ class PGGraphStorage(BaseGraphStorage):
             node_id: The unique identifier for the node (used as label)
             node_data: Dictionary of node properties
         """
-        if "entity_id" not in node_data:
-            raise ValueError(
-                "PostgreSQL: node properties must contain an 'entity_id' field"
-            )
-
-        label = self._normalize_node_id(node_id)
-        properties = self._format_properties(node_data)
-
-        query = """SELECT * FROM cypher('%s', $$
-                     MERGE (n:base {entity_id: "%s"})
-                     SET n += %s
-                     RETURN n
-                   $$) AS (n agtype)""" % (
-            self.graph_name,
-            label,
-            properties,
-        )
+        query = self._upsert_node_query(node_id, node_data)
 
         try:
             await self._query(query, readonly=False, upsert=True)
@@ -3691,11 +3771,44 @@ class PGGraphStorage(BaseGraphStorage):
             target_node_id (str): Label of the target node (used as identifier)
             edge_data (dict): dictionary of properties to set on the edge
         """
+        query = self._upsert_edge_query(source_node_id, target_node_id, edge_data)
+
+        try:
+            await self._query(query, readonly=False, upsert=True)
+
+        except Exception:
+            logger.error(
+                f"[{self.workspace}] POSTGRES, upsert_edge error on edge: `{source_node_id}`-`{target_node_id}`"
+            )
+            raise
+
+    def _upsert_node_query(self, node_id: str, node_data: dict[str, str]) -> str:
+        if "entity_id" not in node_data:
+            raise ValueError(
+                "PostgreSQL: node properties must contain an 'entity_id' field"
+            )
+
+        label = self._normalize_node_id(node_id)
+        properties = self._format_properties(node_data)
+
+        return """SELECT * FROM cypher('%s', $$
+                     MERGE (n:base {entity_id: "%s"})
+                     SET n += %s
+                     RETURN n
+                   $$) AS (n agtype)""" % (
+            self.graph_name,
+            label,
+            properties,
+        )
+
+    def _upsert_edge_query(
+        self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
+    ) -> str:
         src_label = self._normalize_node_id(source_node_id)
         tgt_label = self._normalize_node_id(target_node_id)
         edge_properties = self._format_properties(edge_data)
 
-        query = """SELECT * FROM cypher('%s', $$
+        return """SELECT * FROM cypher('%s', $$
                      MATCH (source:base {entity_id: "%s"})
                      WITH source
                      MATCH (target:base {entity_id: "%s"})
@@ -3711,14 +3824,50 @@ class PGGraphStorage(BaseGraphStorage):
             edge_properties,  # https://github.com/HKUDS/LightRAG/issues/1438#issuecomment-2826000195
         )
 
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """Upsert nodes with their MERGE statements sent in one round-trip
+
+        The statements run as one implicit transaction of the simple query protocol.
+        If the batch fails (e.g. a concurrent MERGE of the same node), it is rolled
+        back as a whole and the nodes are upserted one by one with upsert_node.
+        """
+        if not nodes:
+            return
+        query = ";\n".join(
+            self._upsert_node_query(node_id, node_data) for node_id, node_data in nodes
+        )
         try:
-            await self._query(query, readonly=False, upsert=True)
+            await self._query(query, readonly=False)
+        except PGGraphQueryException as e:
+            logger.warning(
+                f"[{self.workspace}] POSTGRES, batch upsert of {len(nodes)} nodes failed, "
+                f"retrying one by one: {e.args[0].get('error_type')}"
+            )
+            await super().upsert_nodes_batch(nodes)
 
-        except Exception:
-            logger.error(
-                f"[{self.workspace}] POSTGRES, upsert_edge error on edge: `{source_node_id}`-`{target_node_id}`"
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """Upsert edges with their MERGE statements sent in one round-trip
+
+        The statements run as one implicit transaction of the simple query protocol.
+        If the batch fails, it is rolled back as a whole and the edges are upserted
+        one by one with upsert_edge.
+        """
+        if not edges:
+            return
+        query = ";\n".join(
+            self._upsert_edge_query(source_node_id, target_node_id, edge_data)
+            for source_node_id, target_node_id, edge_data in edges
+        )
+        try:
+            await self._query(query, readonly=False)
+        except PGGraphQueryException as e:
+            logger.warning(
+                f"[{self.workspace}] POSTGRES, batch upsert of {len(edges)} edges failed, "
+                f"retrying one by one: {e.args[0].get('error_type')}"
             )
-            raise
+            await super().upsert_edges_batch(edges)
 
     async def delete_node(self, node_id: str) -> None:
         """
@@ -5098,8 +5247,8 @@ SQL_TEMPLATES = {
                             EXTRACT(EPOCH FROM r.create_time)::BIGINT AS created_at
                      FROM LIGHTRAG_VDB_RELATION r
                      WHERE r.workspace = $1
-                       AND r.content_vector <=> '[{embedding_string}]'::vector < $2
-                     ORDER BY r.content_vector <=> '[{embedding_string}]'::vector
+                       AND r.content_vector <=> $4::vector < $2
+                     ORDER BY r.content_vector <=> $4::vector
                      LIMIT $3;
                      """,
     "entities": """
@@ -5107,8 +5256,8 @@ SQL_TEMPLATES = {
                        EXTRACT(EPOCH FROM e.create_time)::BIGINT AS created_at
                 FROM LIGHTRAG_VDB_ENTITY e
                 WHERE e.workspace = $1
-                  AND e.content_vector <=> '[{embedding_string}]'::vector < $2
-                ORDER BY e.content_vector <=> '[{embedding_string}]'::vector
+                  AND e.content_vector <=> $4::vector < $2
+                ORDER BY e.content_vector <=> $4::vector
                 LIMIT $3;
                 """,
     "chunks": """
@@ -5118,8 +5267,8 @@ SQL_TEMPLATES = {
                      EXTRACT(EPOCH FROM c.create_time)::BIGINT AS created_at
               FROM LIGHTRAG_VDB_CHUNKS c
               WHERE c.workspace = $1
-                AND c.content_vector <=> '[{embedding_string}]'::vector < $2
-              ORDER BY c.content_vector <=> '[{embedding_string}]'::vector
+                AND c.content_vector <=> $4::vector < $2
+              ORDER BY c.content_vector <=> $4::vector
               LIMIT $3;
               """,
     # DROP tables
@@ -1474,6 +1474,166 @@ async def get_namespace_data(
     return _shared_dicts[final_namespace]
 
 
+def _get_delta_log(final_namespace: str) -> Dict[Any, Any]:
+    """Get or create the shared delta log dict for a final namespace
+
+    Must be called with the internal lock held. Layout:
+        epoch: bumped by reset_namespace_deltas, invalidates every reader position
+        seq: sequence number of the latest published delta
+        base_seq: deltas with base_seq < seq_no <= seq are retained
+        snapshot_seq: latest seq already contained in the persisted snapshot
+        <int seq_no>: the delta published under that sequence number
+
+    In single-process mode no deltas are recorded: there are no other processes
+    to replay them, and each snapshot starts a new seq so that other instances
+    in this process reload it, like the update flags did before.
+    """
+    key = f"{final_namespace}:delta_log"
+    if key not in _shared_dicts:
+        if _is_multiprocess and _manager is not None:
+            _shared_dicts[key] = _manager.dict()
+        else:
+            _shared_dicts[key] = {}
+        delta_log = _shared_dicts[key]
+        delta_log.update({"epoch": 0, "seq": 0, "base_seq": 0, "snapshot_seq": 0})
+    return _shared_dicts[key]
+
+
+def _trim_delta_log(delta_log: Dict[Any, Any], max_retained: int) -> None:
+    """Drop deltas beyond max_retained, but never ones missing from the snapshot"""
+    base_seq = delta_log["base_seq"]
+    new_base_seq = min(delta_log["seq"] - max_retained, delta_log["snapshot_seq"])
+    if new_base_seq > base_seq:
+        for seq_no in range(base_seq + 1, new_base_seq + 1):
+            delta_log.pop(seq_no, None)
+        delta_log["base_seq"] = new_base_seq
+
+
+async def publish_namespace_deltas(
+    namespace: str,
+    deltas: list[Any],
+    workspace: str | None = None,
+    max_retained: int = 10000,
+) -> tuple[int, bool]:
+    """Append deltas to a namespace's shared delta log so peers can replay them
+
+    Callers must hold the namespace lock so that publishing and applying the
+    same change locally happen in one critical section.
+
+    Returns:
+        (seq, snapshot_due): sequence number of the last published delta, and
+        whether more than max_retained deltas are missing from the persisted
+        snapshot. Those can never be trimmed, so the caller must persist a
+        snapshot and call mark_namespace_snapshot to keep the log bounded.
+    """
+    if _shared_dicts is None:
+        raise ValueError("Try to publish deltas before Shared-Data is initialized")
+
+    final_namespace = get_final_namespace(namespace, workspace)
+    async with get_internal_lock():
+        delta_log = _get_delta_log(final_namespace)
+        seq = delta_log["seq"]
+        if not _is_multiprocess:
+            return seq, False
+        new_entries = {}
+        for delta in deltas:
+            seq += 1
+            new_entries[seq] = delta
+        new_entries["seq"] = seq
+        delta_log.update(new_entries)
+        _trim_delta_log(delta_log, max_retained)
+        return seq, seq - delta_log["snapshot_seq"] > max_retained
+
+
+async def get_namespace_deltas(
+    namespace: str, since_seq: int, epoch: int, workspace: str | None = None
+) -> tuple[int, list[Any]] | None:
+    """Get the deltas published after since_seq
+
+    Returns:
+        (latest_seq, deltas) when the reader can catch up incrementally, or None
+        when the reader fell behind the retained window or the log was reset
+        (epoch changed) and must reload the persisted snapshot instead.
+    """
+    if _shared_dicts is None:
+        raise ValueError("Try to read deltas before Shared-Data is initialized")
+
+    final_namespace = get_final_namespace(namespace, workspace)
+    async with get_internal_lock():
+        delta_log = _get_delta_log(final_namespace)
+        if delta_log["epoch"] != epoch or since_seq < delta_log["base_seq"]:
+            return None
+        latest_seq = delta_log["seq"]
+        if since_seq >= latest_seq:
+            return latest_seq, []
+        return latest_seq, [
+            delta_log[seq_no] for seq_no in range(since_seq + 1, latest_seq + 1)
+        ]
+
+
+async def get_namespace_snapshot_position(
+    namespace: str, workspace: str | None = None
+) -> tuple[int, int]:
+    """Get (epoch, snapshot_seq) describing what the persisted snapshot contains"""
+    if _shared_dicts is None:
+        raise ValueError("Try to read deltas before Shared-Data is initialized")
+
+    final_namespace = get_final_namespace(namespace, workspace)
+    async with get_internal_lock():
+        delta_log = _get_delta_log(final_namespace)
+        return delta_log["epoch"], delta_log["snapshot_seq"]
+
+
+async def mark_namespace_snapshot(
+    namespace: str,
+    seq: int,
+    workspace: str | None = None,
+    max_retained: int = 10000,
+) -> int:
+    """Record that the persisted snapshot contains every delta up to seq
+
+    Returns:
+        Sequence number the caller's in-memory data now corresponds to
+    """
+    if _shared_dicts is None:
+        raise ValueError("Try to mark snapshot before Shared-Data is initialized")
+
+    final_namespace = get_final_namespace(namespace, workspace)
+    async with get_internal_lock():
+        delta_log = _get_delta_log(final_namespace)
+        if not _is_multiprocess:
+            # Nothing to replay: move every other instance behind the log window
+            seq = delta_log["seq"] + 1
+            delta_log.update({"seq": seq, "base_seq": seq, "snapshot_seq": seq})
+            return seq
+        delta_log["snapshot_seq"] = max(delta_log["snapshot_seq"], seq)
+        _trim_delta_log(delta_log, max_retained)
+        return seq
+
+
+async def reset_namespace_deltas(
+    namespace: str, workspace: str | None = None
+) -> tuple[int, int]:
+    """Discard all deltas and start a new epoch (e.g. after dropping the data)
+
+    Returns:
+        (epoch, seq) of the fresh, empty log
+    """
+    if _shared_dicts is None:
+        raise ValueError("Try to reset deltas before Shared-Data is initialized")
+
+    final_namespace = get_final_namespace(namespace, workspace)
+    async with get_internal_lock():
+        delta_log = _get_delta_log(final_namespace)
+        seq = delta_log["seq"]
+        epoch = delta_log["epoch"] + 1
+        delta_log.clear()
+        delta_log.update(
+            {"epoch": epoch, "seq": seq, "base_seq": seq, "snapshot_seq": seq}
+        )
+        return epoch, seq
+
+
 class NamespaceLock:
     """
     Reusable namespace lock wrapper that creates a fresh context on each use.
@@ -8,7 +8,7 @@ from __future__ import annotations
 import traceback
 import asyncio
 import configparser
-import inspect
+import json
 import os
 import time
 import warnings
@@ -33,6 +33,8 @@ from lightrag.prompt import PROMPTS
 from lightrag.exceptions import PipelineCancelledException
 from lightrag.constants import (
     DEFAULT_MAX_GLEANING,
+    DEFAULT_ENTITY_EXTRACT_PACK_TOKENS,
+    DEFAULT_ENTITY_EXTRACT_PACK_MAX_CHUNKS,
     DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE,
     DEFAULT_TOP_K,
     DEFAULT_CHUNK_TOP_K,
@@ -48,7 +50,20 @@ from lightrag.constants import (
     DEFAULT_SUMMARY_LENGTH_RECOMMENDED,
     DEFAULT_MAX_ASYNC,
     DEFAULT_MAX_PARALLEL_INSERT,
+    DEFAULT_LLM_MAX_RPM,
+    DEFAULT_LLM_MAX_TPM,
+    DEFAULT_EMBEDDING_MAX_RPM,
+    DEFAULT_EMBEDDING_MAX_TPM,
+    DEFAULT_LLM_ADAPTIVE_CONCURRENCY,
+    DEFAULT_LLM_LATENCY_TARGET,
+    DEFAULT_CHUNKING_EXECUTOR,
+    DEFAULT_CHUNKING_MAX_WORKERS,
+    DEFAULT_CHUNKING_MAX_PENDING,
+    DEFAULT_EMBEDDING_CACHE_SIMILARITY_THRESHOLD,
+    DEFAULT_EMBEDDING_CACHE_TTL,
+    DEFAULT_EMBEDDING_CACHE_CANDIDATES,
     DEFAULT_MAX_GRAPH_NODES,
+    DEFAULT_GRAPH_UPSERT_BATCH_SIZE,
     DEFAULT_MAX_SOURCE_IDS_PER_ENTITY,
     DEFAULT_MAX_SOURCE_IDS_PER_RELATION,
     DEFAULT_ENTITY_TYPES,
@@ -90,6 +105,7 @@ from lightrag.base import (
     QueryResult,
 )
 from lightrag.namespace import NameSpace
+from lightrag.llm.client_pool import acquire_pooled_clients, release_pooled_clients
 from lightrag.operate import (
     chunking_by_token_size,
     extract_entities,
@@ -102,9 +118,13 @@ from lightrag.constants import GRAPH_FIELD_SEP
 from lightrag.utils import (
     Tokenizer,
     TiktokenTokenizer,
+    description_token_count,
+    ChunkingExecutor,
     EmbeddingFunc,
     always_get_an_event_loop,
+    compute_args_hash,
     compute_mdhash_id,
+    invalidate_llm_cache_front,
     lazy_external_import,
     priority_limit_async_func_call,
     get_content_summary,
@@ -218,6 +238,22 @@ class LightRAG:
     )
     """Maximum number of entity extraction attempts for ambiguous content."""
 
+    entity_extract_pack_tokens: int = field(
+        default=get_env_value(
+            "ENTITY_EXTRACT_PACK_TOKENS", DEFAULT_ENTITY_EXTRACT_PACK_TOKENS, int
+        )
+    )
+    """Pack small chunks into one extraction LLM call up to this many chunk tokens. 0 extracts every chunk with its own call."""
+
+    entity_extract_pack_max_chunks: int = field(
+        default=get_env_value(
+            "ENTITY_EXTRACT_PACK_MAX_CHUNKS",
+            DEFAULT_ENTITY_EXTRACT_PACK_MAX_CHUNKS,
+            int,
+        )
+    )
+    """Maximum number of chunks packed into one extraction LLM call."""
+
     force_llm_summary_on_merge: int = field(
         default=get_env_value(
             "FORCE_LLM_SUMMARY_ON_MERGE", DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE, int
@@ -280,6 +316,21 @@ class LightRAG:
     Defaults to `chunking_by_token_size` if not specified.
     """
 
+    chunking_executor: str = field(
+        default=get_env_value("CHUNKING_EXECUTOR", DEFAULT_CHUNKING_EXECUTOR, str)
+    )
+    """Where synchronous chunking and chunk hashing run: "thread", "process" or "inline" (in the event loop)."""
+
+    chunking_max_workers: int = field(
+        default=get_env_value("CHUNKING_MAX_WORKERS", DEFAULT_CHUNKING_MAX_WORKERS, int)
+    )
+    """Number of worker threads or processes used for chunking."""
+
+    chunking_max_pending: int = field(
+        default=get_env_value("CHUNKING_MAX_PENDING", DEFAULT_CHUNKING_MAX_PENDING, int)
+    )
+    """Maximum number of documents handed to the chunking workers at once."""
+
     # Embedding
     # ---
 
@@ -297,17 +348,37 @@ class LightRAG:
     )
     """Maximum number of concurrent embedding function calls."""
 
+    embedding_max_rpm: int = field(
+        default=get_env_value("EMBEDDING_MAX_RPM", DEFAULT_EMBEDDING_MAX_RPM, int)
+    )
+    """Embedding requests per minute allowed by the provider (0 means unlimited)."""
+
+    embedding_max_tpm: int = field(
+        default=get_env_value("EMBEDDING_MAX_TPM", DEFAULT_EMBEDDING_MAX_TPM, int)
+    )
+    """Embedding input tokens per minute allowed by the provider (0 means unlimited)."""
+
     embedding_cache_config: dict[str, Any] = field(
         default_factory=lambda: {
-            "enabled": False,
-            "similarity_threshold": 0.95,
+            "enabled": get_env_value("EMBEDDING_CACHE_ENABLED", False, bool),
+            "similarity_threshold": get_env_value(
+                "EMBEDDING_CACHE_SIMILARITY_THRESHOLD",
+                DEFAULT_EMBEDDING_CACHE_SIMILARITY_THRESHOLD,
+                float,
+            ),
             "use_llm_check": False,
+            "ttl": get_env_value(
+                "EMBEDDING_CACHE_TTL", DEFAULT_EMBEDDING_CACHE_TTL, int
+            ),
         }
     )
-    """Configuration for embedding cache.
-    - enabled: If True, enables caching to avoid redundant computations.
-    - similarity_threshold: Minimum similarity score to use cached embeddings.
+    """Configuration for the semantic query cache of aquery/aquery_llm.
+    - enabled: If True, answers of queries similar to an earlier query with the same query parameters are served from the cache.
+    - similarity_threshold: Minimum cosine similarity between query embeddings to reuse a cached answer.
     - use_llm_check: If True, validates cached embeddings using an LLM.
+    - ttl: Seconds a cached answer is served, 0 keeps answers until the cache is cleared.
+    Cached answers are dropped whenever documents, entities or relations change. Vector
+    storages with a fixed schema that cannot hold the cache disable it with a warning.
     """
 
     default_embedding_timeout: int = field(
@@ -346,6 +417,28 @@ class LightRAG:
     )
     """Maximum number of concurrent LLM calls."""
 
+    llm_max_rpm: int = field(
+        default=get_env_value("LLM_MAX_RPM", DEFAULT_LLM_MAX_RPM, int)
+    )
+    """LLM requests per minute allowed by the provider (0 means unlimited)."""
+
+    llm_max_tpm: int = field(
+        default=get_env_value("LLM_MAX_TPM", DEFAULT_LLM_MAX_TPM, int)
+    )
+    """LLM prompt tokens per minute allowed by the provider (0 means unlimited)."""
+
+    llm_adaptive_concurrency: bool = field(
+        default=get_env_value(
+            "LLM_ADAPTIVE_CONCURRENCY", DEFAULT_LLM_ADAPTIVE_CONCURRENCY, bool
+        )
+    )
+    """Shrink LLM and embedding concurrency on 429 responses or high latency, and grow it back while calls succeed."""
+
+    llm_latency_target: float = field(
+        default=get_env_value("LLM_LATENCY_TARGET", DEFAULT_LLM_LATENCY_TARGET, float)
+    )
+    """Average LLM call latency in seconds above which concurrency shrinks (0 disables)."""
+
     llm_model_kwargs: dict[str, Any] = field(default_factory=dict)
     """Additional keyword arguments passed to the LLM model function."""
 
@@ -390,6 +483,13 @@ class LightRAG:
     )
     """Maximum number of graph nodes to return in knowledge graph queries."""
 
+    graph_upsert_batch_size: int = field(
+        default=get_env_value(
+            "GRAPH_UPSERT_BATCH_SIZE", DEFAULT_GRAPH_UPSERT_BATCH_SIZE, int
+        )
+    )
+    """Number of entities or relations merged per locked batch, read and written with one batched graph call each."""
+
     max_source_ids_per_entity: int = field(
         default=get_env_value(
             "MAX_SOURCE_IDS_PER_ENTITY", DEFAULT_MAX_SOURCE_IDS_PER_ENTITY, int
@@ -527,6 +627,9 @@ class LightRAG:
                 f"max_total_tokens({self.summary_max_tokens}) should greater than summary_length_recommended({self.summary_length_recommended})"
             )
 
+        # Created on first use, kept out of the dataclass fields so asdict() skips it
+        self._chunking_executor: ChunkingExecutor | None = None
+
         # Fix global_config now
         global_config = asdict(self)
 
@@ -548,6 +651,10 @@ class LightRAG:
             self.embedding_func_max_async,
             llm_timeout=self.default_embedding_timeout,
             queue_name="Embedding func",
+            max_rpm=self.embedding_max_rpm,
+            max_tpm=self.embedding_max_tpm,
+            tokenizer=self.tokenizer,
+            adaptive_concurrency=self.llm_adaptive_concurrency,
         )(self.embedding_func)
 
         # Initialize all storages
@@ -641,6 +748,16 @@ class LightRAG:
             meta_fields={"full_doc_id", "content", "file_path"},
         )
 
+        # Semantic query cache: answers keyed by query embedding
+        self.query_cache_vdb: BaseVectorStorage | None = None
+        if self.embedding_cache_config.get("enabled"):
+            self.query_cache_vdb = self.vector_db_storage_cls(  # type: ignore
+                namespace=NameSpace.VECTOR_STORE_QUERY_CACHE,
+                workspace=self.workspace,
+                embedding_func=self.embedding_func,
+                meta_fields={"content", "scope", "response", "raw_data", "cached_at"},
+            )
+
         # Initialize document status storage
         self.doc_status: DocStatusStorage = self.doc_status_storage_cls(
             namespace=NameSpace.DOC_STATUS,
@@ -657,6 +774,11 @@ class LightRAG:
             self.llm_model_max_async,
             llm_timeout=self.default_llm_timeout,
             queue_name="LLM func",
+            max_rpm=self.llm_max_rpm,
+            max_tpm=self.llm_max_tpm,
+            tokenizer=self.tokenizer,
+            adaptive_concurrency=self.llm_adaptive_concurrency,
+            latency_target=self.llm_latency_target or None,
         )(
             partial(
                 self.llm_model_func,  # type: ignore
@@ -669,6 +791,9 @@ class LightRAG:
 
     async def initialize_storages(self):
         """Storage initialization must be called one by one to prevent deadlock"""
+        # Keep pooled LLM/embedding clients open until this instance is finalized
+        acquire_pooled_clients(self)
+
         if self._storages_status == StoragesStatus.CREATED:
             # Set the first initialized workspace will set the default workspace
             # Allows namespace operation without specifying workspace for backward compatibility
@@ -699,7 +824,15 @@ class LightRAG:
                 self.chunk_entity_relation_graph,
                 self.llm_response_cache,
                 self.doc_status,
+                self.query_cache_vdb,
             ):
+                if storage is self.query_cache_vdb:
+                    if storage is not None:
+                        try:
+                            await storage.initialize()
+                        except Exception as e:
+                            self._disable_semantic_cache(e)
+                    continue
                 if storage:
                     # logger.debug(f"Initializing storage: {storage}")
                     await storage.initialize()
@@ -707,6 +840,18 @@ class LightRAG:
             self._storages_status = StoragesStatus.INITIALIZED
             logger.debug("All storage types initialized")
 
+    def _get_chunking_executor(self) -> ChunkingExecutor:
+        """Return the executor that runs chunking for the document pipeline"""
+        if self._chunking_executor is None:
+            self._chunking_executor = ChunkingExecutor(
+                self.tokenizer,
+                self.chunking_func,
+                mode=self.chunking_executor,
+                max_workers=self.chunking_max_workers,
+                max_pending=self.chunking_max_pending,
+            )
+        return self._chunking_executor
+
     async def finalize_storages(self):
         """Asynchronously finalize the storages with improved error handling"""
         if self._storages_status == StoragesStatus.INITIALIZED:
@@ -723,6 +868,7 @@ class LightRAG:
                 ("chunk_entity_relation_graph", self.chunk_entity_relation_graph),
                 ("llm_response_cache", self.llm_response_cache),
                 ("doc_status", self.doc_status),
+                ("query_cache_vdb", self.query_cache_vdb),
             ]
 
             # Finalize each storage individually to ensure one failure doesn't prevent others from closing
@@ -755,6 +901,14 @@ class LightRAG:
 
             self._storages_status = StoragesStatus.FINALIZED
 
+        if self._chunking_executor is not None:
+            self._chunking_executor.shutdown()
+            self._chunking_executor = None
+
+        # Release the keep-alive connections of pooled LLM/embedding clients,
+        # unless other instances still use them
+        await release_pooled_clients(self)
+
     async def check_and_migrate_data(self):
         """Check if data migration is needed and perform migration if necessary"""
         async with get_data_init_lock():
@@ -1807,9 +1961,8 @@ class LightRAG:
                                 )
                             content = content_data["content"]
 
-                            # Call chunking function, supporting both sync and async implementations
-                            chunking_result = self.chunking_func(
-                                self.tokenizer,
+                            # Chunk and hash off the event loop (sync or async chunking_func)
+                            chunking_result = await self._get_chunking_executor().chunk(
                                 content,
                                 split_by_character,
                                 split_by_character_only,
@@ -1817,26 +1970,15 @@ class LightRAG:
                                 self.chunk_token_size,
                             )
 
-                            # If result is awaitable, await to get actual result
-                            if inspect.isawaitable(chunking_result):
-                                chunking_result = await chunking_result
-
-                            # Validate return type
-                            if not isinstance(chunking_result, (list, tuple)):
-                                raise TypeError(
-                                    f"chunking_func must return a list or tuple of dicts, "
-                                    f"got {type(chunking_result)}"
-                                )
-
                             # Build chunks dictionary
                             chunks: dict[str, Any] = {
-                                compute_mdhash_id(dp["content"], prefix="chunk-"): {
+                                chunk_id: {
                                     **dp,
                                     "full_doc_id": doc_id,
                                     "file_path": file_path,  # Add file path to each chunk
                                     "llm_cache_list": [],  # Initialize empty LLM cache list for each chunk
                                 }
-                                for dp in chunking_result
+                                for chunk_id, dp in chunking_result
                             }
 
                             if not chunks:
@@ -2208,6 +2350,8 @@ class LightRAG:
             if storage_inst is not None
         ]
         await asyncio.gather(*tasks)
+        # Answers cached before this change may be outdated
+        await self._invalidate_semantic_cache()
 
         log_message = "In memory DB persist to disk"
         logger.info(log_message)
@@ -2287,6 +2431,9 @@ class LightRAG:
                     "entity_id": entity_name,
                     "entity_type": entity_type,
                     "description": description,
+                    "description_tokens": description_token_count(
+                        description, self.tokenizer
+                    ),
                     "source_id": source_id,
                     "file_path": file_path,
                     "created_at": int(time.time()),
@@ -2341,6 +2488,9 @@ class LightRAG:
                     edge_data={
                         "weight": weight,
                         "description": description,
+                        "description_tokens": description_token_count(
+                            description, self.tokenizer
+                        ),
                         "keywords": keywords,
                         "source_id": source_id,
                         "file_path": file_path,
@@ -2703,6 +2853,15 @@ class LightRAG:
         """
         logger.debug(f"[aquery_llm] Query param: {param}")
 
+        cache_scope = self._semantic_cache_scope(param, system_prompt)
+        query_embedding = None
+        if cache_scope is not None:
+            cached_result, query_embedding = await self._semantic_cache_lookup(
+                query.strip(), cache_scope
+            )
+            if cached_result is not None:
+                return cached_result
+
         global_config = asdict(self)
 
         try:
@@ -2720,6 +2879,7 @@ class LightRAG:
                     hashing_kv=self.llm_response_cache,
                     system_prompt=system_prompt,
                     chunks_vdb=self.chunks_vdb,
+                    query_embedding=query_embedding,
                 )
             elif param.mode == "naive":
                 query_result = await naive_query(
@@ -2729,6 +2889,7 @@ class LightRAG:
                     global_config,
                     hashing_kv=self.llm_response_cache,
                     system_prompt=system_prompt,
+                    query_embedding=query_embedding,
                 )
             elif param.mode == "bypass":
                 # Bypass mode: directly use LLM without knowledge retrieval
@@ -2802,6 +2963,13 @@ class LightRAG:
                 "is_streaming": query_result.is_streaming,
             }
 
+            if (
+                cache_scope is not None
+                and not query_result.is_streaming
+                and raw_data.get("status", "success") == "success"
+            ):
+                await self._semantic_cache_save(query.strip(), cache_scope, raw_data)
+
             return raw_data
 
         except Exception as e:
@@ -2844,11 +3012,136 @@ class LightRAG:
 
     async def _query_done(self):
         await self.llm_response_cache.index_done_callback()
+        if self.query_cache_vdb is not None:
+            await self.query_cache_vdb.index_done_callback()
+
+    def _semantic_cache_scope(
+        self, param: QueryParam, system_prompt: str | None
+    ) -> str | None:
+        """Hash of the query parameters a cached answer is valid for.
+
+        Returns None when the semantic cache does not apply to the query.
+        """
+        if (
+            self.query_cache_vdb is None
+            or param.mode == "bypass"
+            or param.stream
+            or param.conversation_history
+            or param.model_func is not None
+        ):
+            return None
+        return compute_args_hash(
+            param.mode,
+            param.only_need_context,
+            param.only_need_prompt,
+            param.response_type,
+            param.top_k,
+            param.chunk_top_k,
+            param.max_entity_tokens,
+            param.max_relation_tokens,
+            param.max_total_tokens,
+            ",".join(param.hl_keywords),
+            ",".join(param.ll_keywords),
+            param.user_prompt or "",
+            param.enable_rerank,
+            param.include_references,
+            system_prompt or "",
+        )
+
+    def _disable_semantic_cache(self, error: Exception) -> None:
+        """Turn the semantic cache off after its storage failed, warning only once"""
+        if self.query_cache_vdb is None:
+            return
+        logger.warning(
+            f"Semantic query cache disabled, {type(self.query_cache_vdb).__name__} cannot store it: {error}"
+        )
+        self.query_cache_vdb = None
+
+    async def _invalidate_semantic_cache(self) -> None:
+        """Drop cached answers after documents, entities or relations changed"""
+        if self.query_cache_vdb is None:
+            return
+        try:
+            await self.query_cache_vdb.drop()
+        except Exception as e:
+            self._disable_semantic_cache(e)
+
+    async def _semantic_cache_lookup(
+        self, query: str, scope: str
+    ) -> tuple[dict[str, Any] | None, Any]:
+        """Return the cached result of the most similar earlier query, if any
+
+        Returns:
+            tuple: The cached result or None, and the query embedding computed for
+                the lookup, which the query reuses for its own vector searches
+        """
+        threshold = self.embedding_cache_config.get(
+            "similarity_threshold", DEFAULT_EMBEDDING_CACHE_SIMILARITY_THRESHOLD
+        )
+        ttl = self.embedding_cache_config.get("ttl", DEFAULT_EMBEDDING_CACHE_TTL)
+        query_embedding = None
+        try:
+            query_embedding = (
+                await self.query_cache_vdb.embedding_func([query], _priority=5)
+            )[0]
+            candidates = await self.query_cache_vdb.query(
+                query,
+                top_k=DEFAULT_EMBEDDING_CACHE_CANDIDATES,
+                query_embedding=query_embedding,
+            )
+            expired_ids = []
+            for candidate in candidates:
+                if candidate.get("scope") != scope:
+                    continue
+                if ttl and time.time() - candidate.get("cached_at", 0) > ttl:
+                    expired_ids.append(candidate["id"])
+                    continue
+                if candidate.get("distance", 0) < threshold:
+                    continue
+                logger.info(
+                    f" == Semantic cache == hit (similarity {candidate['distance']:.3f})"
+                )
+                raw_data = json.loads(candidate["raw_data"])
+                raw_data["llm_response"] = {
+                    "content": candidate["response"],
+                    "response_iterator": None,
+                    "is_streaming": False,
+                }
+                return raw_data, query_embedding
+            if expired_ids:
+                await self.query_cache_vdb.delete(expired_ids)
+        except Exception as e:
+            if query_embedding is None:
+                logger.warning(f"Semantic cache lookup failed: {e}")
+            else:
+                self._disable_semantic_cache(e)
+        return None, query_embedding
+
+    async def _semantic_cache_save(
+        self, query: str, scope: str, raw_data: dict[str, Any]
+    ) -> None:
+        """Store a query result in the semantic cache"""
+        cached_data = {k: v for k, v in raw_data.items() if k != "llm_response"}
+        try:
+            await self.query_cache_vdb.upsert(
+                {
+                    compute_mdhash_id(scope + query, prefix="qc-"): {
+                        "content": query,
+                        "scope": scope,
+                        "response": raw_data["llm_response"]["content"],
+                        "raw_data": json.dumps(cached_data, ensure_ascii=False),
+                        "cached_at": int(time.time()),
+                    }
+                }
+            )
+        except Exception as e:
+            self._disable_semantic_cache(e)
 
     async def aclear_cache(self) -> None:
         """Clear all cache data from the LLM response cache storage.
 
-        This method clears all cached LLM responses regardless of mode.
+        This method clears all cached LLM responses regardless of mode,
+        including the semantic query cache.
 
         Example:
             # Clear all cache
@@ -2861,6 +3154,9 @@ class LightRAG:
         try:
             # Clear all cache using drop method
             success = await self.llm_response_cache.drop()
+            invalidate_llm_cache_front(self.llm_response_cache)
+            if self.query_cache_vdb is not None:
+                await self.query_cache_vdb.drop()
             if success:
                 logger.info("Cleared all cache")
             else:
@@ -3593,6 +3889,9 @@ class LightRAG:
             if delete_llm_cache and doc_llm_cache_ids and self.llm_response_cache:
                 try:
                     await self.llm_response_cache.delete(doc_llm_cache_ids)
+                    invalidate_llm_cache_front(
+                        self.llm_response_cache, doc_llm_cache_ids
+                    )
                     cache_log_message = f"Successfully deleted {len(doc_llm_cache_ids)} LLM cache entries for document {doc_id}"
                     logger.info(cache_log_message)
                     async with pipeline_status_lock:
@@ -3677,12 +3976,14 @@ class LightRAG:
         """
         from lightrag.utils_graph import adelete_by_entity
 
-        return await adelete_by_entity(
+        result = await adelete_by_entity(
             self.chunk_entity_relation_graph,
             self.entities_vdb,
             self.relationships_vdb,
             entity_name,
         )
+        await self._invalidate_semantic_cache()
+        return result
 
     def delete_by_entity(self, entity_name: str) -> DeletionResult:
         """Synchronously delete an entity and all its relationships.
@@ -3710,12 +4011,14 @@ class LightRAG:
         """
         from lightrag.utils_graph import adelete_by_relation
 
-        return await adelete_by_relation(
+        result = await adelete_by_relation(
             self.chunk_entity_relation_graph,
             self.relationships_vdb,
             source_entity,
             target_entity,
         )
+        await self._invalidate_semantic_cache()
+        return result
 
     def delete_by_relation(
         self, source_entity: str, target_entity: str
@@ -3805,7 +4108,7 @@ class LightRAG:
         """
         from lightrag.utils_graph import aedit_entity
 
-        return await aedit_entity(
+        result = await aedit_entity(
             self.chunk_entity_relation_graph,
             self.entities_vdb,
             self.relationships_vdb,
@@ -3816,6 +4119,8 @@ class LightRAG:
             self.entity_chunks,
             self.relation_chunks,
         )
+        await self._invalidate_semantic_cache()
+        return result
 
     def edit_entity(
         self,
@@ -3847,7 +4152,7 @@ class LightRAG:
         """
         from lightrag.utils_graph import aedit_relation
 
-        return await aedit_relation(
+        result = await aedit_relation(
             self.chunk_entity_relation_graph,
             self.entities_vdb,
             self.relationships_vdb,
@@ -3856,6 +4161,8 @@ class LightRAG:
             updated_data,
             self.relation_chunks,
         )
+        await self._invalidate_semantic_cache()
+        return result
 
     def edit_relation(
         self, source_entity: str, target_entity: str, updated_data: dict[str, Any]
@@ -3881,13 +4188,15 @@ class LightRAG:
         """
         from lightrag.utils_graph import acreate_entity
 
-        return await acreate_entity(
+        result = await acreate_entity(
             self.chunk_entity_relation_graph,
             self.entities_vdb,
             self.relationships_vdb,
             entity_name,
             entity_data,
         )
+        await self._invalidate_semantic_cache()
+        return result
 
     def create_entity(
         self, entity_name: str, entity_data: dict[str, Any]
@@ -3912,7 +4221,7 @@ class LightRAG:
         """
         from lightrag.utils_graph import acreate_relation
 
-        return await acreate_relation(
+        result = await acreate_relation(
             self.chunk_entity_relation_graph,
             self.entities_vdb,
             self.relationships_vdb,
@@ -3920,6 +4229,8 @@ class LightRAG:
             target_entity,
             relation_data,
         )
+        await self._invalidate_semantic_cache()
+        return result
 
     def create_relation(
         self, source_entity: str, target_entity: str, relation_data: dict[str, Any]
@@ -3958,7 +4269,7 @@ class LightRAG:
         """
         from lightrag.utils_graph import amerge_entities
 
-        return await amerge_entities(
+        result = await amerge_entities(
             self.chunk_entity_relation_graph,
             self.entities_vdb,
             self.relationships_vdb,
@@ -3969,6 +4280,8 @@ class LightRAG:
             self.entity_chunks,
             self.relation_chunks,
         )
+        await self._invalidate_semantic_cache()
+        return result
 
     def merge_entities(
         self,
@@ -43,6 +43,11 @@ from lightrag.utils import (
     logger,
 )
 from lightrag.api import __api_version__
+from lightrag.llm.prompt_cache import (
+    cacheable_system_blocks,
+    cached_token_counts,
+    mark_cacheable_messages,
+)
 
 
 # Custom exception for retry mechanism
@@ -68,8 +73,18 @@ async def anthropic_complete_if_cache(
     enable_cot: bool = False,
     base_url: str | None = None,
     api_key: str | None = None,
+    token_tracker: Any | None = None,
+    prompt_cache: bool = True,
     **kwargs: Any,
 ) -> Union[str, AsyncIterator[str]]:
+    """Stream a completion from the Anthropic Messages API.
+
+    With `prompt_cache` the static part of the system prompt and the conversation
+    history are marked with `cache_control`, so the static instructions (and e.g. the
+    first extraction round before gleaning) are read from Anthropic's prompt cache on
+    later calls. The per-query context of query prompts is sent after the breakpoint.
+    Cached and cache-creation token counts are reported to `token_tracker`.
+    """
     if history_messages is None:
         history_messages = []
     if enable_cot:
@@ -105,11 +120,15 @@ async def anthropic_complete_if_cache(
         )
     )
 
-    messages: list[dict[str, Any]] = []
-    if system_prompt:
-        messages.append({"role": "system", "content": system_prompt})
-    messages.extend(history_messages)
+    # The Messages API takes the system prompt as a separate parameter
+    messages: list[dict[str, Any]] = [*history_messages]
     messages.append({"role": "user", "content": prompt})
+    if prompt_cache:
+        messages = mark_cacheable_messages(messages)
+    if system_prompt:
+        kwargs["system"] = (
+            cacheable_system_blocks(system_prompt) if prompt_cache else system_prompt
+        )
 # fmt: off  MS80OmFIVnBZMlhsa0xUb3Y2bzZRMDR5Tnc9PTo2ZjNjYzZjYg==
 
     logger.debug("===== Sending Query to Anthropic LLM =====")
@@ -138,14 +157,21 @@ async def anthropic_complete_if_cache(
         raise
 
     async def stream_response():
+        input_usage = None
+        output_tokens = 0
         try:
             async for event in response:
+                event_type = getattr(event, "type", None)
+                if event_type == "message_start":
+                    input_usage = getattr(event.message, "usage", None)
+                elif event_type == "message_delta" and getattr(event, "usage", None):
+                    output_tokens = getattr(event.usage, "output_tokens", 0) or 0
                 content = (
-                    event.delta.text
-                    if hasattr(event, "delta") and event.delta.text
+                    getattr(event.delta, "text", None)
+                    if hasattr(event, "delta")
                     else None
                 )
-                if content is None:
+                if not content:
                     continue
                 if r"\u" in content:
                     content = safe_unicode_decode(content.encode("utf-8"))
@@ -154,6 +180,23 @@ async def anthropic_complete_if_cache(
             logger.error(f"Error in stream response: {str(e)}")
             raise
 
+        if token_tracker and input_usage is not None:
+            cache_counts = cached_token_counts(input_usage)
+            # input_tokens excludes the prompt tokens read from or written to the cache
+            prompt_tokens = (
+                (getattr(input_usage, "input_tokens", 0) or 0)
+                + cache_counts["cached_tokens"]
+                + cache_counts["cache_creation_tokens"]
+            )
+            token_tracker.add_usage(
+                {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": output_tokens,
+                    "total_tokens": prompt_tokens + output_tokens,
+                    **cache_counts,
+                }
+            )
+
     return stream_response()
 
 
@@ -559,6 +559,8 @@ class OpenAILLMOptions(BindingOptions):
     top_p: float = 1.0  # Nucleus sampling parameter (0.0 to 1.0)
     max_tokens: int = None  # Maximum number of tokens to generate(deprecated, use max_completion_tokens instead)
     extra_body: dict = None  # Extra body parameters for OpenRouter of vLLM
+    prompt_cache_key: str = ""  # Routing key for OpenAI prompt caching
+    prompt_cache_control: bool = False  # Mark prompt segments with cache_control
 
     # Help descriptions
     _help: ClassVar[dict[str, str]] = {
@@ -573,6 +575,8 @@ class OpenAILLMOptions(BindingOptions):
         "top_p": "Nucleus sampling parameter (0.0-1.0, lower = more focused)",
         "max_tokens": "Maximum number of tokens to generate (deprecated, use max_completion_tokens instead)",
         "extra_body": 'Extra body parameters for OpenRouter of vLLM (JSON dict, e.g., \'"reasoning": {"reasoning": {"enabled": false}}\')',
+        "prompt_cache_key": "Key sent as prompt_cache_key so OpenAI routes requests to the same prompt cache (optional)",
+        "prompt_cache_control": "Mark system prompt and history with cache_control blocks, for gateways in front of Anthropic models",
     }
 
 
@@ -0,0 +1,267 @@
+"""
+Registry of long-lived API clients shared by the LLM, embedding and rerank bindings.
+
+Creating a client per request throws away its connection pool, so every call pays
+for a new TCP/TLS handshake. Bindings fetch their client from this registry
+instead, keyed by everything that affects how the client is built (endpoint, a
+hash of the API key, client configs, timeout, ...). Async clients are bound to the
+event loop they were created on, so the running loop is part of the key.
+
+Pooled clients are shared by every LightRAG instance of the process. Each instance
+registers with `acquire_pooled_clients()` and `LightRAG.finalize_storages()` calls
+`release_pooled_clients()`, which closes the clients via `close_pooled_clients()`
+once the last registered instance is finalized; the next request simply builds a
+new one.
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import asyncio
+import hashlib
+import inspect
+import threading
+import weakref
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from lightrag.constants import (
+    DEFAULT_LLM_HTTP2,
+    DEFAULT_LLM_HTTP_KEEPALIVE_EXPIRY,
+    DEFAULT_LLM_HTTP_MAX_CONNECTIONS,
+    DEFAULT_LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+)
+from lightrag.utils import get_env_value, logger
+
+
+@dataclass
+class _PooledClient:
+    client: Any
+    loop: asyncio.AbstractEventLoop | None
+    close: Callable[[Any], Awaitable[None] | None] | None
+
+
+_pooled_clients: dict[tuple, _PooledClient] = {}
+_registry_lock = threading.Lock()
+# id() of the registered users of the pooled clients, e.g. LightRAG instances
+_pool_owners: set[int] = set()
+
+
+def freeze_client_key(value: Any) -> Hashable:
+    """Turn client parameters (dicts, lists, objects) into a hashable cache key"""
+    if isinstance(value, dict):
+        return tuple(
+            sorted(
+                ((str(k), freeze_client_key(v)) for k, v in value.items()),
+                key=lambda item: item[0],
+            )
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [freeze_client_key(v) for v in value]
+        if isinstance(value, (set, frozenset)):
+            items.sort(key=repr)
+        return tuple(items)
+    try:
+        hash(value)
+    except TypeError:
+        # Unhashable objects (e.g. a user supplied http client) are keyed by identity
+        return ("__id__", id(value))
+    return value
+
+
+def hash_secret(secret: str | None) -> str | None:
+    """Hash an API key so it is not kept in plain text inside the registry key"""
+    if not secret:
+        return None
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()
+
+
+def get_http_pool_settings() -> dict[str, Any]:
+    """Connection pool limits for pooled HTTP clients, read from the environment"""
+    return {
+        "max_connections": get_env_value(
+            "LLM_HTTP_MAX_CONNECTIONS", DEFAULT_LLM_HTTP_MAX_CONNECTIONS, int
+        ),
+        "max_keepalive_connections": get_env_value(
+            "LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS",
+            DEFAULT_LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            int,
+        ),
+        "keepalive_expiry": get_env_value(
+            "LLM_HTTP_KEEPALIVE_EXPIRY", DEFAULT_LLM_HTTP_KEEPALIVE_EXPIRY, float
+        ),
+        "http2": get_env_value("LLM_HTTP2", DEFAULT_LLM_HTTP2, bool),
+    }
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def httpx_client_kwargs() -> dict[str, Any]:
+    """Keyword arguments that configure the pool of an httpx.AsyncClient
+
+    HTTP/2 is only requested when the optional `h2` package is installed, since
+    httpx refuses to build an HTTP/2 client without it.
+    """
+    import httpx
+
+    settings = get_http_pool_settings()
+    return {
+        "limits": httpx.Limits(
+            max_connections=settings["max_connections"],
+            max_keepalive_connections=settings["max_keepalive_connections"],
+            keepalive_expiry=settings["keepalive_expiry"],
+        ),
+        "http2": settings["http2"] and _h2_available(),
+    }
+
+
+def _is_client_closed(client: Any) -> bool:
+    # httpx/openai expose `is_closed` (property or method), aiohttp `closed`
+    for attr in ("is_closed", "closed"):
+        state = getattr(client, attr, None)
+        if callable(state):
+            state = state()
+        if isinstance(state, bool):
+            return state
+    return False
+
+
+def get_pooled_client(
+    kind: str,
+    key: Hashable,
+    factory: Callable[[], Any],
+    close: Callable[[Any], Awaitable[None] | None] | None = None,
+    loop_bound: bool = True,
+) -> Any:
+    """Return the pooled client for (kind, key), creating it with `factory` if needed
+
+    Args:
+        kind: Binding name, e.g. "openai" or "ollama".
+        key: Hashable description of the client configuration, see `freeze_client_key`.
+        factory: Builds a new client. It is called at most once per key and loop.
+        close: Releases a client. Defaults to calling its `aclose()` or `close()`.
+        loop_bound: Whether the client belongs to the running event loop
+            (async clients) or can be shared by every loop (sync clients).
+    """
+    loop = asyncio.get_running_loop() if loop_bound else None
+    registry_key = (kind, key, id(loop) if loop is not None else None)
+    with _registry_lock:
+        entry = _pooled_clients.get(registry_key)
+        if (
+            entry is not None
+            and entry.loop is loop
+            and not _is_client_closed(entry.client)
+        ):
+            return entry.client
+        # Clients of event loops that are gone can no longer be closed cleanly
+        for stale_key in [
+            k
+            for k, e in _pooled_clients.items()
+            if e.loop is not None and e.loop.is_closed()
+        ]:
+            del _pooled_clients[stale_key]
+
+        client = factory()
+        _pooled_clients[registry_key] = _PooledClient(client, loop, close)
+        logger.debug(f"Created pooled {kind} client ({len(_pooled_clients)} pooled)")
+        return client
+
+
+async def _close_client(entry: _PooledClient) -> None:
+    if entry.close is not None:
+        result = entry.close(entry.client)
+    else:
+        close_method = getattr(entry.client, "aclose", None) or getattr(
+            entry.client, "close", None
+        )
+        result = close_method() if callable(close_method) else None
+    if inspect.isawaitable(result):
+        await result
+
+
+async def close_pooled_clients() -> int:
+    """Close pooled clients and drop them from the registry
+
+    Async clients can only be closed on their own event loop, so clients of other
+    (still running) loops are left in place. Returns the number of clients closed.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    with _registry_lock:
+        closing = [
+            (k, e)
+            for k, e in _pooled_clients.items()
+            if e.loop is None or e.loop is loop or e.loop.is_closed()
+        ]
+        for k, _ in closing:
+            del _pooled_clients[k]
+
+    closed = 0
+    for (kind, _, _), entry in closing:
+        if entry.loop is not None and entry.loop.is_closed():
+            continue
+        try:
+            await _close_client(entry)
+            closed += 1
+        except Exception as e:
+            logger.warning(f"Failed to close pooled {kind} client: {e}")
+    if closed:
+        logger.debug(f"Closed {closed} pooled API clients")
+    return closed
+
+
+def acquire_pooled_clients(owner: Any) -> None:
+    """Register owner as a user of the pooled clients until it releases them
+
+    Owners that are garbage collected without releasing are unregistered automatically.
+    """
+    owner_id = id(owner)
+    with _registry_lock:
+        if owner_id in _pool_owners:
+            return
+        _pool_owners.add(owner_id)
+    weakref.finalize(owner, _discard_owner, owner_id)
+
+
+def _discard_owner(owner_id: int) -> None:
+    with _registry_lock:
+        _pool_owners.discard(owner_id)
+
+
+async def release_pooled_clients(owner: Any) -> int:
+    """Unregister owner and close the pooled clients if no other owner uses them
+
+    Returns the number of clients closed, which is 0 while other owners remain.
+    """
+    with _registry_lock:
+        _pool_owners.discard(id(owner))
+        if _pool_owners:
+            return 0
+    return await close_pooled_clients()
+
+
+def get_aiohttp_session(kind: str, **session_kwargs: Any):
+    """Return a pooled aiohttp.ClientSession whose connector honours the pool limits"""
+    import aiohttp
+
+    def factory():
+        settings = get_http_pool_settings()
+        connector = aiohttp.TCPConnector(
+            limit=settings["max_connections"],
+            keepalive_timeout=settings["keepalive_expiry"],
+        )
+        return aiohttp.ClientSession(connector=connector, **session_kwargs)
+
+    return get_pooled_client(kind, freeze_client_key(session_kwargs), factory)
@@ -28,6 +28,12 @@ from lightrag.exceptions import (
     APITimeoutError,
 )
 from lightrag.api import __api_version__
+from lightrag.llm.client_pool import (
+    freeze_client_key,
+    get_pooled_client,
+    hash_secret,
+    httpx_client_kwargs,
+)
 
 import numpy as np
 from typing import Optional, Union
@@ -58,6 +64,29 @@ def _coerce_host_for_cloud_model(host: Optional[str], model: object) -> Optional
     return host
 
 
+def _get_ollama_client(
+    host: Optional[str], timeout, headers: dict[str, str]
+) -> ollama.AsyncClient:
+    """Return a pooled Ollama client so its keep-alive connections are reused"""
+    key = freeze_client_key(
+        {
+            "host": host,
+            "timeout": timeout,
+            "headers": {
+                k: hash_secret(v) if k == "Authorization" else v
+                for k, v in headers.items()
+            },
+        }
+    )
+    return get_pooled_client(
+        "ollama",
+        key,
+        lambda: ollama.AsyncClient(
+            host=host, timeout=timeout, headers=headers, **httpx_client_kwargs()
+        ),
+    )
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -97,64 +126,37 @@ async def _ollama_model_if_cache(
 
     host = _coerce_host_for_cloud_model(host, model)
 
-    ollama_client = ollama.AsyncClient(host=host, timeout=timeout, headers=headers)
+    ollama_client = _get_ollama_client(host, timeout, headers)
 
-    try:
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.extend(history_messages)
-        messages.append({"role": "user", "content": prompt})
-
-        response = await ollama_client.chat(model=model, messages=messages, **kwargs)
-        if stream:
-            """cannot cache stream response and process reasoning"""
-
-            async def inner():
-                try:
-                    async for chunk in response:
-                        yield chunk["message"]["content"]
-                except Exception as e:
-                    logger.error(f"Error in stream response: {str(e)}")
-                    raise
-                finally:
-                    try:
-                        await ollama_client._client.aclose()
-                        logger.debug("Successfully closed Ollama client for streaming")
-                    except Exception as close_error:
-                        logger.warning(f"Failed to close Ollama client: {close_error}")
-
-            return inner()
-        else:
-            model_response = response["message"]["content"]
-
-            """
-            If the model also wraps its thoughts in a specific tag,
-            this information is not needed for the final
-            response and can simply be trimmed.
-            """
-
-            return model_response
-    except Exception as e:
-        try:
-            await ollama_client._client.aclose()
-            logger.debug("Successfully closed Ollama client after exception")
-        except Exception as close_error:
-            logger.warning(
-                f"Failed to close Ollama client after exception: {close_error}"
-            )
-        raise e
-    finally:
-        if not stream:
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.extend(history_messages)
+    messages.append({"role": "user", "content": prompt})
+
+    response = await ollama_client.chat(model=model, messages=messages, **kwargs)
+    if stream:
+        """cannot cache stream response and process reasoning"""
+
+        async def inner():
             try:
-                await ollama_client._client.aclose()
-                logger.debug(
-                    "Successfully closed Ollama client for non-streaming response"
-                )
-            except Exception as close_error:
-                logger.warning(
-                    f"Failed to close Ollama client in finally block: {close_error}"
-                )
+                async for chunk in response:
+                    yield chunk["message"]["content"]
+            except Exception as e:
+                logger.error(f"Error in stream response: {str(e)}")
+                raise
+
+        return inner()
+    else:
+        model_response = response["message"]["content"]
+
+        """
+        If the model also wraps its thoughts in a specific tag,
+        this information is not needed for the final
+        response and can simply be trimmed.
+        """
+
+        return model_response
 # pylint: disable  Mi80OmFIVnBZMlhsa0xUb3Y2bzZWVFZMYWc9PTpjYzM5ZjJhNw==
 
 
@@ -198,7 +200,7 @@ async def ollama_embed(texts: list[str], embed_model, **kwargs) -> np.ndarray:
 
     host = _coerce_host_for_cloud_model(host, embed_model)
 
-    ollama_client = ollama.AsyncClient(host=host, timeout=timeout, headers=headers)
+    ollama_client = _get_ollama_client(host, timeout, headers)
     try:
         options = kwargs.pop("options", {})
         data = await ollama_client.embed(
@@ -207,17 +209,4 @@ async def ollama_embed(texts: list[str], embed_model, **kwargs) -> np.ndarray:
         return np.array(data["embeddings"])
     except Exception as e:
         logger.error(f"Error in ollama_embed: {str(e)}")
-        try:
-            await ollama_client._client.aclose()
-            logger.debug("Successfully closed Ollama client after exception in embed")
-        except Exception as close_error:
-            logger.warning(
-                f"Failed to close Ollama client after exception in embed: {close_error}"
-            )
-        raise e
-    finally:
-        try:
-            await ollama_client._client.aclose()
-            logger.debug("Successfully closed Ollama client after embed")
-        except Exception as close_error:
-            logger.warning(f"Failed to close Ollama client after embed: {close_error}")
\ No newline at end of file
+        raise e
\ No newline at end of file
@@ -34,6 +34,13 @@ from lightrag.utils import (
 
 from lightrag.types import GPTKeywordExtractionFormat
 from lightrag.api import __api_version__
+from lightrag.llm.client_pool import (
+    freeze_client_key,
+    get_pooled_client,
+    hash_secret,
+    httpx_client_kwargs,
+)
+from lightrag.llm.prompt_cache import cached_token_counts, mark_cacheable_messages
 
 import numpy as np
 import base64
@@ -176,6 +183,64 @@ def create_openai_async_client(
         return AsyncOpenAI(**merged_configs)
 
 
+def get_openai_async_client(
+    api_key: str | None = None,
+    base_url: str | None = None,
+    use_azure: bool = False,
+    azure_deployment: str | None = None,
+    api_version: str | None = None,
+    timeout: int | None = None,
+    client_configs: dict[str, Any] | None = None,
+) -> AsyncOpenAI:
+    """Return a pooled AsyncOpenAI or AsyncAzureOpenAI client for the given configuration.
+
+    Clients are shared across calls with the same configuration so their keep-alive
+    connection pool is reused instead of opening a new connection per request. The
+    pool limits come from the LLM_HTTP_* environment variables unless client_configs
+    provides its own `http_client`. Pooled clients must not be closed by callers;
+    they are released by `release_pooled_clients()` when the last LightRAG instance
+    is finalized.
+
+    Args:
+        Same as `create_openai_async_client`.
+
+    Returns:
+        An AsyncOpenAI or AsyncAzureOpenAI client instance.
+    """
+    if client_configs is None:
+        client_configs = {}
+
+    key = freeze_client_key(
+        {
+            "api_key": hash_secret(api_key),
+            "base_url": base_url,
+            "use_azure": use_azure,
+            "azure_deployment": azure_deployment,
+            "api_version": api_version,
+            "timeout": timeout,
+            "client_configs": client_configs,
+        }
+    )
+
+    def factory() -> AsyncOpenAI:
+        configs = dict(client_configs)
+        if "http_client" not in configs:
+            from openai import DefaultAsyncHttpxClient
+
+            configs["http_client"] = DefaultAsyncHttpxClient(**httpx_client_kwargs())
+        return create_openai_async_client(
+            api_key=api_key,
+            base_url=base_url,
+            use_azure=use_azure,
+            azure_deployment=azure_deployment,
+            api_version=api_version,
+            timeout=timeout,
+            client_configs=configs,
+        )
+
+    return get_pooled_client("openai", key, factory)
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -201,6 +266,8 @@ async def openai_complete_if_cache(
     use_azure: bool = False,
     azure_deployment: str | None = None,
     api_version: str | None = None,
+    prompt_cache_key: str | None = None,
+    prompt_cache_control: bool = False,
     **kwargs: Any,
 ) -> str:
     """Complete a prompt using OpenAI's API with caching support and Chain of Thought (COT) integration.
@@ -243,6 +310,12 @@ async def openai_complete_if_cache(
         api_version: Azure OpenAI API version (e.g., "2024-02-15-preview"). Only used
             when use_azure=True. If not specified, falls back to AZURE_OPENAI_API_VERSION
             environment variable.
+        prompt_cache_key: Optional `prompt_cache_key` sent with the request. OpenAI routes
+            requests with the same key to the same prompt cache. Default is None.
+        prompt_cache_control: Whether to mark the system prompt and the conversation
+            history with Anthropic-style `cache_control` blocks, for OpenAI compatible
+            gateways (e.g. OpenRouter, LiteLLM) in front of models that need explicit
+            cache breakpoints. Default is False.
         **kwargs: Additional keyword arguments to pass to the OpenAI API.
             Special kwargs:
             - openai_client_configs: Dict of configuration options for the AsyncOpenAI client.
@@ -278,8 +351,8 @@ async def openai_complete_if_cache(
     if keyword_extraction:
         kwargs["response_format"] = GPTKeywordExtractionFormat
 
-    # Create the OpenAI client (supports both OpenAI and Azure)
-    openai_async_client = create_openai_async_client(
+    # Get the pooled OpenAI client (supports both OpenAI and Azure)
+    openai_async_client = get_openai_async_client(
         api_key=api_key,
         base_url=base_url,
         use_azure=use_azure,
@@ -306,6 +379,14 @@ async def openai_complete_if_cache(
     logger.debug("===== Sending Query to LLM =====")
 
     messages = kwargs.pop("messages", messages)
+    if prompt_cache_control:
+        messages = mark_cacheable_messages(messages)
+    if prompt_cache_key:
+        # Sent through extra_body so older SDKs without the parameter still work
+        kwargs["extra_body"] = {
+            **(kwargs.get("extra_body") or {}),
+            "prompt_cache_key": prompt_cache_key,
+        }
 
     # Add explicit parameters back to kwargs so they're passed to OpenAI API
     if stream is not None:
@@ -329,21 +410,17 @@ async def openai_complete_if_cache(
             )
     except APIConnectionError as e:
         logger.error(f"OpenAI API Connection Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except RateLimitError as e:
         logger.error(f"OpenAI API Rate Limit Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except APITimeoutError as e:
         logger.error(f"OpenAI API Timeout Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except Exception as e:
         logger.error(
             f"OpenAI API Call Failed,\nModel: {model},\nParams: {kwargs}, Got: {e}"
         )
-        await openai_async_client.close()  # Ensure client is closed
         raise
 
     if hasattr(response, "__aiter__"):
@@ -448,6 +525,7 @@ async def openai_complete_if_cache(
                             final_chunk_usage, "completion_tokens", 0
                         ),
                         "total_tokens": getattr(final_chunk_usage, "total_tokens", 0),
+                        **cached_token_counts(final_chunk_usage),
                     }
                     token_tracker.add_usage(token_counts)
                     logger.debug(f"Streaming token usage (from API): {token_counts}")
@@ -478,8 +556,6 @@ async def openai_complete_if_cache(
                         logger.warning(
                             f"Failed to close stream response: {close_error}"
                         )
-                # Ensure client is closed in case of exception
-                await openai_async_client.close()
                 raise
             finally:
                 # Final safety check for unclosed COT tags
@@ -511,104 +587,84 @@ async def openai_complete_if_cache(
                                 f"Unexpected error during stream response cleanup: {close_error}"
                             )
 
-                # This prevents resource leaks since the caller doesn't handle closing
-                try:
-                    await openai_async_client.close()
-                    logger.debug(
-                        "Successfully closed OpenAI client for streaming response"
-                    )
-                except Exception as client_close_error:
-                    logger.warning(
-                        f"Failed to close OpenAI client in streaming finally block: {client_close_error}"
-                    )
-
         return inner()
 
     else:
-        try:
-            if (
-                not response
-                or not response.choices
-                or not hasattr(response.choices[0], "message")
-            ):
-                logger.error("Invalid response from OpenAI API")
-                await openai_async_client.close()  # Ensure client is closed
-                raise InvalidResponseError("Invalid response from OpenAI API")
-
-            message = response.choices[0].message
-
-            # Handle parsed responses (structured output via response_format)
-            # When using beta.chat.completions.parse(), the response is in message.parsed
-            if hasattr(message, "parsed") and message.parsed is not None:
-                # Serialize the parsed structured response to JSON
-                final_content = message.parsed.model_dump_json()
-                logger.debug("Using parsed structured response from API")
-            else:
-                # Handle regular content responses
-                content = getattr(message, "content", None)
-                reasoning_content = getattr(message, "reasoning_content", "")
-
-                # Handle COT logic for non-streaming responses (only if enabled)
-                final_content = ""
-
-                if enable_cot:
-                    # Check if we should include reasoning content
-                    should_include_reasoning = False
-                    if reasoning_content and reasoning_content.strip():
-                        if not content or content.strip() == "":
-                            # Case 1: Only reasoning content, should include COT
-                            should_include_reasoning = True
-                            final_content = (
-                                content or ""
-                            )  # Use empty string if content is None
-                        else:
-                            # Case 3: Both content and reasoning_content present, ignore reasoning
-                            should_include_reasoning = False
-                            final_content = content
-                    else:
-                        # No reasoning content, use regular content
-                        final_content = content or ""
-
-                    # Apply COT wrapping if needed
-                    if should_include_reasoning:
-                        if r"\u" in reasoning_content:
-                            reasoning_content = safe_unicode_decode(
-                                reasoning_content.encode("utf-8")
-                            )
+        if (
+            not response
+            or not response.choices
+            or not hasattr(response.choices[0], "message")
+        ):
+            logger.error("Invalid response from OpenAI API")
+            raise InvalidResponseError("Invalid response from OpenAI API")
+
+        message = response.choices[0].message
+
+        # Handle parsed responses (structured output via response_format)
+        # When using beta.chat.completions.parse(), the response is in message.parsed
+        if hasattr(message, "parsed") and message.parsed is not None:
+            # Serialize the parsed structured response to JSON
+            final_content = message.parsed.model_dump_json()
+            logger.debug("Using parsed structured response from API")
+        else:
+            # Handle regular content responses
+            content = getattr(message, "content", None)
+            reasoning_content = getattr(message, "reasoning_content", "")
+
+            # Handle COT logic for non-streaming responses (only if enabled)
+            final_content = ""
+
+            if enable_cot:
+                # Check if we should include reasoning content
+                should_include_reasoning = False
+                if reasoning_content and reasoning_content.strip():
+                    if not content or content.strip() == "":
+                        # Case 1: Only reasoning content, should include COT
+                        should_include_reasoning = True
                         final_content = (
-                            f"<think>{reasoning_content}</think>{final_content}"
-                        )
+                            content or ""
+                        )  # Use empty string if content is None
+                    else:
+                        # Case 3: Both content and reasoning_content present, ignore reasoning
+                        should_include_reasoning = False
+                        final_content = content
                 else:
-                    # COT disabled, only use regular content
+                    # No reasoning content, use regular content
                     final_content = content or ""
 
-                # Validate final content
-                if not final_content or final_content.strip() == "":
-                    logger.error("Received empty content from OpenAI API")
-                    await openai_async_client.close()  # Ensure client is closed
-                    raise InvalidResponseError("Received empty content from OpenAI API")
+                # Apply COT wrapping if needed
+                if should_include_reasoning:
+                    if r"\u" in reasoning_content:
+                        reasoning_content = safe_unicode_decode(
+                            reasoning_content.encode("utf-8")
+                        )
+                    final_content = f"<think>{reasoning_content}</think>{final_content}"
+            else:
+                # COT disabled, only use regular content
+                final_content = content or ""
+
+            # Validate final content
+            if not final_content or final_content.strip() == "":
+                logger.error("Received empty content from OpenAI API")
+                raise InvalidResponseError("Received empty content from OpenAI API")
 
-            # Apply Unicode decoding to final content if needed
-            if r"\u" in final_content:
-                final_content = safe_unicode_decode(final_content.encode("utf-8"))
+        # Apply Unicode decoding to final content if needed
+        if r"\u" in final_content:
+            final_content = safe_unicode_decode(final_content.encode("utf-8"))
 
-            if token_tracker and hasattr(response, "usage"):
-                token_counts = {
-                    "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
-                    "completion_tokens": getattr(
-                        response.usage, "completion_tokens", 0
-                    ),
-                    "total_tokens": getattr(response.usage, "total_tokens", 0),
-                }
-                token_tracker.add_usage(token_counts)
+        if token_tracker and hasattr(response, "usage"):
+            token_counts = {
+                "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
+                "completion_tokens": getattr(response.usage, "completion_tokens", 0),
+                "total_tokens": getattr(response.usage, "total_tokens", 0),
+                **cached_token_counts(response.usage),
+            }
+            token_tracker.add_usage(token_counts)
 
-            logger.debug(f"Response content len: {len(final_content)}")
-            verbose_debug(f"Response: {response}")
+        logger.debug(f"Response content len: {len(final_content)}")
+        verbose_debug(f"Response: {response}")
 
-            return final_content
-        finally:
-            # Ensure client is closed in all cases for non-streaming responses
-            await openai_async_client.close()
+        return final_content
 
 
 async def openai_complete(
@@ -757,8 +813,8 @@ async def openai_embed(
         RateLimitError: If the OpenAI API rate limit is exceeded.
         APITimeoutError: If the OpenAI API request times out.
     """
-    # Create the OpenAI client (supports both OpenAI and Azure)
-    openai_async_client = create_openai_async_client(
+    # Get the pooled OpenAI client (supports both OpenAI and Azure)
+    openai_async_client = get_openai_async_client(
         api_key=api_key,
         base_url=base_url,
         use_azure=use_azure,
@@ -767,40 +823,39 @@ async def openai_embed(
         client_configs=client_configs,
     )
 
-    async with openai_async_client:
-        # Determine the correct model identifier to use
-        # For Azure OpenAI, we must use the deployment name instead of the model name
-        api_model = azure_deployment if use_azure and azure_deployment else model
-
-        # Prepare API call parameters
-        api_params = {
-            "model": api_model,
-            "input": texts,
-            "encoding_format": "base64",
-        }
+    # Determine the correct model identifier to use
+    # For Azure OpenAI, we must use the deployment name instead of the model name
+    api_model = azure_deployment if use_azure and azure_deployment else model
 
-        # Add dimensions parameter only if embedding_dim is provided
-        if embedding_dim is not None:
-            api_params["dimensions"] = embedding_dim
+    # Prepare API call parameters
+    api_params = {
+        "model": api_model,
+        "input": texts,
+        "encoding_format": "base64",
+    }
 
-        # Make API call
-        response = await openai_async_client.embeddings.create(**api_params)
+    # Add dimensions parameter only if embedding_dim is provided
+    if embedding_dim is not None:
+        api_params["dimensions"] = embedding_dim
 
-        if token_tracker and hasattr(response, "usage"):
-            token_counts = {
-                "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
-                "total_tokens": getattr(response.usage, "total_tokens", 0),
-            }
-            token_tracker.add_usage(token_counts)
+    # Make API call
+    response = await openai_async_client.embeddings.create(**api_params)
 
-        return np.array(
-            [
-                np.array(dp.embedding, dtype=np.float32)
-                if isinstance(dp.embedding, list)
-                else np.frombuffer(base64.b64decode(dp.embedding), dtype=np.float32)
-                for dp in response.data
-            ]
-        )
+    if token_tracker and hasattr(response, "usage"):
+        token_counts = {
+            "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
+            "total_tokens": getattr(response.usage, "total_tokens", 0),
+        }
+        token_tracker.add_usage(token_counts)
+
+    return np.array(
+        [
+            np.array(dp.embedding, dtype=np.float32)
+            if isinstance(dp.embedding, list)
+            else np.frombuffer(base64.b64decode(dp.embedding), dtype=np.float32)
+            for dp in response.data
+        ]
+    )
 
 
 # Azure OpenAI wrapper functions for backward compatibility
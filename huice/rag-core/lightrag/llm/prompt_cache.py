@@ -0,0 +1,92 @@
+"""
+Helpers for provider-side prompt caching.
+
+LightRAG prompts keep their static part (instructions, examples) in the system
+prompt and put variable content last, so providers can reuse the processed prefix
+across calls: OpenAI and vLLM do this automatically, Anthropic (and OpenAI
+compatible gateways in front of it) need the cacheable segments marked with
+`cache_control`. The bindings use these helpers to mark the segments and to report
+cached prompt tokens to a TokenTracker.
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+from typing import Any
+
+# Query prompts (rag_response, naive_rag_response) put the retrieved context and the
+# response settings into the system prompt from this heading on
+VARIABLE_SECTION_MARKER = "---Context---"
+
+
+def cache_control_block(text: str) -> dict[str, Any]:
+    """Text content block marked as the end of a cacheable prompt prefix"""
+    return {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+
+
+def cacheable_system_blocks(system_prompt: str) -> list[dict[str, Any]]:
+    """System prompt as content blocks with a cache breakpoint after its static part
+
+    Marking a query prompt as a whole would write a new cache entry for every query,
+    so only the instructions before its context section are marked. Prompts without
+    a context section, e.g. the extraction prompts, are static and marked as a whole.
+    """
+    static, marker, variable = system_prompt.partition(VARIABLE_SECTION_MARKER)
+    if not marker or not static.strip():
+        return [cache_control_block(system_prompt)]
+    return [cache_control_block(static), {"type": "text", "text": marker + variable}]
+
+
+def _mark_message(message: dict[str, Any]) -> dict[str, Any]:
+    content = message.get("content")
+    if isinstance(content, str):
+        return {**message, "content": [cache_control_block(content)]}
+    if isinstance(content, list) and content and isinstance(content[-1], dict):
+        last_block = {**content[-1], "cache_control": {"type": "ephemeral"}}
+        return {**message, "content": [*content[:-1], last_block]}
+    return message
+
+
+def mark_cacheable_messages(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Mark the system prompt and the conversation before the last message as cacheable
+
+    Two cache breakpoints are set: the static part of the last system message, see
+    `cacheable_system_blocks`, and the message preceding the final user prompt, so follow-up calls
+    (e.g. gleaning or multi-turn chat) reuse the whole earlier conversation.
+    The messages are copied, not modified in place.
+    """
+    marked = list(messages)
+    system_indexes = [i for i, m in enumerate(marked) if m.get("role") == "system"]
+    breakpoints = set(system_indexes[-1:])
+    if len(marked) >= 2 and len(marked) - 2 not in breakpoints:
+        breakpoints.add(len(marked) - 2)
+    for i in breakpoints:
+        content = marked[i].get("content")
+        if marked[i].get("role") == "system" and isinstance(content, str):
+            marked[i] = {**marked[i], "content": cacheable_system_blocks(content)}
+        else:
+            marked[i] = _mark_message(marked[i])
+    return marked
+
+
+def cached_token_counts(usage: Any) -> dict[str, int]:
+    """Cached prompt token counts of an OpenAI or Anthropic usage object
+
+    Returns:
+        dict: cached_tokens (prompt tokens read from the cache) and
+            cache_creation_tokens (prompt tokens written to the cache, Anthropic only)
+    """
+    if usage is None:
+        return {"cached_tokens": 0, "cache_creation_tokens": 0}
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) if details is not None else None
+    if cached is None:
+        cached = getattr(usage, "cache_read_input_tokens", None)
+    return {
+        "cached_tokens": cached or 0,
+        "cache_creation_tokens": getattr(usage, "cache_creation_input_tokens", None)
+        or 0,
+    }
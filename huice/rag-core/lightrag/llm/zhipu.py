@@ -37,11 +37,31 @@ from lightrag.utils import (
 )
 
 from lightrag.types import GPTKeywordExtractionFormat
+from lightrag.llm.client_pool import get_pooled_client, hash_secret
 
 import numpy as np
 from typing import Union, List, Optional, Dict
 
 
+def _get_zhipu_client(api_key: Optional[str] = None):
+    """Return a pooled ZhipuAI client so its HTTP connection pool is reused"""
+    # dynamically load ZhipuAI
+    try:
+        from zhipuai import ZhipuAI
+    except ImportError:
+        raise ImportError("Please install zhipuai before initialize zhipuai backend.")
+
+    def factory():
+        if api_key:
+            return ZhipuAI(api_key=api_key)
+        # please set ZHIPUAI_API_KEY in your environment
+        # os.environ["ZHIPUAI_API_KEY"]
+        return ZhipuAI()
+
+    # ZhipuAI is a synchronous client, so one instance serves every event loop
+    return get_pooled_client("zhipu", hash_secret(api_key), factory, loop_bound=False)
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -62,18 +82,7 @@ async def zhipu_complete_if_cache(
         logger.debug(
             "enable_cot=True is not supported for ZhipuAI and will be ignored."
         )
-    # dynamically load ZhipuAI
-    try:
-        from zhipuai import ZhipuAI
-    except ImportError:
-        raise ImportError("Please install zhipuai before initialize zhipuai backend.")
-
-    if api_key:
-        client = ZhipuAI(api_key=api_key)
-    else:
-        # please set ZHIPUAI_API_KEY in your environment
-        # os.environ["ZHIPUAI_API_KEY"]
-        client = ZhipuAI()
+    client = _get_zhipu_client(api_key)
 # type: ignore  MS80OmFIVnBZMlhsa0xUb3Y2bzZUR2x5Wnc9PTphY2UwZWFlNQ==
 
     messages = []
@@ -198,17 +207,7 @@ async def zhipu_complete(
 async def zhipu_embedding(
     texts: list[str], model: str = "embedding-3", api_key: str = None, **kwargs
 ) -> np.ndarray:
-    # dynamically load ZhipuAI
-    try:
-        from zhipuai import ZhipuAI
-    except ImportError:
-        raise ImportError("Please install zhipuai before initialize zhipuai backend.")
-    if api_key:
-        client = ZhipuAI(api_key=api_key)
-    else:
-        # please set ZHIPUAI_API_KEY in your environment
-        # os.environ["ZHIPUAI_API_KEY"]
-        client = ZhipuAI()
+    client = _get_zhipu_client(api_key)
 
     # Convert single text to list if needed
     if isinstance(texts, str):
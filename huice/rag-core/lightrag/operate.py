@@ -9,8 +9,17 @@ from pathlib import Path
 
 import asyncio
 import json
+import re
 import json_repair
-from typing import Any, AsyncIterator, overload, Literal
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Iterable,
+    Iterator,
+    overload,
+    Literal,
+)
 from collections import Counter, defaultdict
 
 from lightrag.exceptions import (
@@ -26,11 +35,16 @@ from lightrag.utils import (
     pack_user_ass_to_openai_messages,
     split_string_by_multi_markers,
     truncate_list_by_token_size,
+    count_tokens,
+    description_token_count,
+    stored_description_tokens,
     compute_args_hash,
     handle_cache,
     save_to_cache,
     CacheData,
     use_llm_func_with_cache,
+    get_cached_llm_result,
+    save_llm_result_to_cache,
     update_chunk_cache_list,
     remove_think_tags,
     pick_by_weighted_polling,
@@ -69,6 +83,8 @@ from lightrag.constants import (
     DEFAULT_FILE_PATH_MORE_PLACEHOLDER,
     DEFAULT_MAX_FILE_PATHS,
     DEFAULT_ENTITY_NAME_MAX_LENGTH,
+    DEFAULT_GRAPH_UPSERT_BATCH_SIZE,
+    DEFAULT_EMBEDDING_BATCH_NUM,
 )
 from lightrag.kg.shared_storage import get_storage_keyed_lock
 import time
@@ -101,70 +117,221 @@ def _truncate_entity_identifier(
     return display_value
 
 
-def chunking_by_token_size(
+# Long texts are encoded in segments of about this many characters, so the
+# chunker never holds the token list of a whole document
+CHUNKING_SEGMENT_CHARS = 65536
+
+_UTF8_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+
+
+def _utf8_char_count(data: bytes) -> int:
+    """Count characters in UTF-8 bytes by counting the non-continuation bytes"""
+    return len(data.translate(None, _UTF8_CONTINUATION_BYTES))
+
+
+def _iter_text_segments(content: str, segment_chars: int) -> Iterator[str]:
+    """Split content into segments of about segment_chars characters.
+
+    Segments end after a newline or before a space that starts a word, where
+    BPE pre-tokenizers split anyway, so encoding segment by segment yields the
+    same tokens as encoding the whole text.
+    """
+    start = 0
+    while len(content) - start > segment_chars:
+        floor = start + segment_chars // 2
+        limit = start + segment_chars
+        cut = limit
+        for sep in ("\n", " "):
+            pos = content.rfind(sep, floor, limit)
+            while pos != -1 and (
+                content[pos + 1].isspace()
+                or (sep == " " and content[pos - 1].isspace())
+            ):
+                pos = content.rfind(sep, floor, pos)
+            if pos != -1:
+                cut = pos + 1 if sep == "\n" else pos
+                break
+        yield content[start:cut]
+        start = cut
+    if start < len(content):
+        yield content[start:]
+
+
+def _iter_token_windows(
+    tokenizer: Tokenizer,
+    content: str,
+    segments: Iterable[tuple[str, list[int]]],
+    chunk_token_size: int,
+    chunk_overlap_token_size: int,
+) -> Iterator[tuple[int, str]]:
+    """Yield (token count, text) windows of chunk_token_size tokens over content.
+
+    segments are consecutive (text, tokens) pieces covering content. Only the
+    tokens of the current window are buffered. Window text is sliced from
+    content by character offset when the tokenizer exposes token bytes, and
+    decoded from the window tokens otherwise.
+    """
+    step = chunk_token_size - chunk_overlap_token_size
+    if step == 0:
+        raise ValueError(
+            "chunk_overlap_token_size must be smaller than chunk_token_size"
+        )
+    if step < 0:
+        return
+    buffer: list[int] = []
+    # Character index of the first UTF-8 lead byte in buffer
+    buffer_lead_char = 0
+    # UTF-8 lead bytes before buffer[counted], so each token is decoded about once
+    counted = 0
+    counted_lead_char = 0
+    use_offsets = True
+    emitted = 0
+
+    def lead_chars(start: int, end: int) -> int:
+        return _utf8_char_count(tokenizer.decode_bytes(buffer[start:end]))
+
+    def snap(offset: int, index: int) -> int:
+        # A token starting inside a multi-byte character snaps to its start
+        first_byte = tokenizer.decode_bytes(buffer[index : index + 1])[:1]
+        if first_byte and first_byte[0] in _UTF8_CONTINUATION_BYTES:
+            return offset - 1
+        return offset
+
+    def window(at_eof: bool) -> tuple[int, str]:
+        nonlocal counted, counted_lead_char
+        end = min(chunk_token_size, len(buffer))
+        reaches_end = at_eof and end == len(buffer)
+        if use_offsets:
+            counted_lead_char += lead_chars(counted, end)
+            counted = end
+        if reaches_end and emitted == 0:
+            return end, content
+        if use_offsets:
+            stop = len(content) if reaches_end else snap(counted_lead_char, end)
+            return end, content[snap(buffer_lead_char, 0) : stop]
+        return end, tokenizer.decode(buffer[:end])
+
+    def advance() -> None:
+        nonlocal buffer_lead_char, counted, emitted
+        dropped = min(step, len(buffer))
+        if use_offsets:
+            # The overlap carried into the next window is counted back from its end
+            buffer_lead_char = counted_lead_char - lead_chars(dropped, counted)
+            counted -= dropped
+        del buffer[:dropped]
+        emitted += 1
+
+    for segment, tokens in segments:
+        if use_offsets:
+            token_bytes = tokenizer.decode_bytes(tokens)
+            # Offsets are only valid if the tokens decode back to the segment
+            use_offsets = token_bytes is not None and _utf8_char_count(
+                token_bytes
+            ) == len(segment)
+        buffer.extend(tokens)
+        # The end offset of a window is known once the token after it arrived
+        while len(buffer) > chunk_token_size:
+            yield window(at_eof=False)
+            advance()
+    while buffer:
+        yield window(at_eof=True)
+        advance()
+
+
+def _iter_split_windows(
+    tokenizer: Tokenizer,
+    content: str,
+    split_by_character: str,
+    split_by_character_only: bool,
+    chunk_overlap_token_size: int,
+    chunk_token_size: int,
+) -> Iterator[tuple[int, str]]:
+    """Yield (token count, text) chunks of content split by split_by_character"""
+    for chunk in content.split(split_by_character):
+        tokens = tokenizer.encode(chunk)
+        if len(tokens) <= chunk_token_size:
+            yield len(tokens), chunk
+        elif split_by_character_only:
+            logger.warning(
+                "Chunk split_by_character exceeds token limit: len=%d limit=%d",
+                len(tokens),
+                chunk_token_size,
+            )
+            raise ChunkTokenLimitExceededError(
+                chunk_tokens=len(tokens),
+                chunk_token_limit=chunk_token_size,
+                chunk_preview=chunk[:120],
+            )
+        else:
+            yield from _iter_token_windows(
+                tokenizer,
+                chunk,
+                [(chunk, tokens)],
+                chunk_token_size,
+                chunk_overlap_token_size,
+            )
+
+
+def iter_chunks_by_token_size(
     tokenizer: Tokenizer,
     content: str,
     split_by_character: str | None = None,
     split_by_character_only: bool = False,
     chunk_overlap_token_size: int = 100,
     chunk_token_size: int = 1200,
-) -> list[dict[str, Any]]:
-    tokens = tokenizer.encode(content)
-    results: list[dict[str, Any]] = []
+) -> Iterator[dict[str, Any]]:
+    """Streaming variant of chunking_by_token_size yielding one chunk at a time.
+
+    Every piece of text is encoded once. Chunk text is sliced from the input by
+    character offset instead of decoding tokens, and without split_by_character
+    the input is encoded segment by segment so its full token list is never
+    materialized.
+    """
     if split_by_character:
-        raw_chunks = content.split(split_by_character)
-        new_chunks = []
-        if split_by_character_only:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                if len(_tokens) > chunk_token_size:
-                    logger.warning(
-                        "Chunk split_by_character exceeds token limit: len=%d limit=%d",
-                        len(_tokens),
-                        chunk_token_size,
-                    )
-                    raise ChunkTokenLimitExceededError(
-                        chunk_tokens=len(_tokens),
-                        chunk_token_limit=chunk_token_size,
-                        chunk_preview=chunk[:120],
-                    )
-                new_chunks.append((len(_tokens), chunk))
-        else:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                if len(_tokens) > chunk_token_size:
-                    for start in range(
-                        0, len(_tokens), chunk_token_size - chunk_overlap_token_size
-                    ):
-                        chunk_content = tokenizer.decode(
-                            _tokens[start : start + chunk_token_size]
-                        )
-                        new_chunks.append(
-                            (min(chunk_token_size, len(_tokens) - start), chunk_content)
-                        )
-                else:
-                    new_chunks.append((len(_tokens), chunk))
-        for index, (_len, chunk) in enumerate(new_chunks):
-            results.append(
-                {
-                    "tokens": _len,
-                    "content": chunk.strip(),
-                    "chunk_order_index": index,
-                }
-            )
+        windows = _iter_split_windows(
+            tokenizer,
+            content,
+            split_by_character,
+            split_by_character_only,
+            chunk_overlap_token_size,
+            chunk_token_size,
+        )
     else:
-        for index, start in enumerate(
-            range(0, len(tokens), chunk_token_size - chunk_overlap_token_size)
-        ):
-            chunk_content = tokenizer.decode(tokens[start : start + chunk_token_size])
-            results.append(
-                {
-                    "tokens": min(chunk_token_size, len(tokens) - start),
-                    "content": chunk_content.strip(),
-                    "chunk_order_index": index,
-                }
-            )
-    return results
+        segments = (
+            (segment, tokenizer.encode(segment))
+            for segment in _iter_text_segments(content, CHUNKING_SEGMENT_CHARS)
+        )
+        windows = _iter_token_windows(
+            tokenizer, content, segments, chunk_token_size, chunk_overlap_token_size
+        )
+    for index, (token_count, chunk) in enumerate(windows):
+        yield {
+            "tokens": token_count,
+            "content": chunk.strip(),
+            "chunk_order_index": index,
+        }
+
+
+def chunking_by_token_size(
+    tokenizer: Tokenizer,
+    content: str,
+    split_by_character: str | None = None,
+    split_by_character_only: bool = False,
+    chunk_overlap_token_size: int = 100,
+    chunk_token_size: int = 1200,
+) -> list[dict[str, Any]]:
+    return list(
+        iter_chunks_by_token_size(
+            tokenizer,
+            content,
+            split_by_character,
+            split_by_character_only,
+            chunk_overlap_token_size,
+            chunk_token_size,
+        )
+    )
+
+
 # noqa  MC80OmFIVnBZMlhsa0xUb3Y2bzZjVGxYU0E9PToyMTcxYzI5ZQ==
 
 
@@ -1041,6 +1208,47 @@ async def _process_extraction_result(
     return dict(maybe_nodes), dict(maybe_edges)
 
 
+def _split_packed_extraction_result(
+    result: str,
+    chunk_keys: list[str],
+    completion_delimiter: str = "<|COMPLETE|>",
+) -> dict[str, str]:
+    """Split the output of a packed extraction call back into per-chunk results
+
+    Sections are located by their chunk delimiter (PROMPTS["DEFAULT_CHUNK_DELIMITER"]).
+    Each section is returned in the shape of a single-chunk extraction result, i.e.
+    its records followed by the completion delimiter, so it can be cached and parsed
+    by _process_extraction_result for its own chunk.
+    Args:
+        result (str): The packed extraction result
+        chunk_keys (list[str]): Chunk keys in the order the chunks were packed
+        completion_delimiter (str): Delimiter for completion
+    Returns:
+        dict: chunk_key -> extraction result; chunks without a section are left out
+    """
+    marker_pattern = re.escape(PROMPTS["DEFAULT_CHUNK_DELIMITER"]).replace(
+        re.escape("{index}"), r"\s*(\d+)\s*"
+    )
+    matches = list(re.finditer(marker_pattern, result, flags=re.IGNORECASE))
+
+    sections: dict[str, list[str]] = {}
+    for i, match in enumerate(matches):
+        index = int(match.group(1))
+        if not 1 <= index <= len(chunk_keys):
+            logger.warning(f"Packed extraction result has unknown section {index}")
+            continue
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(result)
+        section = result[match.end() : end]
+        for marker in (completion_delimiter, completion_delimiter.lower()):
+            section = section.replace(marker, "")
+        sections.setdefault(chunk_keys[index - 1], []).append(section.strip())
+
+    return {
+        chunk_key: "\n".join([*(part for part in parts if part), completion_delimiter])
+        for chunk_key, parts in sections.items()
+    }
+
+
 async def _rebuild_from_extraction_result(
     text_chunks_storage: BaseKVStorage,
     extraction_result: str,
@@ -1109,6 +1317,9 @@ async def _rebuild_single_entity(
             updated_entity_data = {
                 **current_entity,
                 "description": final_description,
+                "description_tokens": description_token_count(
+                    final_description, global_config.get("tokenizer")
+                ),
                 "entity_type": entity_type,
                 "source_id": GRAPH_FIELD_SEP.join(source_chunk_ids),
                 "file_path": GRAPH_FIELD_SEP.join(file_paths)
@@ -1475,6 +1686,9 @@ async def _rebuild_single_relationship(
         else current_relationship.get("file_path", "unknown_source"),
         "truncate": truncation_info,
     }
+    updated_relationship_data["description_tokens"] = description_token_count(
+        updated_relationship_data["description"], global_config.get("tokenizer")
+    )
 
     # Ensure both endpoint nodes exist before writing the edge back
     # (certain storage backends require pre-existing nodes).
@@ -1845,6 +2059,9 @@ async def _merge_nodes_then_upsert(
         entity_id=entity_name,
         entity_type=entity_type,
         description=description,
+        description_tokens=description_token_count(
+            description, global_config.get("tokenizer")
+        ),
         source_id=source_id,
         file_path=file_path,
         created_at=int(time.time()),
@@ -2347,6 +2564,9 @@ async def _merge_edges_then_upsert(
         edge_data=dict(
             weight=weight,
             description=description,
+            description_tokens=description_token_count(
+                description, global_config.get("tokenizer")
+            ),
             keywords=keywords,
             source_id=source_id,
             file_path=file_path,
@@ -2404,6 +2624,234 @@ async def _merge_edges_then_upsert(
     return edge_data
 
 
+class _DeferredMerge(Exception):
+    """Raised by a batched merge needing an LLM summary, which is rerun on its own"""
+
+
+async def _defer_llm_summary(*args, **kwargs):
+    raise _DeferredMerge()
+
+
+def _graph_edge_key(source_node_id: str, target_node_id: str) -> tuple[str, str]:
+    return tuple(sorted((source_node_id, target_node_id)))
+
+
+class _StagedGraph:
+    """Graph storage view serving a locked merge batch from prefetched nodes and edges
+
+    Writes of the running merge are staged. commit() keeps them for flush(), which
+    writes all kept rows with one upsert_nodes_batch/upsert_edges_batch call, and
+    rollback() drops them. Anything not prefetched is read on first use.
+    """
+
+    def __init__(self, storage: BaseGraphStorage):
+        self._storage = storage
+        self._nodes: dict[str, dict | None] = {}
+        self._edges: dict[tuple[str, str], dict | None] = {}
+        self._staged_nodes: dict[str, dict] = {}
+        self._staged_edges: dict[tuple[str, str], tuple[str, str, dict]] = {}
+        self._node_writes: dict[str, dict] = {}
+        self._edge_writes: dict[tuple[str, str], tuple[str, str, dict]] = {}
+
+    def __getattr__(self, name):
+        return getattr(self._storage, name)
+
+    async def prefetch(
+        self, node_ids: list[str], edge_pairs: list[tuple[str, str]]
+    ) -> None:
+        """Read the existing nodes and edges with one batched read each"""
+
+        async def get_edges():
+            if not edge_pairs:
+                return {}
+            return await self._storage.get_edges_batch(
+                [{"src": src, "tgt": tgt} for src, tgt in edge_pairs]
+            )
+
+        nodes, edges = await asyncio.gather(
+            self._storage.get_nodes_batch(node_ids), get_edges()
+        )
+        for node_id in node_ids:
+            self._nodes[node_id] = nodes.get(node_id)
+        for src, tgt in edge_pairs:
+            self._edges[_graph_edge_key(src, tgt)] = edges.get((src, tgt))
+
+    async def get_node(self, node_id: str) -> dict | None:
+        if node_id in self._staged_nodes:
+            return self._staged_nodes[node_id]
+        if node_id not in self._nodes:
+            self._nodes[node_id] = await self._storage.get_node(node_id)
+        return self._nodes[node_id]
+
+    async def has_node(self, node_id: str) -> bool:
+        return await self.get_node(node_id) is not None
+
+    async def get_edge(self, source_node_id: str, target_node_id: str) -> dict | None:
+        edge_key = _graph_edge_key(source_node_id, target_node_id)
+        if edge_key in self._staged_edges:
+            return self._staged_edges[edge_key][2]
+        if edge_key not in self._edges:
+            self._edges[edge_key] = await self._storage.get_edge(
+                source_node_id, target_node_id
+            )
+        return self._edges[edge_key]
+
+    async def has_edge(self, source_node_id: str, target_node_id: str) -> bool:
+        return await self.get_edge(source_node_id, target_node_id) is not None
+
+    async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
+        current = await self.get_node(node_id)
+        self._staged_nodes[node_id] = {**(current or {}), **node_data}
+
+    async def upsert_edge(
+        self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
+    ) -> None:
+        current = await self.get_edge(source_node_id, target_node_id)
+        self._staged_edges[_graph_edge_key(source_node_id, target_node_id)] = (
+            source_node_id,
+            target_node_id,
+            {**(current or {}), **edge_data},
+        )
+
+    def commit(self) -> None:
+        self._nodes.update(self._staged_nodes)
+        self._node_writes.update(self._staged_nodes)
+        for edge_key, (_, _, edge_data) in self._staged_edges.items():
+            self._edges[edge_key] = edge_data
+        self._edge_writes.update(self._staged_edges)
+        self.rollback()
+
+    def rollback(self) -> None:
+        self._staged_nodes = {}
+        self._staged_edges = {}
+
+    async def flush(self) -> None:
+        node_writes, self._node_writes = self._node_writes, {}
+        edge_writes, self._edge_writes = self._edge_writes, {}
+        if node_writes:
+            await self._storage.upsert_nodes_batch(list(node_writes.items()))
+        if edge_writes:
+            await self._storage.upsert_edges_batch(list(edge_writes.values()))
+
+
+class _StagedKV:
+    """KV storage view serving a locked merge batch from prefetched records
+
+    Writes are staged, committed and flushed like those of _StagedGraph.
+    """
+
+    def __init__(self, storage: BaseKVStorage):
+        self._storage = storage
+        self._records: dict[str, dict | None] = {}
+        self._staged: dict[str, dict] = {}
+        self._writes: dict[str, dict] = {}
+
+    def __getattr__(self, name):
+        return getattr(self._storage, name)
+
+    async def prefetch(self, ids: list[str]) -> None:
+        """Read the existing records with one batched read"""
+        ids = list(dict.fromkeys(ids))
+        self._records.update(zip(ids, await self._storage.get_by_ids(ids)))
+
+    async def get_by_id(self, id: str) -> dict | None:
+        if id in self._staged:
+            return self._staged[id]
+        if id not in self._records:
+            self._records[id] = await self._storage.get_by_id(id)
+        return self._records[id]
+
+    async def upsert(self, data: dict[str, dict]) -> None:
+        self._staged.update(data)
+
+    def commit(self) -> None:
+        self._records.update(self._staged)
+        self._writes.update(self._staged)
+        self.rollback()
+
+    def rollback(self) -> None:
+        self._staged = {}
+
+    async def flush(self) -> None:
+        writes, self._writes = self._writes, {}
+        if writes:
+            await self._storage.upsert(writes)
+
+
+class _StagedVectorStorage:
+    """Vector storage view collecting the upserts and deletes of a locked merge batch
+
+    Staged like _StagedGraph. flush() applies the deletes, then writes the upserts in
+    batches of batch_size records, so the embedding function gets full batches
+    instead of one record per merged entity or relation.
+    """
+
+    def __init__(
+        self,
+        storage: BaseVectorStorage,
+        batch_size: int,
+        operation_name: str,
+        retry_delay: float = 0.2,
+    ):
+        self._storage = storage
+        self._batch_size = max(1, batch_size)
+        self._operation_name = operation_name
+        self._retry_delay = retry_delay
+        self._staged: dict[str, dict] = {}
+        self._staged_deletes: set[str] = set()
+        self._pending: dict[str, dict] = {}
+        self._deletes: set[str] = set()
+
+    def __getattr__(self, name):
+        return getattr(self._storage, name)
+
+    async def upsert(self, data: dict[str, dict]) -> None:
+        # A later payload of the same record replaces the earlier one
+        self._staged.update(data)
+
+    async def delete(self, ids: list[str]) -> None:
+        for id in ids:
+            self._staged.pop(id, None)
+            self._staged_deletes.add(id)
+
+    def commit(self) -> None:
+        for id in self._staged_deletes:
+            self._pending.pop(id, None)
+        self._deletes |= self._staged_deletes
+        self._pending.update(self._staged)
+        self.rollback()
+
+    def rollback(self) -> None:
+        self._staged = {}
+        self._staged_deletes = set()
+
+    async def flush(self) -> None:
+        deletes, self._deletes = self._deletes, set()
+        pending, self._pending = self._pending, {}
+        if deletes:
+            try:
+                await self._storage.delete(sorted(deletes))
+            except Exception as e:
+                logger.debug(f"Could not delete old vector records: {e}")
+        items = list(pending.items())
+        # Each upsert is retried like single-record writes
+        await asyncio.gather(
+            *(
+                safe_vdb_operation_with_exception(
+                    operation=lambda payload=dict(batch): self._storage.upsert(payload),
+                    operation_name=self._operation_name,
+                    entity_name=f"{len(batch)} records",
+                    max_retries=3,
+                    retry_delay=self._retry_delay,
+                )
+                for batch in (
+                    items[i : i + self._batch_size]
+                    for i in range(0, len(items), self._batch_size)
+                )
+            )
+        )
+
+
 async def merge_nodes_and_edges(
     chunk_results: list,
     knowledge_graph_inst: BaseGraphStorage,
@@ -2488,76 +2936,63 @@ async def merge_nodes_and_edges(
         pipeline_status["latest_message"] = log_message
         pipeline_status["history_messages"].append(log_message)
 
-    async def _locked_process_entity_name(entity_name, entities):
-        async with semaphore:
-            # Check for cancellation before processing entity
-            if pipeline_status is not None and pipeline_status_lock is not None:
-                async with pipeline_status_lock:
-                    if pipeline_status.get("cancellation_requested", False):
-                        raise PipelineCancelledException(
-                            "User cancelled during entity merge"
-                        )
+    # Merges run in batches of graph_upsert_batch_size names holding the keyed locks
+    # of all of them: the existing records are prefetched with batched reads and the
+    # writes are flushed with batched upserts before the locks are released. A merge
+    # needing an LLM summary is rolled back and rerun on its own afterwards, so no
+    # batch holds its locks while the LLM works.
+    merge_batch_size = max(
+        1,
+        global_config.get("graph_upsert_batch_size", DEFAULT_GRAPH_UPSERT_BATCH_SIZE),
+    )
+    batch_config = {**global_config, "llm_model_func": _defer_llm_summary}
+    workspace = global_config.get("workspace", "")
+    namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
+    embedding_batch_num = global_config.get(
+        "embedding_batch_num", DEFAULT_EMBEDDING_BATCH_NUM
+    )
 
-            workspace = global_config.get("workspace", "")
-            namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
-            async with get_storage_keyed_lock(
-                [entity_name], namespace=namespace, enable_logging=False
-            ):
-                try:
-                    logger.debug(f"Processing entity {entity_name}")
-                    entity_data = await _merge_nodes_then_upsert(
-                        entity_name,
-                        entities,
-                        knowledge_graph_inst,
-                        entity_vdb,
-                        global_config,
-                        pipeline_status,
-                        pipeline_status_lock,
-                        llm_response_cache,
-                        entity_chunks_storage,
-                    )
+    def _stage_kv(storage):
+        return _StagedKV(storage) if storage is not None else None
 
-                    return entity_data
+    def _stage_vdb(storage, operation_name, retry_delay):
+        if storage is None:
+            return None
+        return _StagedVectorStorage(
+            storage, embedding_batch_num, operation_name, retry_delay
+        )
 
-                except Exception as e:
-                    error_msg = f"Error processing entity `{entity_name}`: {e}"
-                    logger.error(error_msg)
-
-                    # Try to update pipeline status, but don't let status update failure affect main exception
-                    try:
-                        if (
-                            pipeline_status is not None
-                            and pipeline_status_lock is not None
-                        ):
-                            async with pipeline_status_lock:
-                                pipeline_status["latest_message"] = error_msg
-                                pipeline_status["history_messages"].append(error_msg)
-                    except Exception as status_error:
-                        logger.error(
-                            f"Failed to update pipeline status: {status_error}"
-                        )
+    async def _check_cancellation(message):
+        if pipeline_status is not None and pipeline_status_lock is not None:
+            async with pipeline_status_lock:
+                if pipeline_status.get("cancellation_requested", False):
+                    raise PipelineCancelledException(message)
 
-                    # Re-raise the original exception with a prefix
-                    prefixed_exception = create_prefixed_exception(
-                        e, f"`{entity_name}`"
-                    )
-                    raise prefixed_exception from e
-
-    # Create entity processing tasks
-    entity_tasks = []
-    for entity_name, entities in all_nodes.items():
-        task = asyncio.create_task(_locked_process_entity_name(entity_name, entities))
-        entity_tasks.append(task)
-
-    # Execute entity tasks with error handling
-    processed_entities = []
-    if entity_tasks:
-        done, pending = await asyncio.wait(
-            entity_tasks, return_when=asyncio.FIRST_EXCEPTION
-        )
+    async def _merge_error(e, description, prefix):
+        """Report a failed merge and return the prefixed exception to raise"""
+        error_msg = f"Error processing {description}: {e}"
+        logger.error(error_msg)
 
+        # Try to update pipeline status, but don't let status update failure affect main exception
+        try:
+            if pipeline_status is not None and pipeline_status_lock is not None:
+                async with pipeline_status_lock:
+                    pipeline_status["latest_message"] = error_msg
+                    pipeline_status["history_messages"].append(error_msg)
+        except Exception as status_error:
+            logger.error(f"Failed to update pipeline status: {status_error}")
+
+        return create_prefixed_exception(e, prefix)
+
+    async def _run_merge_tasks(coros) -> list:
+        """Run merge tasks concurrently, cancelling the others once one fails"""
+        tasks = [asyncio.create_task(coro) for coro in coros]
+        results = []
+        if not tasks:
+            return results
+
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
         first_exception = None
-        processed_entities = []
 
         for task in done:
             try:
@@ -2566,7 +3001,7 @@ async def merge_nodes_and_edges(
                 if first_exception is None:
                     first_exception = e
             else:
-                processed_entities.append(result)
+                results.append(result)
 
         if pending:
             for task in pending:
@@ -2577,10 +3012,134 @@ async def merge_nodes_and_edges(
                     if first_exception is None:
                         first_exception = result
                 else:
-                    processed_entities.append(result)
+                    results.append(result)
 
         if first_exception is not None:
             raise first_exception
+        return results
+
+    async def _merge_locked_batch(
+        batch, lock_keys, views, prefetch, merge, describe, cancel_message
+    ):
+        """Merge the items of a batch one by one under the keyed locks of lock_keys
+
+        Returns:
+            The results of the completed merges and the items deferred for an LLM
+            summary. Completed merges are flushed even if a later one fails.
+        """
+        views = [view for view in views if view is not None]
+        async with semaphore:
+            await _check_cancellation(cancel_message)
+            async with get_storage_keyed_lock(
+                lock_keys, namespace=namespace, enable_logging=False
+            ):
+                results, deferred = [], []
+                try:
+                    await prefetch()
+                    for item in batch:
+                        try:
+                            result = await merge(item)
+                        except _DeferredMerge:
+                            for view in views:
+                                view.rollback()
+                            deferred.append(item)
+                            continue
+                        except Exception as e:
+                            raise await _merge_error(e, *describe(item)) from e
+                        for view in views:
+                            view.commit()
+                        results.append(result)
+                finally:
+                    for view in views:
+                        view.rollback()
+                        await view.flush()
+                return results, deferred
+
+    async def _merge_entity_batch(batch):
+        entity_names = [entity_name for entity_name, _ in batch]
+        graph_view = _StagedGraph(knowledge_graph_inst)
+        entity_chunks_view = _stage_kv(entity_chunks_storage)
+        entity_vdb_batch = _stage_vdb(entity_vdb, "entity_upsert", 0.1)
+
+        async def prefetch():
+            reads = [graph_view.prefetch(entity_names, [])]
+            if entity_chunks_view is not None:
+                reads.append(entity_chunks_view.prefetch(entity_names))
+            await asyncio.gather(*reads)
+
+        async def merge(item):
+            entity_name, entities = item
+            logger.debug(f"Processing entity {entity_name}")
+            return await _merge_nodes_then_upsert(
+                entity_name,
+                entities,
+                graph_view,
+                entity_vdb_batch,
+                batch_config,
+                pipeline_status,
+                pipeline_status_lock,
+                llm_response_cache,
+                entity_chunks_view,
+            )
+
+        return await _merge_locked_batch(
+            batch,
+            entity_names,
+            [graph_view, entity_chunks_view, entity_vdb_batch],
+            prefetch,
+            merge,
+            lambda item: (f"entity `{item[0]}`", f"`{item[0]}`"),
+            "User cancelled during entity merge",
+        )
+
+    async def _locked_process_entity_name(entity_name, entities):
+        async with semaphore:
+            # Check for cancellation before processing entity
+            await _check_cancellation("User cancelled during entity merge")
+
+            async with get_storage_keyed_lock(
+                [entity_name], namespace=namespace, enable_logging=False
+            ):
+                try:
+                    logger.debug(f"Processing entity {entity_name}")
+                    entity_data = await _merge_nodes_then_upsert(
+                        entity_name,
+                        entities,
+                        knowledge_graph_inst,
+                        entity_vdb,
+                        global_config,
+                        pipeline_status,
+                        pipeline_status_lock,
+                        llm_response_cache,
+                        entity_chunks_storage,
+                    )
+
+                    return entity_data
+
+                except Exception as e:
+                    # Re-raise the original exception with a prefix
+                    raise await _merge_error(
+                        e, f"entity `{entity_name}`", f"`{entity_name}`"
+                    ) from e
+
+    # Merge the entities in locked batches, then the deferred ones one by one
+    entity_items = list(all_nodes.items())
+    batch_results = await _run_merge_tasks(
+        _merge_entity_batch(entity_items[i : i + merge_batch_size])
+        for i in range(0, len(entity_items), merge_batch_size)
+    )
+    processed_entities = [
+        entity_data for results, _ in batch_results for entity_data in results
+    ]
+    deferred_entities = [item for _, deferred in batch_results for item in deferred]
+    if deferred_entities:
+        logger.debug(f"Merging {len(deferred_entities)} entities with LLM summaries")
+    processed_entities.extend(
+        await _run_merge_tasks(
+            _locked_process_entity_name(entity_name, entities)
+            for entity_name, entities in deferred_entities
+        )
+    )
 
     # ===== Phase 2: Process all relationships concurrently =====
     log_message = f"Phase 2: Processing {total_relations_count} relations from {doc_id} (async: {graph_max_async})"
@@ -2589,18 +3148,75 @@ async def merge_nodes_and_edges(
         pipeline_status["latest_message"] = log_message
         pipeline_status["history_messages"].append(log_message)
 
+    async def _merge_edge_batch(batch):
+        edge_pairs = [edge_key for edge_key, _ in batch]
+        node_ids = list(
+            dict.fromkeys(node_id for pair in edge_pairs for node_id in pair)
+        )
+        graph_view = _StagedGraph(knowledge_graph_inst)
+        entity_chunks_view = _stage_kv(entity_chunks_storage)
+        relation_chunks_view = _stage_kv(relation_chunks_storage)
+        relationships_vdb_batch = _stage_vdb(
+            relationships_vdb, "relationship_upsert", 0.2
+        )
+        entity_vdb_batch = _stage_vdb(entity_vdb, "entity_upsert", 0.1)
+
+        async def prefetch():
+            reads = [graph_view.prefetch(node_ids, edge_pairs)]
+            if entity_chunks_view is not None:
+                reads.append(entity_chunks_view.prefetch(node_ids))
+            if relation_chunks_view is not None:
+                reads.append(
+                    relation_chunks_view.prefetch(
+                        [make_relation_chunk_key(src, tgt) for src, tgt in edge_pairs]
+                    )
+                )
+            await asyncio.gather(*reads)
+
+        async def merge(item):
+            edge_key, edges = item
+            added_entities = []  # Track entities added during edge processing
+            logger.debug(f"Processing relation {sorted(edge_key)}")
+            edge_data = await _merge_edges_then_upsert(
+                edge_key[0],
+                edge_key[1],
+                edges,
+                graph_view,
+                relationships_vdb_batch,
+                entity_vdb_batch,
+                batch_config,
+                pipeline_status,
+                pipeline_status_lock,
+                llm_response_cache,
+                added_entities,
+                relation_chunks_view,
+                entity_chunks_view,
+            )
+            if edge_data is None:
+                return None, []
+            return edge_data, added_entities
+
+        return await _merge_locked_batch(
+            batch,
+            node_ids,
+            [
+                graph_view,
+                entity_chunks_view,
+                relation_chunks_view,
+                relationships_vdb_batch,
+                entity_vdb_batch,
+            ],
+            prefetch,
+            merge,
+            lambda item: (f"relation `{sorted(item[0])}`", f"{sorted(item[0])}"),
+            "User cancelled during relation merge",
+        )
+
     async def _locked_process_edges(edge_key, edges):
         async with semaphore:
             # Check for cancellation before processing edges
-            if pipeline_status is not None and pipeline_status_lock is not None:
-                async with pipeline_status_lock:
-                    if pipeline_status.get("cancellation_requested", False):
-                        raise PipelineCancelledException(
-                            "User cancelled during relation merge"
-                        )
+            await _check_cancellation("User cancelled during relation merge")
 
-            workspace = global_config.get("workspace", "")
-            namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
             sorted_edge_key = sorted([edge_key[0], edge_key[1]])
 
             async with get_storage_keyed_lock(
@@ -2634,73 +3250,33 @@ async def merge_nodes_and_edges(
                     return edge_data, added_entities
 
                 except Exception as e:
-                    error_msg = f"Error processing relation `{sorted_edge_key}`: {e}"
-                    logger.error(error_msg)
-
-                    # Try to update pipeline status, but don't let status update failure affect main exception
-                    try:
-                        if (
-                            pipeline_status is not None
-                            and pipeline_status_lock is not None
-                        ):
-                            async with pipeline_status_lock:
-                                pipeline_status["latest_message"] = error_msg
-                                pipeline_status["history_messages"].append(error_msg)
-                    except Exception as status_error:
-                        logger.error(
-                            f"Failed to update pipeline status: {status_error}"
-                        )
-
                     # Re-raise the original exception with a prefix
-                    prefixed_exception = create_prefixed_exception(
-                        e, f"{sorted_edge_key}"
-                    )
-                    raise prefixed_exception from e
-
-    # Create relationship processing tasks
-    edge_tasks = []
-    for edge_key, edges in all_edges.items():
-        task = asyncio.create_task(_locked_process_edges(edge_key, edges))
-        edge_tasks.append(task)
+                    raise await _merge_error(
+                        e, f"relation `{sorted_edge_key}`", f"{sorted_edge_key}"
+                    ) from e
+
+    # Merge the relations in locked batches, then the deferred ones one by one
+    edge_items = list(all_edges.items())
+    batch_results = await _run_merge_tasks(
+        _merge_edge_batch(edge_items[i : i + merge_batch_size])
+        for i in range(0, len(edge_items), merge_batch_size)
+    )
+    edge_results = [result for results, _ in batch_results for result in results]
+    deferred_edges = [item for _, deferred in batch_results for item in deferred]
+    if deferred_edges:
+        logger.debug(f"Merging {len(deferred_edges)} relations with LLM summaries")
+    edge_results.extend(
+        await _run_merge_tasks(
+            _locked_process_edges(edge_key, edges) for edge_key, edges in deferred_edges
+        )
+    )
 
-    # Execute relationship tasks with error handling
     processed_edges = []
     all_added_entities = []
-
-    if edge_tasks:
-        done, pending = await asyncio.wait(
-            edge_tasks, return_when=asyncio.FIRST_EXCEPTION
-        )
-
-        first_exception = None
-
-        for task in done:
-            try:
-                edge_data, added_entities = task.result()
-            except BaseException as e:
-                if first_exception is None:
-                    first_exception = e
-            else:
-                if edge_data is not None:
-                    processed_edges.append(edge_data)
-                all_added_entities.extend(added_entities)
-
-        if pending:
-            for task in pending:
-                task.cancel()
-            pending_results = await asyncio.gather(*pending, return_exceptions=True)
-            for result in pending_results:
-                if isinstance(result, BaseException):
-                    if first_exception is None:
-                        first_exception = result
-                else:
-                    edge_data, added_entities = result
-                    if edge_data is not None:
-                        processed_edges.append(edge_data)
-                    all_added_entities.extend(added_entities)
-
-        if first_exception is not None:
-            raise first_exception
+    for edge_data, added_entities in edge_results:
+        if edge_data is not None:
+            processed_edges.append(edge_data)
+        all_added_entities.extend(added_entities)
 
     # ===== Phase 3: Update full_entities and full_relations storage =====
     if full_entities_storage and full_relations_storage and doc_id:
@@ -2822,6 +3398,79 @@ async def extract_entities(
     processed_chunks = 0
     total_chunks = len(ordered_chunks)
 
+    def _chunk_prompts(content: str) -> tuple[str, str, str]:
+        """System, user and gleaning prompts of a single-chunk extraction"""
+        prompt_context = {**context_base, "input_text": content}
+        return (
+            PROMPTS["entity_extraction_system_prompt"].format(**prompt_context),
+            PROMPTS["entity_extraction_user_prompt"].format(**prompt_context),
+            PROMPTS["entity_continue_extraction_user_prompt"].format(**prompt_context),
+        )
+
+    def _merge_gleaning_result(
+        maybe_nodes: dict, maybe_edges: dict, glean_nodes: dict, glean_edges: dict
+    ) -> None:
+        """Merge gleaning results - compare description lengths to choose better version"""
+        for entity_name, glean_entities in glean_nodes.items():
+            if entity_name in maybe_nodes:
+                # Compare description lengths and keep the better one
+                original_desc_len = len(
+                    maybe_nodes[entity_name][0].get("description", "") or ""
+                )
+                glean_desc_len = len(glean_entities[0].get("description", "") or "")
+
+                if glean_desc_len > original_desc_len:
+                    maybe_nodes[entity_name] = list(glean_entities)
+                # Otherwise keep original version
+            else:
+                # New entity from gleaning stage
+                maybe_nodes[entity_name] = list(glean_entities)
+
+        for edge_key, glean_edges in glean_edges.items():
+            if edge_key in maybe_edges:
+                # Compare description lengths and keep the better one
+                original_desc_len = len(
+                    maybe_edges[edge_key][0].get("description", "") or ""
+                )
+                glean_desc_len = len(glean_edges[0].get("description", "") or "")
+
+                if glean_desc_len > original_desc_len:
+                    maybe_edges[edge_key] = list(glean_edges)
+                # Otherwise keep original version
+            else:
+                # New edge from gleaning stage
+                maybe_edges[edge_key] = list(glean_edges)
+
+    async def _finish_chunk(
+        chunk_key: str,
+        cache_keys_collector: list[str],
+        maybe_nodes: dict,
+        maybe_edges: dict,
+    ) -> tuple[dict, dict]:
+        """Record the chunk's LLM cache keys and report extraction progress"""
+        nonlocal processed_chunks
+        # Batch update chunk's llm_cache_list with all collected cache keys
+        if cache_keys_collector and text_chunks_storage:
+            await update_chunk_cache_list(
+                chunk_key,
+                text_chunks_storage,
+                cache_keys_collector,
+                "entity_extraction",
+            )
+
+        processed_chunks += 1
+        entities_count = len(maybe_nodes)
+        relations_count = len(maybe_edges)
+        log_message = f"Chunk {processed_chunks} of {total_chunks} extracted {entities_count} Ent + {relations_count} Rel {chunk_key}"
+        logger.info(log_message)
+        if pipeline_status is not None:
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = log_message
+                pipeline_status["history_messages"].append(log_message)
+
+        # Return the extracted nodes and edges for centralized processing
+        return maybe_nodes, maybe_edges
+
     async def _process_single_content(chunk_key_dp: tuple[str, TextChunkSchema]):
         """Process a single chunk
         Args:
@@ -2830,7 +3479,6 @@ async def extract_entities(
         Returns:
             tuple: (maybe_nodes, maybe_edges) containing extracted entities and relationships
         """
-        nonlocal processed_chunks
         chunk_key = chunk_key_dp[0]
         chunk_dp = chunk_key_dp[1]
         content = chunk_dp["content"]
@@ -2841,15 +3489,11 @@ async def extract_entities(
         cache_keys_collector = []
 
         # Get initial extraction
-        entity_extraction_system_prompt = PROMPTS[
-            "entity_extraction_system_prompt"
-        ].format(**{**context_base, "input_text": content})
-        entity_extraction_user_prompt = PROMPTS["entity_extraction_user_prompt"].format(
-            **{**context_base, "input_text": content}
-        )
-        entity_continue_extraction_user_prompt = PROMPTS[
-            "entity_continue_extraction_user_prompt"
-        ].format(**{**context_base, "input_text": content})
+        (
+            entity_extraction_system_prompt,
+            entity_extraction_user_prompt,
+            entity_continue_extraction_user_prompt,
+        ) = _chunk_prompts(content)
 
         final_result, timestamp = await use_llm_func_with_cache(
             entity_extraction_user_prompt,
@@ -2897,65 +3541,186 @@ async def extract_entities(
                 tuple_delimiter=context_base["tuple_delimiter"],
                 completion_delimiter=context_base["completion_delimiter"],
             )
+            _merge_gleaning_result(maybe_nodes, maybe_edges, glean_nodes, glean_edges)
 
-            # Merge results - compare description lengths to choose better version
-            for entity_name, glean_entities in glean_nodes.items():
-                if entity_name in maybe_nodes:
-                    # Compare description lengths and keep the better one
-                    original_desc_len = len(
-                        maybe_nodes[entity_name][0].get("description", "") or ""
-                    )
-                    glean_desc_len = len(glean_entities[0].get("description", "") or "")
+        return await _finish_chunk(
+            chunk_key, cache_keys_collector, maybe_nodes, maybe_edges
+        )
 
-                    if glean_desc_len > original_desc_len:
-                        maybe_nodes[entity_name] = list(glean_entities)
-                    # Otherwise keep original version
-                else:
-                    # New entity from gleaning stage
-                    maybe_nodes[entity_name] = list(glean_entities)
+    async def _process_packed_contents(
+        packed_chunks: list[tuple[str, TextChunkSchema]],
+    ) -> list[tuple[dict, dict]]:
+        """Extract several small chunks with one LLM call (plus one gleaning call)
 
-            for edge_key, glean_edges in glean_edges.items():
-                if edge_key in maybe_edges:
-                    # Compare description lengths and keep the better one
-                    original_desc_len = len(
-                        maybe_edges[edge_key][0].get("description", "") or ""
-                    )
-                    glean_desc_len = len(glean_edges[0].get("description", "") or "")
+        The packed output is split back per chunk and cached under the key of the
+        chunk's own extraction call, so re-processing a chunk hits the cache and
+        rebuild_knowledge_from_chunks finds its extraction results as usual.
+        Chunks that are already cached, or whose section is missing from the
+        output, are extracted on their own.
+        """
+        results = []
+        pending = []
+        for chunk_key_dp in packed_chunks:
+            system_prompt, user_prompt, _ = _chunk_prompts(chunk_key_dp[1]["content"])
+            if await get_cached_llm_result(
+                user_prompt, llm_response_cache, system_prompt=system_prompt
+            ):
+                results.append(await _process_single_content(chunk_key_dp))
+            else:
+                pending.append(chunk_key_dp)
+        if len(pending) < 2:
+            for chunk_key_dp in pending:
+                results.append(await _process_single_content(chunk_key_dp))
+            return results
+
+        chunk_keys = [chunk_key for chunk_key, _ in pending]
+        packed_text = "\n\n".join(
+            f"{PROMPTS['DEFAULT_CHUNK_DELIMITER'].format(index=i)}\n{chunk_dp['content']}"
+            for i, (_, chunk_dp) in enumerate(pending, start=1)
+        )
+        packed_context = {
+            **context_base,
+            "input_text": packed_text,
+            "chunk_count": len(pending),
+            "first_chunk_delimiter": PROMPTS["DEFAULT_CHUNK_DELIMITER"].format(index=1),
+        }
+        packed_system_prompt = PROMPTS["entity_extraction_system_prompt"].format(
+            **packed_context
+        )
+        packed_user_prompt = PROMPTS["entity_extraction_packed_user_prompt"].format(
+            **packed_context
+        )
 
-                    if glean_desc_len > original_desc_len:
-                        maybe_edges[edge_key] = list(glean_edges)
-                    # Otherwise keep original version
-                else:
-                    # New edge from gleaning stage
-                    maybe_edges[edge_key] = list(glean_edges)
+        # The packed response itself is not cached, only its per-chunk sections
+        packed_result, timestamp = await use_llm_func_with_cache(
+            packed_user_prompt,
+            use_llm_func,
+            system_prompt=packed_system_prompt,
+            cache_type="extract",
+        )
+        sections = _split_packed_extraction_result(
+            packed_result, chunk_keys, context_base["completion_delimiter"]
+        )
 
-        # Batch update chunk's llm_cache_list with all collected cache keys
-        if cache_keys_collector and text_chunks_storage:
-            await update_chunk_cache_list(
+        cache_keys_collectors = {}
+        for chunk_key, chunk_dp in pending:
+            if chunk_key not in sections:
+                continue
+            cache_keys_collectors[chunk_key] = []
+            system_prompt, user_prompt, _ = _chunk_prompts(chunk_dp["content"])
+            await save_llm_result_to_cache(
+                sections[chunk_key],
+                user_prompt,
+                llm_response_cache,
+                system_prompt=system_prompt,
+                chunk_id=chunk_key,
+                cache_keys_collector=cache_keys_collectors[chunk_key],
+            )
+        extraction_saved_at = int(time.time())
+
+        glean_sections = {}
+        if entity_extract_max_gleaning > 0:
+            glean_result, glean_timestamp = await use_llm_func_with_cache(
+                PROMPTS["entity_continue_extraction_packed_user_prompt"].format(
+                    **packed_context
+                ),
+                use_llm_func,
+                system_prompt=packed_system_prompt,
+                history_messages=pack_user_ass_to_openai_messages(
+                    packed_user_prompt, packed_result
+                ),
+                cache_type="extract",
+            )
+            glean_sections = _split_packed_extraction_result(
+                glean_result, chunk_keys, context_base["completion_delimiter"]
+            )
+            # Cache storages stamp create_time in whole seconds, and rebuilds order a
+            # chunk's extraction results by it, so gleaning must be saved strictly later
+            wait_time = extraction_saved_at + 1 - time.time()
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
+
+        for chunk_key, chunk_dp in pending:
+            final_result = sections.get(chunk_key)
+            if final_result is None:
+                logger.warning(
+                    f"{chunk_key}: Missing from packed extraction result, extracting it separately"
+                )
+                results.append(await _process_single_content((chunk_key, chunk_dp)))
+                continue
+
+            file_path = chunk_dp.get("file_path", "unknown_source")
+            cache_keys_collector = cache_keys_collectors[chunk_key]
+            system_prompt, user_prompt, continue_prompt = _chunk_prompts(
+                chunk_dp["content"]
+            )
+            maybe_nodes, maybe_edges = await _process_extraction_result(
+                final_result,
                 chunk_key,
-                text_chunks_storage,
-                cache_keys_collector,
-                "entity_extraction",
+                timestamp,
+                file_path,
+                tuple_delimiter=context_base["tuple_delimiter"],
+                completion_delimiter=context_base["completion_delimiter"],
             )
 
-        processed_chunks += 1
-        entities_count = len(maybe_nodes)
-        relations_count = len(maybe_edges)
-        log_message = f"Chunk {processed_chunks} of {total_chunks} extracted {entities_count} Ent + {relations_count} Rel {chunk_key}"
-        logger.info(log_message)
-        if pipeline_status is not None:
-            async with pipeline_status_lock:
-                pipeline_status["latest_message"] = log_message
-                pipeline_status["history_messages"].append(log_message)
+            if entity_extract_max_gleaning > 0:
+                glean_result = glean_sections.get(
+                    chunk_key, context_base["completion_delimiter"]
+                )
+                await save_llm_result_to_cache(
+                    glean_result,
+                    continue_prompt,
+                    llm_response_cache,
+                    system_prompt=system_prompt,
+                    history_messages=pack_user_ass_to_openai_messages(
+                        user_prompt, final_result
+                    ),
+                    chunk_id=chunk_key,
+                    cache_keys_collector=cache_keys_collector,
+                )
+                glean_nodes, glean_edges = await _process_extraction_result(
+                    glean_result,
+                    chunk_key,
+                    glean_timestamp,
+                    file_path,
+                    tuple_delimiter=context_base["tuple_delimiter"],
+                    completion_delimiter=context_base["completion_delimiter"],
+                )
+                _merge_gleaning_result(
+                    maybe_nodes, maybe_edges, glean_nodes, glean_edges
+                )
 
-        # Return the extracted nodes and edges for centralized processing
-        return maybe_nodes, maybe_edges
+            results.append(
+                await _finish_chunk(
+                    chunk_key, cache_keys_collector, maybe_nodes, maybe_edges
+                )
+            )
+        return results
+
+    # Group small chunks for packed extraction, keeping document order
+    pack_tokens = global_config.get("entity_extract_pack_tokens", 0) or 0
+    pack_max_chunks = global_config.get("entity_extract_pack_max_chunks", 8) or 1
+    chunk_groups: list[list[tuple[str, TextChunkSchema]]] = []
+    group_tokens = 0
+    for chunk_key_dp in ordered_chunks:
+        chunk_tokens = chunk_key_dp[1].get("tokens", 0)
+        if (
+            pack_tokens > 0
+            and chunk_groups
+            and len(chunk_groups[-1]) < pack_max_chunks
+            and group_tokens + chunk_tokens <= pack_tokens
+        ):
+            chunk_groups[-1].append(chunk_key_dp)
+            group_tokens += chunk_tokens
+        else:
+            chunk_groups.append([chunk_key_dp])
+            group_tokens = chunk_tokens
 
     # Get max async tasks limit from global_config
     chunk_max_async = global_config.get("llm_model_max_async", 4)
     semaphore = asyncio.Semaphore(chunk_max_async)
 
-    async def _process_with_semaphore(chunk):
+    async def _process_with_semaphore(chunk_group):
         async with semaphore:
             # Check for cancellation before processing chunk
             if pipeline_status is not None and pipeline_status_lock is not None:
@@ -2966,15 +3731,17 @@ async def extract_entities(
                         )
 
             try:
-                return await _process_single_content(chunk)
+                if len(chunk_group) == 1:
+                    return [await _process_single_content(chunk_group[0])]
+                return await _process_packed_contents(chunk_group)
             except Exception as e:
-                chunk_id = chunk[0]  # Extract chunk_id from chunk[0]
+                chunk_id = chunk_group[0][0]  # chunk_id of the group's first chunk
                 prefixed_exception = create_prefixed_exception(e, chunk_id)
                 raise prefixed_exception from e
 
     tasks = []
-    for c in ordered_chunks:
-        task = asyncio.create_task(_process_with_semaphore(c))
+    for chunk_group in chunk_groups:
+        task = asyncio.create_task(_process_with_semaphore(chunk_group))
         tasks.append(task)
 
     # Wait for tasks to complete or for the first exception to occur
@@ -2992,7 +3759,7 @@ async def extract_entities(
                 if first_exception is None:
                     first_exception = exception
             else:
-                chunk_results.append(task.result())
+                chunk_results.extend(task.result())
         except Exception as e:
             if first_exception is None:
                 first_exception = e
@@ -3030,6 +3797,7 @@ async def kg_query(
     hashing_kv: BaseKVStorage | None = None,
     system_prompt: str | None = None,
     chunks_vdb: BaseVectorStorage = None,
+    query_embedding: list[float] | None = None,
 ) -> QueryResult | None:
     """
     Execute knowledge graph query and return unified QueryResult object.
@@ -3045,6 +3813,7 @@ async def kg_query(
         hashing_kv: Cache storage
         system_prompt: System prompt
         chunks_vdb: Document chunks vector database
+        query_embedding: Optional pre-computed embedding of the query
 
     Returns:
         QueryResult | None: Unified query result object containing:
@@ -3104,6 +3873,7 @@ async def kg_query(
         text_chunks_db,
         query_param,
         chunks_vdb,
+        query_embedding,
     )
 
     if context_result is None:
@@ -3427,6 +4197,56 @@ async def _get_vector_context(
         return []
 
 
+class _BranchTimeoutError(Exception):
+    """A TimeoutError raised inside a retrieval branch, not by its deadline"""
+
+    def __init__(self, error: BaseException):
+        super().__init__(str(error))
+        self.error = error
+
+
+async def _run_search_branches(
+    branches: dict[str, Awaitable[Any]], timeout: float | None
+) -> tuple[dict[str, Any], list[str]]:
+    """Run retrieval branches concurrently, each within an optional deadline.
+
+    Returns the results of the branches that finished and the names of the
+    branches that timed out. Other errors, including timeouts raised inside a
+    branch (e.g. by a storage client), are raised as before.
+    """
+
+    async def guarded(branch: Awaitable[Any]) -> Any:
+        try:
+            return await branch
+        except asyncio.TimeoutError as e:
+            raise _BranchTimeoutError(e) from e
+
+    async def run_branch(branch: Awaitable[Any]) -> Any:
+        if timeout:
+            return await asyncio.wait_for(guarded(branch), timeout)
+        return await branch
+
+    outcomes = await asyncio.gather(
+        *(run_branch(branch) for branch in branches.values()),
+        return_exceptions=True,
+    )
+    results: dict[str, Any] = {}
+    timed_out: list[str] = []
+    for name, outcome in zip(branches, outcomes):
+        if isinstance(outcome, _BranchTimeoutError):
+            raise outcome.error
+        if isinstance(outcome, asyncio.TimeoutError):
+            logger.warning(
+                f"Retrieval branch '{name}' exceeded {timeout}s, continuing with partial results"
+            )
+            timed_out.append(name)
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            results[name] = outcome
+    return results, timed_out
+
+
 async def _perform_kg_search(
     query: str,
     ll_keywords: str,
@@ -3437,10 +4257,12 @@ async def _perform_kg_search(
     text_chunks_db: BaseKVStorage,
     query_param: QueryParam,
     chunks_vdb: BaseVectorStorage = None,
+    query_embedding: list[float] | None = None,
 ) -> dict[str, Any]:
     """
     Pure search logic that retrieves raw entities, relations, and vector chunks.
     No token truncation or formatting - just raw search results.
+    A given query_embedding is used instead of embedding the query again.
     """
 
     # Initialize result containers
@@ -3456,76 +4278,113 @@ async def _perform_kg_search(
     # Track chunk sources and metadata for final logging
     chunk_tracking = {}  # chunk_id -> {source, frequency, order}
 
-    # Pre-compute query embedding once for all vector operations
+    # Local, global and vector retrieval are independent round-trip chains.
+    # local/global mode falls back to the other branch when its keywords are empty.
+    run_local = len(ll_keywords) > 0 and not (
+        query_param.mode == "global" and len(hl_keywords) > 0
+    )
+    run_global = len(hl_keywords) > 0 and not (
+        query_param.mode == "local" and len(ll_keywords) > 0
+    )
+    run_vector = query_param.mode == "mix" and chunks_vdb
+
+    # Every string the search embeds goes into one batched embedding call:
+    # the query (vector search, VECTOR chunk picking) and the keyword strings
     kg_chunk_pick_method = text_chunks_db.global_config.get(
         "kg_chunk_pick_method", DEFAULT_KG_CHUNK_PICK_METHOD
     )
-    query_embedding = None
-    if query and (kg_chunk_pick_method == "VECTOR" or chunks_vdb):
+    texts_to_embed: dict[str, str] = {}
+    precomputed = {"query": query_embedding} if query_embedding is not None else {}
+    if query and (kg_chunk_pick_method == "VECTOR" or chunks_vdb) and not precomputed:
+        texts_to_embed["query"] = query
+    if run_local:
+        texts_to_embed["local"] = ll_keywords
+    if run_global:
+        texts_to_embed["global"] = hl_keywords
+
+    async def compute_embeddings() -> dict[str, Any]:
         actual_embedding_func = text_chunks_db.embedding_func
-        if actual_embedding_func:
-            try:
-                query_embedding = await actual_embedding_func([query])
-                query_embedding = query_embedding[
-                    0
-                ]  # Extract first embedding from batch result
-                logger.debug("Pre-computed query embedding for all vector operations")
-            except Exception as e:
-                logger.warning(f"Failed to pre-compute query embedding: {e}")
-                query_embedding = None
+        if not actual_embedding_func or not texts_to_embed:
+            return precomputed
+        unique_texts = list(dict.fromkeys(texts_to_embed.values()))
+        try:
+            # Same priority as the query embeddings of the vector storages
+            embeddings = await actual_embedding_func(unique_texts, _priority=5)
+        except Exception as e:
+            # Storages embed their own query strings when this is missing
+            logger.warning(f"Failed to pre-compute query embeddings: {e}")
+            return precomputed
+        logger.debug(f"Pre-computed {len(unique_texts)} query embeddings in one batch")
+        by_text = dict(zip(unique_texts, embeddings))
+        return {
+            **precomputed,
+            **{name: by_text[text] for name, text in texts_to_embed.items()},
+        }
+
+    embedding_task = asyncio.create_task(compute_embeddings())
 
-    # Handle local and global modes
-    if query_param.mode == "local" and len(ll_keywords) > 0:
-        local_entities, local_relations = await _get_node_data(
+    async def get_embedding(name: str) -> Any:
+        # Shielded: a branch deadline must not cancel the shared embedding call
+        return (await asyncio.shield(embedding_task)).get(name)
+
+    async def local_branch() -> tuple[list[dict], list[dict]]:
+        return await _get_node_data(
             ll_keywords,
             knowledge_graph_inst,
             entities_vdb,
             query_param,
+            query_embedding=await get_embedding("local"),
         )
 
-    elif query_param.mode == "global" and len(hl_keywords) > 0:
-        global_relations, global_entities = await _get_edge_data(
+    async def global_branch() -> tuple[list[dict], list[dict]]:
+        return await _get_edge_data(
             hl_keywords,
             knowledge_graph_inst,
             relationships_vdb,
             query_param,
+            query_embedding=await get_embedding("global"),
         )
 
-    else:  # hybrid or mix mode
-        if len(ll_keywords) > 0:
-            local_entities, local_relations = await _get_node_data(
-                ll_keywords,
-                knowledge_graph_inst,
-                entities_vdb,
-                query_param,
-            )
-        if len(hl_keywords) > 0:
-            global_relations, global_entities = await _get_edge_data(
-                hl_keywords,
-                knowledge_graph_inst,
-                relationships_vdb,
-                query_param,
-            )
+    async def vector_branch() -> list[dict]:
+        return await _get_vector_context(
+            query, chunks_vdb, query_param, await get_embedding("query")
+        )
 
-        # Get vector chunks for mix mode
-        if query_param.mode == "mix" and chunks_vdb:
-            vector_chunks = await _get_vector_context(
-                query,
-                chunks_vdb,
-                query_param,
-                query_embedding,
-            )
-            # Track vector chunks with source metadata
-            for i, chunk in enumerate(vector_chunks):
-                chunk_id = chunk.get("chunk_id") or chunk.get("id")
-                if chunk_id:
-                    chunk_tracking[chunk_id] = {
-                        "source": "C",
-                        "frequency": 1,  # Vector chunks always have frequency 1
-                        "order": i + 1,  # 1-based order in vector search results
-                    }
-                else:
-                    logger.warning(f"Vector chunk missing chunk_id: {chunk}")
+    branches: dict[str, Awaitable[Any]] = {}
+    if run_local:
+        branches["local"] = local_branch()
+    if run_global:
+        branches["global"] = global_branch()
+    if run_vector:
+        branches["vector"] = vector_branch()
+
+    branch_results, timed_out_branches = await _run_search_branches(
+        branches, query_param.search_branch_timeout
+    )
+    if timed_out_branches and not embedding_task.done():
+        # The deadline passed during the embedding call, so do not wait for it;
+        # later stages embed the query themselves when they need it
+        embedding_task.cancel()
+    else:
+        query_embedding = (await embedding_task).get("query")
+
+    if "local" in branch_results:
+        local_entities, local_relations = branch_results["local"]
+    if "global" in branch_results:
+        global_relations, global_entities = branch_results["global"]
+    if "vector" in branch_results:
+        vector_chunks = branch_results["vector"]
+        # Track vector chunks with source metadata
+        for i, chunk in enumerate(vector_chunks):
+            chunk_id = chunk.get("chunk_id") or chunk.get("id")
+            if chunk_id:
+                chunk_tracking[chunk_id] = {
+                    "source": "C",
+                    "frequency": 1,  # Vector chunks always have frequency 1
+                    "order": i + 1,  # 1-based order in vector search results
+                }
+            else:
+                logger.warning(f"Vector chunk missing chunk_id: {chunk}")
 
     # Round-robin merge entities
     final_entities = []
@@ -3593,9 +4452,24 @@ async def _perform_kg_search(
         "vector_chunks": vector_chunks,
         "chunk_tracking": chunk_tracking,
         "query_embedding": query_embedding,
+        "timed_out_branches": timed_out_branches,
     }
 
 
+def _context_token_count(
+    item: dict[str, Any], description_tokens: int | None, tokenizer: Tokenizer
+) -> int | None:
+    """Token count of a context entry from the stored count of its description
+
+    Only the entry without its description is tokenized, which approximates the
+    count of the whole JSON entry closely enough for truncation.
+    """
+    if description_tokens is None:
+        return None
+    skeleton = json.dumps({**item, "description": ""}, ensure_ascii=False)
+    return description_tokens + count_tokens(skeleton, tokenizer)
+
+
 async def _apply_token_truncation(
     search_result: dict[str, Any],
     query_param: QueryParam,
@@ -3687,6 +4561,16 @@ async def _apply_token_truncation(
         f"Before truncation: {len(entities_context)} entities, {len(relations_context)} relations"
     )
 
+    # Description token counts stored at write time spare tokenizing descriptions
+    entity_description_tokens = {
+        entity["entity_name"]: stored_description_tokens(entity)
+        for entity in final_entities
+    }
+    relation_description_tokens = {
+        pair: stored_description_tokens(relation)
+        for pair, relation in relation_id_to_original.items()
+    }
+
     # Apply token-based truncation
     if entities_context:
         # Remove file_path and created_at for token calculation
@@ -3704,6 +4588,9 @@ async def _apply_token_truncation(
             ),
             max_token_size=max_entity_tokens,
             tokenizer=tokenizer,
+            token_count=lambda x: _context_token_count(
+                x, entity_description_tokens.get(x["entity"]), tokenizer
+            ),
         )
 
     if relations_context:
@@ -3722,6 +4609,11 @@ async def _apply_token_truncation(
             ),
             max_token_size=max_relation_tokens,
             tokenizer=tokenizer,
+            token_count=lambda x: _context_token_count(
+                x,
+                relation_description_tokens.get((x["entity1"], x["entity2"])),
+                tokenizer,
+            ),
         )
 
     logger.info(
@@ -3778,9 +4670,13 @@ async def _merge_all_chunks(
     chunks_vdb: BaseVectorStorage = None,
     chunk_tracking: dict = None,
     query_embedding: list[float] = None,
+    fetch_content: bool = True,
 ) -> list[dict]:
     """
     Merge chunks from different sources: vector_chunks + entity_chunks + relation_chunks.
+
+    With fetch_content=False, entity and relation chunks are merged by id only and
+    their content is left as None for process_chunks_unified to fetch in ranked order.
     """
     if chunk_tracking is None:
         chunk_tracking = {}
@@ -3797,6 +4693,7 @@ async def _merge_all_chunks(
             chunks_vdb,
             chunk_tracking=chunk_tracking,
             query_embedding=query_embedding,
+            fetch_content=fetch_content,
         )
 
     # Get chunks from relations
@@ -3811,6 +4708,7 @@ async def _merge_all_chunks(
             chunks_vdb,
             chunk_tracking=chunk_tracking,
             query_embedding=query_embedding,
+            fetch_content=fetch_content,
         )
 
     # Round-robin merge chunks from different sources with deduplication
@@ -3879,10 +4777,13 @@ async def _build_context_str(
     chunk_tracking: dict = None,
     entity_id_to_original: dict = None,
     relation_id_to_original: dict = None,
+    text_chunks_db: BaseKVStorage = None,
 ) -> tuple[str, dict[str, Any]]:
     """
     Build the final LLM context string with token processing.
     This includes dynamic token calculation and final chunk truncation.
+    Chunks merged without content are fetched from text_chunks_db only as far as
+    the chunk token budget reaches.
     """
     tokenizer = global_config.get("tokenizer")
     if not tokenizer:
@@ -3962,6 +4863,7 @@ async def _build_context_str(
         global_config=global_config,
         source_type=query_param.mode,
         chunk_token_limit=available_chunk_tokens,  # Pass dynamic limit
+        text_chunks_db=text_chunks_db,
     )
 
     # Generate reference list from truncated chunks using the new common function
@@ -4062,6 +4964,7 @@ async def _build_query_context(
     text_chunks_db: BaseKVStorage,
     query_param: QueryParam,
     chunks_vdb: BaseVectorStorage = None,
+    query_embedding: list[float] | None = None,
 ) -> QueryContextResult | None:
     """
     Main query context building function using the new 4-stage architecture:
@@ -4085,6 +4988,7 @@ async def _build_query_context(
         text_chunks_db,
         query_param,
         chunks_vdb,
+        query_embedding,
     )
 
     if not search_result["final_entities"] and not search_result["final_relations"]:
@@ -4113,6 +5017,8 @@ async def _build_query_context(
         chunks_vdb=chunks_vdb,
         chunk_tracking=search_result["chunk_tracking"],
         query_embedding=search_result["query_embedding"],
+        # Chunk content is fetched by _build_context_str within the token budget
+        fetch_content=False,
     )
 
     if (
@@ -4134,6 +5040,7 @@ async def _build_query_context(
         chunk_tracking=search_result["chunk_tracking"],
         entity_id_to_original=truncation_result["entity_id_to_original"],
         relation_id_to_original=truncation_result["relation_id_to_original"],
+        text_chunks_db=text_chunks_db,
     )
 
     # Convert keywords strings to lists and add complete metadata to raw_data
@@ -4160,6 +5067,7 @@ async def _build_query_context(
         ),
         "merged_chunks_count": len(merged_chunks),
         "final_chunks_count": len(raw_data.get("data", {}).get("chunks", [])),
+        "timed_out_branches": search_result["timed_out_branches"],
     }
 
     logger.debug(
@@ -4177,13 +5085,16 @@ async def _get_node_data(
     knowledge_graph_inst: BaseGraphStorage,
     entities_vdb: BaseVectorStorage,
     query_param: QueryParam,
+    query_embedding: list[float] | None = None,
 ):
     # get similar entities
     logger.info(
         f"Query nodes: {query} (top_k:{query_param.top_k}, cosine:{entities_vdb.cosine_better_than_threshold})"
     )
 
-    results = await entities_vdb.query(query, top_k=query_param.top_k)
+    results = await entities_vdb.query(
+        query, top_k=query_param.top_k, query_embedding=query_embedding
+    )
 
     if not len(results):
         return [], []
@@ -4295,6 +5206,7 @@ async def _find_related_text_unit_from_entities(
     chunks_vdb: BaseVectorStorage = None,
     chunk_tracking: dict = None,
     query_embedding=None,
+    fetch_content: bool = True,
 ):
     """
     Find text chunks related to entities using configurable chunk selection method.
@@ -4302,6 +5214,9 @@ async def _find_related_text_unit_from_entities(
     This function supports two chunk selection strategies:
     1. WEIGHT: Linear gradient weighted polling based on chunk occurrence count
     2. VECTOR: Vector similarity-based selection using embedding cosine similarity
+
+    With fetch_content=False the selected chunks are returned without content, to be
+    fetched later by process_chunks_unified within the context token budget.
     """
     logger.debug(f"Finding text chunks from {len(node_datas)} entities")
 
@@ -4423,7 +5338,10 @@ async def _find_related_text_unit_from_entities(
     unique_chunk_ids = list(
         dict.fromkeys(selected_chunk_ids)
     )  # Remove duplicates while preserving order
-    chunk_data_list = await text_chunks_db.get_by_ids(unique_chunk_ids)
+    if fetch_content:
+        chunk_data_list = await text_chunks_db.get_by_ids(unique_chunk_ids)
+    else:
+        chunk_data_list = [{"content": None} for _ in unique_chunk_ids]
 
     # Step 6: Build result chunks with valid data and update chunk tracking
     result_chunks = []
@@ -4450,12 +5368,15 @@ async def _get_edge_data(
     knowledge_graph_inst: BaseGraphStorage,
     relationships_vdb: BaseVectorStorage,
     query_param: QueryParam,
+    query_embedding: list[float] | None = None,
 ):
     logger.info(
         f"Query edges: {keywords} (top_k:{query_param.top_k}, cosine:{relationships_vdb.cosine_better_than_threshold})"
     )
 
-    results = await relationships_vdb.query(keywords, top_k=query_param.top_k)
+    results = await relationships_vdb.query(
+        keywords, top_k=query_param.top_k, query_embedding=query_embedding
+    )
 
     if not len(results):
         return [], []
@@ -4543,6 +5464,7 @@ async def _find_related_text_unit_from_relations(
     chunks_vdb: BaseVectorStorage = None,
     chunk_tracking: dict = None,
     query_embedding=None,
+    fetch_content: bool = True,
 ):
     """
     Find text chunks related to relationships using configurable chunk selection method.
@@ -4550,6 +5472,9 @@ async def _find_related_text_unit_from_relations(
     This function supports two chunk selection strategies:
     1. WEIGHT: Linear gradient weighted polling based on chunk occurrence count
     2. VECTOR: Vector similarity-based selection using embedding cosine similarity
+
+    With fetch_content=False the selected chunks are returned without content, to be
+    fetched later by process_chunks_unified within the context token budget.
     """
     logger.debug(f"Finding text chunks from {len(edge_datas)} relations")
 
@@ -4715,7 +5640,10 @@ async def _find_related_text_unit_from_relations(
     unique_chunk_ids = list(
         dict.fromkeys(selected_chunk_ids)
     )  # Remove duplicates while preserving order
-    chunk_data_list = await text_chunks_db.get_by_ids(unique_chunk_ids)
+    if fetch_content:
+        chunk_data_list = await text_chunks_db.get_by_ids(unique_chunk_ids)
+    else:
+        chunk_data_list = [{"content": None} for _ in unique_chunk_ids]
 
     # Step 6: Build result chunks with valid data and update chunk tracking
     result_chunks = []
@@ -4768,6 +5696,7 @@ async def naive_query(
     global_config: dict[str, str],
     hashing_kv: BaseKVStorage | None = None,
     system_prompt: str | None = None,
+    query_embedding: list[float] | None = None,
 ) -> QueryResult | None:
     """
     Execute naive query and return unified QueryResult object.
@@ -4779,6 +5708,7 @@ async def naive_query(
         global_config: Global configuration
         hashing_kv: Cache storage
         system_prompt: System prompt
+        query_embedding: Optional pre-computed embedding of the query
 
     Returns:
         QueryResult | None: Unified query result object containing:
@@ -4805,7 +5735,7 @@ async def naive_query(
         logger.error("Tokenizer not found in global configuration.")
         return QueryResult(content=PROMPTS["fail_response"])
 
-    chunks = await _get_vector_context(query, chunks_vdb, query_param, None)
+    chunks = await _get_vector_context(query, chunks_vdb, query_param, query_embedding)
 
     if chunks is None or len(chunks) == 0:
         logger.info(
@@ -14,7 +14,11 @@ PROMPTS: dict[str, Any] = {}
 # All delimiters must be formatted as "<|UPPER_CASE_STRING|>"
 PROMPTS["DEFAULT_TUPLE_DELIMITER"] = "<|#|>"
 PROMPTS["DEFAULT_COMPLETION_DELIMITER"] = "<|COMPLETE|>"
+# Marks each section of a packed extraction prompt, {index} starts at 1
+PROMPTS["DEFAULT_CHUNK_DELIMITER"] = "<|CHUNK_{index}|>"
 
+# System prompts hold only static instructions and examples, variable content goes
+# last, so provider-side prompt caching can reuse the prefix across calls
 PROMPTS["entity_extraction_system_prompt"] = """---Role---
 You are a Knowledge Graph Specialist responsible for extracting entities and relationships from the input text.
 
@@ -65,14 +69,6 @@ You are a Knowledge Graph Specialist responsible for extracting entities and rel
 
 ---Examples---
 {examples}
-
----Real Data to be Processed---
-<Input>
-Entity_types: [{entity_types}]
-Text:
-```
-{input_text}
-```
 """
 
 PROMPTS["entity_extraction_user_prompt"] = """---Task---
@@ -84,6 +80,14 @@ Extract entities and relationships from the input text to be processed.
 3.  **Completion Signal:** Output `{completion_delimiter}` as the final line after all relevant entities and relationships have been extracted and presented.
 4.  **Output Language:** Ensure the output language is {language}. Proper nouns (e.g., personal names, place names, organization names) must be kept in their original language and not translated.
 
+---Real Data to be Processed---
+<Input>
+Entity_types: [{entity_types}]
+Text:
+```
+{input_text}
+```
+
 <Output>
 """
 
@@ -105,6 +109,44 @@ Based on the last extraction task, identify and extract any **missed or incorrec
 <Output>
 """
 
+PROMPTS["entity_extraction_packed_user_prompt"] = """---Task---
+Extract entities and relationships from the input text to be processed. The input text consists of {chunk_count} independent sections, each starting with a marker line such as `{first_chunk_delimiter}`.
+
+---Instructions---
+1.  **Strict Adherence to Format:** Strictly adhere to all format requirements for entity and relationship lists, including output order, field delimiters, and proper noun handling, as specified in the system prompt.
+2.  **Process Sections Separately:** Process every section on its own. For each section, output its marker line exactly as given, followed by the entities and relationships extracted from that section only. If an entity appears in several sections, output it in each of them. Output the marker line even if nothing can be extracted from a section.
+3.  **Output Content Only:** Output *only* the marker lines and the extracted lists of entities and relationships. Do not include any introductory or concluding remarks, explanations, or additional text.
+4.  **Completion Signal:** Output `{completion_delimiter}` once, as the final line after the last section.
+5.  **Output Language:** Ensure the output language is {language}. Proper nouns (e.g., personal names, place names, organization names) must be kept in their original language and not translated.
+
+---Real Data to be Processed---
+<Input>
+Entity_types: [{entity_types}]
+Text:
+```
+{input_text}
+```
+
+<Output>
+"""
+
+PROMPTS["entity_continue_extraction_packed_user_prompt"] = """---Task---
+Based on the last extraction task, identify and extract any **missed or incorrectly formatted** entities and relationships from each section of the input text.
+
+---Instructions---
+1.  **Strict Adherence to System Format:** Strictly adhere to all format requirements for entity and relationship lists, including output order, field delimiters, and proper noun handling, as specified in the system instructions.
+2.  **Focus on Corrections/Additions:**
+    *   **Do NOT** re-output entities and relationships that were **correctly and fully** extracted in the last task.
+    *   If an entity or relationship was **missed** in the last task, extract and output it now according to the system format.
+    *   If an entity or relationship was **truncated, had missing fields, or was otherwise incorrectly formatted** in the last task, re-output the *corrected and complete* version in the specified format.
+3.  **Process Sections Separately:** For each section, output its marker line (such as `{first_chunk_delimiter}`) exactly as given, followed by the missed or corrected entities and relationships of that section only.
+4.  **Output Content Only:** Output *only* the marker lines and the extracted lists of entities and relationships. Do not include any introductory or concluding remarks, explanations, or additional text.
+5.  **Completion Signal:** Output `{completion_delimiter}` once, as the final line after the last section.
+6.  **Output Language:** Ensure the output language is {language}. Proper nouns (e.g., personal names, place names, organization names) must be kept in their original language and not translated.
+
+<Output>
+"""
+
 PROMPTS["entity_extraction_examples"] = [
     """<Input Text>
 ```
@@ -246,7 +288,7 @@ Consider the conversation history if provided to maintain conversational flow an
 3. Formatting & Language:
   - The response MUST be in the same language as the user query.
   - The response MUST utilize Markdown formatting for enhanced clarity and structure (e.g., headings, bold text, bullet points).
-  - The response should be presented in {response_type}.
+  - The response should be presented in the format given under **Response Settings**.
 
 4. References Section Format:
   - The References section should be under heading: `### References`
@@ -265,12 +307,17 @@ Consider the conversation history if provided to maintain conversational flow an
 - [3] Document Title Three
 ```
 
-6. Additional Instructions: {user_prompt}
+6. Additional Instructions: Follow the additional instructions given under **Response Settings**, if any.
 
 
 ---Context---
 
 {context_data}
+
+---Response Settings---
+
+- Response format: {response_type}
+- Additional instructions: {user_prompt}
 """
 
 PROMPTS["naive_rag_response"] = """---Role---
@@ -300,7 +347,7 @@ Consider the conversation history if provided to maintain conversational flow an
 3. Formatting & Language:
   - The response MUST be in the same language as the user query.
   - The response MUST utilize Markdown formatting for enhanced clarity and structure (e.g., headings, bold text, bullet points).
-  - The response should be presented in {response_type}.
+  - The response should be presented in the format given under **Response Settings**.
 
 4. References Section Format:
   - The References section should be under heading: `### References`
@@ -319,12 +366,17 @@ Consider the conversation history if provided to maintain conversational flow an
 - [3] Document Title Three
 ```
 
-6. Additional Instructions: {user_prompt}
+6. Additional Instructions: Follow the additional instructions given under **Response Settings**, if any.
 
 
 ---Context---
 
 {content_data}
+
+---Response Settings---
+
+- Response format: {response_type}
+- Additional instructions: {user_prompt}
 """
 
 PROMPTS["kg_query_context"] = """
@@ -5,8 +5,13 @@ AuroraAI Project.
 
 from __future__ import annotations
 
+import asyncio
 import os
+import threading
+from functools import lru_cache
+
 import aiohttp
+import numpy as np
 from typing import Any, List, Dict, Optional
 from tenacity import (
     retry,
@@ -14,7 +19,17 @@ from tenacity import (
     wait_exponential,
     retry_if_exception_type,
 )
-from .utils import logger
+from .constants import (
+    DEFAULT_RERANK_LOCAL_BACKEND,
+    DEFAULT_RERANK_LOCAL_BATCH_SIZE,
+    DEFAULT_RERANK_LOCAL_CACHE_SIZE,
+    DEFAULT_RERANK_LOCAL_CACHE_TTL,
+    DEFAULT_RERANK_LOCAL_DEVICE,
+    DEFAULT_RERANK_LOCAL_MAX_LENGTH,
+    DEFAULT_RERANK_LOCAL_MODEL,
+)
+from .llm.client_pool import get_aiohttp_session
+from .utils import LLMCacheFront, compute_mdhash_id, get_env_value, logger
 # pylint: disable  MC80OmFIVnBZMlhsa0xUb3Y2bzZhRU0yVmc9PTo2M2ZlOWI1Yg==
 
 from dotenv import load_dotenv
@@ -115,65 +130,65 @@ async def generic_rerank_api(
         f"Rerank request: {len(documents)} documents, model: {model}, format: {response_format}"
     )
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(base_url, headers=headers, json=payload) as response:
-            if response.status != 200:
-                error_text = await response.text()
-                content_type = response.headers.get("content-type", "").lower()
-                is_html_error = (
-                    error_text.strip().startswith("<!DOCTYPE html>")
-                    or "text/html" in content_type
-                )
-                if is_html_error:
-                    if response.status == 502:
-                        clean_error = "Bad Gateway (502) - Rerank service temporarily unavailable. Please try again in a few minutes."
-                    elif response.status == 503:
-                        clean_error = "Service Unavailable (503) - Rerank service is temporarily overloaded. Please try again later."
-                    elif response.status == 504:
-                        clean_error = "Gateway Timeout (504) - Rerank service request timed out. Please try again."
-                    else:
-                        clean_error = f"HTTP {response.status} - Rerank service error. Please try again later."
+    session = get_aiohttp_session("rerank")
+    async with session.post(base_url, headers=headers, json=payload) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            content_type = response.headers.get("content-type", "").lower()
+            is_html_error = (
+                error_text.strip().startswith("<!DOCTYPE html>")
+                or "text/html" in content_type
+            )
+            if is_html_error:
+                if response.status == 502:
+                    clean_error = "Bad Gateway (502) - Rerank service temporarily unavailable. Please try again in a few minutes."
+                elif response.status == 503:
+                    clean_error = "Service Unavailable (503) - Rerank service is temporarily overloaded. Please try again later."
+                elif response.status == 504:
+                    clean_error = "Gateway Timeout (504) - Rerank service request timed out. Please try again."
                 else:
-                    clean_error = error_text
-                logger.error(f"Rerank API error {response.status}: {clean_error}")
-                raise aiohttp.ClientResponseError(
-                    request_info=response.request_info,
-                    history=response.history,
-                    status=response.status,
-                    message=f"Rerank API error: {clean_error}",
-                )
+                    clean_error = f"HTTP {response.status} - Rerank service error. Please try again later."
+            else:
+                clean_error = error_text
+            logger.error(f"Rerank API error {response.status}: {clean_error}")
+            raise aiohttp.ClientResponseError(
+                request_info=response.request_info,
+                history=response.history,
+                status=response.status,
+                message=f"Rerank API error: {clean_error}",
+            )
 # fmt: off  MS80OmFIVnBZMlhsa0xUb3Y2bzZhRU0yVmc9PTo2M2ZlOWI1Yg==
 
-            response_json = await response.json()
+        response_json = await response.json()
 
-            if response_format == "aliyun":
-                # Aliyun format: {"output": {"results": [...]}}
-                results = response_json.get("output", {}).get("results", [])
-                if not isinstance(results, list):
-                    logger.warning(
-                        f"Expected 'output.results' to be list, got {type(results)}: {results}"
-                    )
-                    results = []
-
-            elif response_format == "standard":
-                # Standard format: {"results": [...]}
-                results = response_json.get("results", [])
-                if not isinstance(results, list):
-                    logger.warning(
-                        f"Expected 'results' to be list, got {type(results)}: {results}"
-                    )
-                    results = []
-            else:
-                raise ValueError(f"Unsupported response format: {response_format}")
-            if not results:
-                logger.warning("Rerank API returned empty results")
-                return []
-
-            # Standardize return format
-            return [
-                {"index": result["index"], "relevance_score": result["relevance_score"]}
-                for result in results
-            ]
+        if response_format == "aliyun":
+            # Aliyun format: {"output": {"results": [...]}}
+            results = response_json.get("output", {}).get("results", [])
+            if not isinstance(results, list):
+                logger.warning(
+                    f"Expected 'output.results' to be list, got {type(results)}: {results}"
+                )
+                results = []
+
+        elif response_format == "standard":
+            # Standard format: {"results": [...]}
+            results = response_json.get("results", [])
+            if not isinstance(results, list):
+                logger.warning(
+                    f"Expected 'results' to be list, got {type(results)}: {results}"
+                )
+                results = []
+        else:
+            raise ValueError(f"Unsupported response format: {response_format}")
+        if not results:
+            logger.warning("Rerank API returned empty results")
+            return []
+
+        # Standardize return format
+        return [
+            {"index": result["index"], "relevance_score": result["relevance_score"]}
+            for result in results
+        ]
 
 # pylint: disable  Mi80OmFIVnBZMlhsa0xUb3Y2bzZhRU0yVmc9PTo2M2ZlOWI1Yg==
 
@@ -298,6 +313,167 @@ async def ali_rerank(
     )
 
 
+@lru_cache(maxsize=4)
+def _load_cross_encoder(model: str, backend: str, device: str, max_length: int):
+    """Load (once per configuration) a sentence-transformers CrossEncoder"""
+    import pipmaster as pm
+
+    if not pm.is_installed("sentence-transformers"):
+        pm.install("sentence-transformers")
+    if backend == "onnx":
+        if not pm.is_installed("onnxruntime"):
+            pm.install("onnxruntime")
+        if not pm.is_installed("optimum"):
+            pm.install("optimum")
+
+    from sentence_transformers import CrossEncoder
+
+    logger.info(f"Loading local rerank model {model} ({backend} on {device})")
+    return CrossEncoder(model, device=device, max_length=max_length, backend=backend)
+
+
+class LocalCrossEncoderReranker:
+    """
+    Rerank documents with a cross-encoder running in-process, without any external service.
+
+    The model is loaded lazily through sentence-transformers (ONNX on CPU by default)
+    and scores (query, document) pairs in batches in a worker thread, so the event
+    loop is not blocked. Scores are cached per (query, document id); chunks that come
+    back for a repeated query are not scored again.
+    """
+
+    def __init__(
+        self,
+        model: str | None = None,
+        backend: str | None = None,
+        device: str | None = None,
+        batch_size: int | None = None,
+        max_length: int | None = None,
+        cache_size: int | None = None,
+        cache_ttl: float | None = None,
+    ):
+        self.model = model or DEFAULT_RERANK_LOCAL_MODEL
+        self.backend = backend or get_env_value(
+            "RERANK_LOCAL_BACKEND", DEFAULT_RERANK_LOCAL_BACKEND
+        )
+        self.device = device or get_env_value(
+            "RERANK_LOCAL_DEVICE", DEFAULT_RERANK_LOCAL_DEVICE
+        )
+        self.batch_size = batch_size or get_env_value(
+            "RERANK_LOCAL_BATCH_SIZE", DEFAULT_RERANK_LOCAL_BATCH_SIZE, int
+        )
+        self.max_length = max_length or get_env_value(
+            "RERANK_LOCAL_MAX_LENGTH", DEFAULT_RERANK_LOCAL_MAX_LENGTH, int
+        )
+        if cache_size is None:
+            cache_size = get_env_value(
+                "RERANK_LOCAL_CACHE_SIZE", DEFAULT_RERANK_LOCAL_CACHE_SIZE, int
+            )
+        if cache_ttl is None:
+            cache_ttl = get_env_value(
+                "RERANK_LOCAL_CACHE_TTL", DEFAULT_RERANK_LOCAL_CACHE_TTL, float
+            )
+        self.score_cache = (
+            LLMCacheFront(cache_size, cache_ttl) if cache_size > 0 else None
+        )
+        # One model instance is shared by all callers, score one batch at a time
+        self._predict_lock = threading.Lock()
+
+    def predict(self, pairs: list[tuple[str, str]]) -> list[float]:
+        """Score (query, document) pairs synchronously"""
+        encoder = _load_cross_encoder(
+            self.model, self.backend, self.device, self.max_length
+        )
+        with self._predict_lock:
+            scores = encoder.predict(
+                pairs, batch_size=self.batch_size, show_progress_bar=False
+            )
+        return np.asarray(scores, dtype=np.float32).reshape(-1).tolist()
+
+    async def __call__(
+        self,
+        query: str,
+        documents: list[str],
+        top_n: int | None = None,
+        document_ids: list[str] | None = None,
+        **kwargs: Any,
+    ) -> list[dict[str, Any]]:
+        if not documents:
+            return []
+        if not document_ids or len(document_ids) != len(documents):
+            document_ids = [
+                compute_mdhash_id(doc, prefix="chunk-") for doc in documents
+            ]
+
+        query_key = compute_mdhash_id(query)
+        scores: list[float | None] = [None] * len(documents)
+        to_score = []
+        for i, doc_id in enumerate(document_ids):
+            if self.score_cache is not None:
+                known, entry = self.score_cache.lookup(f"{query_key}:{doc_id}")
+                if known and entry is not None:
+                    self.score_cache.hits += 1
+                    scores[i] = entry["relevance_score"]
+                    continue
+                self.score_cache.misses += 1
+            to_score.append(i)
+
+        if to_score:
+            new_scores = await asyncio.to_thread(
+                self.predict, [(query, documents[i]) for i in to_score]
+            )
+            for i, score in zip(to_score, new_scores):
+                scores[i] = score
+                if self.score_cache is not None:
+                    self.score_cache.put(
+                        f"{query_key}:{document_ids[i]}", {"relevance_score": score}
+                    )
+
+        logger.debug(
+            f"Local rerank: {len(documents)} documents, {len(to_score)} scored by the model"
+        )
+        ranked = sorted(range(len(documents)), key=lambda i: scores[i], reverse=True)
+        if top_n is not None:
+            ranked = ranked[:top_n]
+        return [{"index": i, "relevance_score": scores[i]} for i in ranked]
+
+
+@lru_cache(maxsize=4)
+def get_local_reranker(
+    model: str = DEFAULT_RERANK_LOCAL_MODEL,
+) -> LocalCrossEncoderReranker:
+    """Return the shared local reranker of a model, keeping its score cache warm"""
+    return LocalCrossEncoderReranker(model=model)
+
+
+async def local_rerank(
+    query: str,
+    documents: list[str],
+    top_n: int | None = None,
+    model: str = DEFAULT_RERANK_LOCAL_MODEL,
+    document_ids: list[str] | None = None,
+    **kwargs: Any,
+) -> list[dict[str, Any]]:
+    """
+    Rerank documents with a local cross-encoder model.
+
+    Args:
+        query: The search query
+        documents: List of strings to rerank
+        top_n: Number of top results to return
+        model: Cross-encoder model name or path
+        document_ids: Optional ids (e.g. chunk ids) used as score cache keys,
+            the document content hash is used when omitted
+        **kwargs: Remote-only options (api_key, base_url, extra_body) are ignored
+
+    Returns:
+        List of dictionary of ["index": int, "relevance_score": float]
+    """
+    return await get_local_reranker(model or DEFAULT_RERANK_LOCAL_MODEL)(
+        query=query, documents=documents, top_n=top_n, document_ids=document_ids
+    )
+
+
 """Please run this test as a module:
 python -m lightrag.rerank
 """
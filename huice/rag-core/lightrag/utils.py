@@ -11,6 +11,8 @@ import sys
 
 import asyncio
 import html
+import inspect
+import pickle
 import csv
 import json
 import logging
@@ -19,9 +21,11 @@ import os
 import re
 import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
-from functools import wraps
+from functools import lru_cache, wraps
 from hashlib import md5
 from typing import (
     Any,
@@ -41,8 +45,12 @@ from lightrag.constants import (
     DEFAULT_LOG_MAX_BYTES,
     DEFAULT_LOG_BACKUP_COUNT,
     DEFAULT_LOG_FILENAME,
+    DEFAULT_LLM_CACHE_FRONT_MAX_ENTRIES,
+    DEFAULT_LLM_CACHE_FRONT_TTL,
+    DEFAULT_LLM_RATE_LIMIT_COOLDOWN,
     GRAPH_FIELD_SEP,
     DEFAULT_MAX_TOTAL_TOKENS,
+    DEFAULT_TOKEN_COUNT_CACHE_SIZE,
     DEFAULT_SOURCE_IDS_LIMIT_METHOD,
     VALID_SOURCE_IDS_LIMIT_METHODS,
     SOURCE_IDS_LIMIT_METHOD_FIFO,
@@ -568,6 +576,168 @@ class HealthCheckTimeoutError(Exception):
         )
 
 
+class TokenBucket:
+    """Token bucket holding up to `capacity` units, refilled evenly over `period` seconds"""
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` from the bucket and return the seconds until it is covered
+
+        The level may go negative, so concurrent callers are served in the order
+        they reserved instead of racing for the next refill.
+        """
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        self.level -= min(float(amount), self.capacity)
+        return 0.0 if self.level >= 0 else -self.level / self.rate
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an exception (or the last tenacity attempt it wraps) is an HTTP 429"""
+    last_attempt = getattr(error, "last_attempt", None)
+    if last_attempt is not None and last_attempt.failed:
+        error = last_attempt.exception()
+    if (
+        getattr(error, "status_code", None) == 429
+        or getattr(error, "status", None) == 429
+    ):
+        return True
+    return "ratelimit" in type(error).__name__.lower()
+
+
+class AdaptiveRateLimiter:
+    """
+    Per-provider request scheduler for priority_limit_async_func_call.
+
+    Enforces requests-per-minute and tokens-per-minute budgets with token buckets,
+    charging each call the prompt tokens estimated with the Tokenizer. Concurrency
+    adapts between 1 and max_concurrency (AIMD): it is halved and new calls pause
+    for `cooldown` seconds when the provider answers 429, shrinks while the average
+    latency exceeds `latency_target`, and grows back by one slot per window of
+    successful calls.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_rpm: int = 0,
+        max_tpm: int = 0,
+        tokenizer: "Tokenizer | None" = None,
+        adaptive: bool = True,
+        latency_target: float | None = None,
+        cooldown: float = DEFAULT_LLM_RATE_LIMIT_COOLDOWN,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.rpm_bucket = TokenBucket(max_rpm) if max_rpm and max_rpm > 0 else None
+        self.tpm_bucket = TokenBucket(max_tpm) if max_tpm and max_tpm > 0 else None
+        self.tokenizer = tokenizer
+        self.adaptive = adaptive
+        self.latency_target = latency_target or None
+        self.cooldown = cooldown
+
+        self._limit = float(self.max_concurrency)
+        self._blocked_until = 0.0
+        self._condition = asyncio.Condition()
+        self.in_flight = 0
+        self.avg_latency: float | None = None
+        self.rate_limited = 0
+        self.tokens_reserved = 0
+
+    @property
+    def concurrency_limit(self) -> int:
+        return max(1, int(self._limit))
+
+    def estimate_tokens(self, args: tuple, kwargs: dict) -> int:
+        """Prompt tokens of an LLM call (prompt, system prompt, history) or embedding call (texts)"""
+        texts = []
+        prompt = kwargs.get("prompt", args[0] if args else None)
+        if isinstance(prompt, str):
+            texts.append(prompt)
+        elif isinstance(prompt, (list, tuple)):
+            texts.extend(t for t in prompt if isinstance(t, str))
+        if isinstance(kwargs.get("system_prompt"), str):
+            texts.append(kwargs["system_prompt"])
+        for message in kwargs.get("history_messages") or []:
+            if isinstance(message, dict) and isinstance(message.get("content"), str):
+                texts.append(message["content"])
+
+        if self.tokenizer is None:
+            # Rough estimate of ~4 characters per token
+            return sum(len(text) for text in texts) // 4 + 1
+        return sum(len(self.tokenizer.encode(text)) for text in texts)
+
+    async def acquire(self, args: tuple, kwargs: dict) -> None:
+        """Wait for a concurrency slot and for the RPM/TPM budgets of one call"""
+        tokens = 0
+        if self.tpm_bucket is not None:
+            if self.tokenizer is None:
+                tokens = self.estimate_tokens(args, kwargs)
+            else:
+                # Encoding long prompts would block the event loop
+                tokens = await asyncio.to_thread(self.estimate_tokens, args, kwargs)
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self.in_flight < self.concurrency_limit
+            )
+            self.in_flight += 1
+
+        delay = max(0.0, self._blocked_until - time.monotonic())
+        if self.rpm_bucket is not None:
+            delay = max(delay, self.rpm_bucket.reserve(1))
+        if self.tpm_bucket is not None:
+            self.tokens_reserved += tokens
+            delay = max(delay, self.tpm_bucket.reserve(tokens))
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except BaseException:
+                await self.release(None)
+                raise
+
+    async def release(
+        self, latency: float | None, error: BaseException | None = None
+    ) -> None:
+        """Free the slot of a finished call and adapt concurrency to its outcome"""
+        async with self._condition:
+            self.in_flight -= 1
+            if error is not None and is_rate_limit_error(error):
+                self.rate_limited += 1
+                self._blocked_until = time.monotonic() + self.cooldown
+                if self.adaptive:
+                    self._limit = max(1.0, self._limit / 2)
+            elif error is None and latency is not None:
+                self.avg_latency = (
+                    latency
+                    if self.avg_latency is None
+                    else 0.8 * self.avg_latency + 0.2 * latency
+                )
+                if self.adaptive:
+                    if self.latency_target and self.avg_latency > self.latency_target:
+                        self._limit = max(1.0, self._limit * 0.9)
+                    else:
+                        self._limit = min(
+                            float(self.max_concurrency), self._limit + 1 / self._limit
+                        )
+            self._condition.notify_all()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "concurrency_limit": self.concurrency_limit,
+            "limiter_in_flight": self.in_flight,
+            "avg_latency": self.avg_latency,
+            "rate_limited": self.rate_limited,
+            "tokens_reserved": self.tokens_reserved,
+            "rpm_available": self.rpm_bucket.level if self.rpm_bucket else None,
+            "tpm_available": self.tpm_bucket.level if self.tpm_bucket else None,
+        }
+
+
 def priority_limit_async_func_call(
     max_size: int,
     llm_timeout: float = None,
@@ -576,6 +746,11 @@ def priority_limit_async_func_call(
     max_queue_size: int = 1000,
     cleanup_timeout: float = 2.0,
     queue_name: str = "limit_async",
+    max_rpm: int = 0,
+    max_tpm: int = 0,
+    tokenizer: "Tokenizer | None" = None,
+    adaptive_concurrency: bool = False,
+    latency_target: float | None = None,
 ):
     """
     Enhanced priority-limited asynchronous function call decorator with robust timeout handling
@@ -585,6 +760,8 @@ def priority_limit_async_func_call(
     - Task state tracking to prevent race conditions
     - Enhanced health check system with stuck task detection
     - Proper resource cleanup and error recovery
+    - Optional RPM/TPM token budgets and adaptive concurrency (see AdaptiveRateLimiter)
+    - Queue depth, wait time and in-flight metrics via the `metrics()` attribute
 
     Args:
         max_size: Maximum number of concurrent calls
@@ -594,6 +771,12 @@ def priority_limit_async_func_call(
         max_task_duration: Maximum time before health check intervenes (defaults to llm_timeout + 60s)
         cleanup_timeout: Maximum time to wait for cleanup operations (defaults to 2.0s)
         queue_name: Optional queue name for logging identification (defaults to "limit_async")
+        max_rpm: Requests per minute allowed by the provider (0 means unlimited)
+        max_tpm: Prompt tokens per minute allowed by the provider (0 means unlimited)
+        tokenizer: Tokenizer used to estimate prompt tokens for max_tpm
+        adaptive_concurrency: Shrink concurrency on 429 responses or high latency and
+            grow it back up to max_size while calls succeed
+        latency_target: Average call latency (seconds) above which concurrency shrinks
 
     Returns:
         Decorator function
@@ -630,6 +813,25 @@ def priority_limit_async_func_call(
         active_futures = weakref.WeakSet()
         reinit_count = 0
 
+        rate_limiter = None
+        if max_rpm or max_tpm or adaptive_concurrency:
+            rate_limiter = AdaptiveRateLimiter(
+                max_size,
+                max_rpm=max_rpm,
+                max_tpm=max_tpm,
+                tokenizer=tokenizer,
+                adaptive=adaptive_concurrency,
+                latency_target=latency_target,
+            )
+        call_stats = {
+            "in_flight": 0,
+            "started": 0,
+            "completed": 0,
+            "failed": 0,
+            "total_wait_time": 0.0,
+            "max_wait_time": 0.0,
+        }
+
         async def worker():
             """Enhanced worker that processes tasks with proper timeout and state management"""
             try:
@@ -654,9 +856,12 @@ def priority_limit_async_func_call(
                                 continue
                             task_state = task_states[task_id]
                             task_state.worker_started = True
-                            # Record execution start time when worker actually begins processing
+                            # Record execution start time when worker actually begins processing,
+                            # calls waiting for rate limiter budgets get it once they start
                             task_state.execution_start_time = (
                                 asyncio.get_event_loop().time()
+                                if rate_limiter is None
+                                else None
                             )
 
                         # Check if task was cancelled before worker started
@@ -669,7 +874,21 @@ def priority_limit_async_func_call(
                             queue.task_done()
                             continue
 
+                        call_start = None
+                        call_error = None
                         try:
+                            if rate_limiter is not None:
+                                await rate_limiter.acquire(args, kwargs)
+                            call_start = asyncio.get_event_loop().time()
+                            task_state.execution_start_time = call_start
+                            wait_time = call_start - task_state.start_time
+                            call_stats["started"] += 1
+                            call_stats["in_flight"] += 1
+                            call_stats["total_wait_time"] += wait_time
+                            call_stats["max_wait_time"] = max(
+                                call_stats["max_wait_time"], wait_time
+                            )
+
                             # Execute function with timeout protection
                             if max_execution_timeout is not None:
                                 result = await asyncio.wait_for(
@@ -682,7 +901,8 @@ def priority_limit_async_func_call(
                             if not task_state.future.done():
                                 task_state.future.set_result(result)
 
-                        except asyncio.TimeoutError:
+                        except asyncio.TimeoutError as e:
+                            call_error = e
                             # Worker-level timeout (max_execution_timeout exceeded)
                             logger.warning(
                                 f"{queue_name}: Worker timeout for task {task_id} after {max_execution_timeout}s"
@@ -701,6 +921,7 @@ def priority_limit_async_func_call(
                                 f"{queue_name}: Task {task_id} cancelled during execution"
                             )
                         except Exception as e:
+                            call_error = e
                             # Function execution error
                             logger.error(
                                 f"{queue_name}: Error in decorated function for task {task_id}: {str(e)}"
@@ -708,6 +929,14 @@ def priority_limit_async_func_call(
                             if not task_state.future.done():
                                 task_state.future.set_exception(e)
                         finally:
+                            if call_start is not None:
+                                call_stats["in_flight"] -= 1
+                                call_stats["failed" if call_error else "completed"] += 1
+                                if rate_limiter is not None:
+                                    await rate_limiter.release(
+                                        asyncio.get_event_loop().time() - call_start,
+                                        call_error,
+                                    )
                             # Clean up task state
                             async with task_states_lock:
                                 task_states.pop(task_id, None)
@@ -1005,8 +1234,29 @@ def priority_limit_async_func_call(
                 async with task_states_lock:
                     task_states.pop(task_id, None)
 
+        def metrics() -> dict[str, Any]:
+            """Queue depth, queue wait times, in-flight calls and rate limiter state"""
+            started = call_stats["started"]
+            data = {
+                "queue_depth": queue.qsize(),
+                "pending": len(task_states),
+                "workers": len(tasks),
+                "in_flight": call_stats["in_flight"],
+                "started": started,
+                "completed": call_stats["completed"],
+                "failed": call_stats["failed"],
+                "avg_wait_time": call_stats["total_wait_time"] / started
+                if started
+                else 0.0,
+                "max_wait_time": call_stats["max_wait_time"],
+            }
+            if rate_limiter is not None:
+                data.update(rate_limiter.stats())
+            return data
+
         # Add shutdown method to decorated function
         wait_func.shutdown = shutdown
+        wait_func.metrics = metrics
 
         return wait_func
 
@@ -1272,6 +1522,21 @@ class Tokenizer:
         """
         return self.tokenizer.decode(tokens)
 
+    def decode_bytes(self, tokens: List[int]) -> bytes | None:
+        """
+        Decodes a list of tokens into UTF-8 bytes, if the underlying tokenizer supports it.
+
+        Args:
+            tokens: A list of integer tokens to decode.
+
+        Returns:
+            The decoded bytes, or None if the underlying tokenizer has no byte-level decoding.
+        """
+        decode_bytes = getattr(self.tokenizer, "decode_bytes", None)
+        if decode_bytes is None:
+            return None
+        return decode_bytes(tokens)
+
 
 class TiktokenTokenizer(Tokenizer):
     """
@@ -1303,6 +1568,155 @@ class TiktokenTokenizer(Tokenizer):
             raise ValueError(f"Invalid model_name: {model_name}.")
 
 
+# Tokenizer and chunking function of a chunking worker process
+_chunking_worker_state: dict[str, Any] = {}
+
+
+def _init_chunking_worker(tokenizer: Tokenizer, chunking_func: Callable) -> None:
+    _chunking_worker_state["tokenizer"] = tokenizer
+    _chunking_worker_state["chunking_func"] = chunking_func
+
+
+def _chunk_and_hash(
+    tokenizer: Tokenizer | None,
+    chunking_func: Callable | None,
+    *chunking_args: Any,
+) -> list[tuple[str, dict[str, Any]]] | None:
+    """Run a chunking function and compute the chunk ID of every chunk
+
+    Returns None if the function returned an awaitable, which has to run in the event loop.
+    """
+    if tokenizer is None:
+        tokenizer = _chunking_worker_state["tokenizer"]
+        chunking_func = _chunking_worker_state["chunking_func"]
+    chunks = chunking_func(tokenizer, *chunking_args)
+    if inspect.isawaitable(chunks):
+        if inspect.iscoroutine(chunks):
+            chunks.close()  # Never started, the caller reruns it inline
+        return None
+    return _hash_chunks(chunks)
+
+
+def _hash_chunks(chunks: Any) -> list[tuple[str, dict[str, Any]]]:
+    """Validate a chunking result and pair every chunk with its chunk ID"""
+    if not isinstance(chunks, (list, tuple)):
+        raise TypeError(
+            f"chunking_func must return a list or tuple of dicts, got {type(chunks)}"
+        )
+    return [(compute_mdhash_id(dp["content"], prefix="chunk-"), dp) for dp in chunks]
+
+
+class ChunkingExecutor:
+    """
+    Runs document chunking and chunk ID hashing off the event loop.
+
+    Modes:
+        - "thread": a thread pool of max_workers threads
+        - "process": a process pool of max_workers processes, which receive the
+          tokenizer and chunking function once at start-up
+        - "inline": in the event loop, as before
+
+    At most max_pending documents are handed to the pool at a time, the rest
+    wait in the event loop. Asynchronous chunking functions, including callables
+    found to return an awaitable on their first call, run inline; in process
+    mode anything that cannot be pickled runs in threads instead.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Tokenizer,
+        chunking_func: Callable,
+        mode: str = "thread",
+        max_workers: int = 2,
+        max_pending: int = 8,
+    ):
+        self.tokenizer = tokenizer
+        self.chunking_func = chunking_func
+        self.mode = mode.lower()
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending)
+        if self.mode not in ("thread", "process", "inline"):
+            logger.warning(f"Unknown chunking executor '{mode}', using 'thread'")
+            self.mode = "thread"
+        if inspect.iscoroutinefunction(chunking_func):
+            self.mode = "inline"
+        if self.mode == "process":
+            try:
+                pickle.dumps((tokenizer, chunking_func))
+            except Exception as e:
+                logger.warning(
+                    f"Chunking falls back to threads, tokenizer or chunking_func cannot be sent to worker processes: {e}"
+                )
+                self.mode = "thread"
+        self._executor: Executor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                import multiprocessing
+
+                # spawn: forking a process with a running event loop is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_chunking_worker,
+                    initargs=(self.tokenizer, self.chunking_func),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="lightrag-chunking"
+                )
+        return self._executor
+
+    async def chunk(
+        self,
+        content: str,
+        split_by_character: str | None,
+        split_by_character_only: bool,
+        chunk_overlap_token_size: int,
+        chunk_token_size: int,
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """Chunk content and return (chunk_id, chunk) pairs in chunk order"""
+        chunking_args = (
+            content,
+            split_by_character,
+            split_by_character_only,
+            chunk_overlap_token_size,
+            chunk_token_size,
+        )
+        if self.mode == "inline":
+            chunks = self.chunking_func(self.tokenizer, *chunking_args)
+            if inspect.isawaitable(chunks):
+                chunks = await chunks
+            return _hash_chunks(chunks)
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+        if self.mode == "process":
+            # Worker processes already hold the tokenizer and chunking function
+            job_args = (None, None, *chunking_args)
+        else:
+            job_args = (self.tokenizer, self.chunking_func, *chunking_args)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            chunks = await loop.run_in_executor(
+                self._get_executor(), _chunk_and_hash, *job_args
+            )
+        if chunks is None:
+            # e.g. a partial of an async function, which is not a coroutine function
+            logger.info("Chunking runs inline, chunking_func returned an awaitable")
+            self.mode = "inline"
+            return await self.chunk(*chunking_args)
+        return chunks
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._semaphore = None
+
+
 def pack_user_ass_to_openai_messages(*args: str):
     roles = ["user", "assistant"]
     return [
@@ -1323,18 +1737,64 @@ def is_float_regex(value: str) -> bool:
     return bool(re.match(r"^[-+]?[0-9]*\.?[0-9]+$", value))
 
 
+@lru_cache(
+    maxsize=get_env_value("TOKEN_COUNT_CACHE_SIZE", DEFAULT_TOKEN_COUNT_CACHE_SIZE, int)
+)
+def _cached_token_count(tokenizer: Tokenizer, content: str) -> int:
+    return len(tokenizer.encode(content))
+
+
+def count_tokens(content: str, tokenizer: Tokenizer) -> int:
+    """Token count of content, memoized in a process-local LRU cache
+
+    Query-time truncation sees the same descriptions and chunk texts on every query,
+    so each distinct text is tokenized once per process.
+    """
+    return _cached_token_count(tokenizer, content)
+
+
+def description_token_count(
+    description: str | None, tokenizer: Tokenizer | None
+) -> int:
+    """Token count of a node or edge description, stored as description_tokens
+
+    Writers without a tokenizer store 0, which means unknown and replaces a stale
+    count, since graph storages merge node and edge properties on upsert.
+    """
+    if tokenizer is None or not description:
+        return 0
+    return len(tokenizer.encode(description))
+
+
+def stored_description_tokens(data: dict[str, Any]) -> int | None:
+    """Description token count stored with a node or edge, None if unknown"""
+    try:
+        count = int(data.get("description_tokens") or 0)
+    except (TypeError, ValueError):
+        return None
+    return count if count > 0 else None
+
+
 def truncate_list_by_token_size(
     list_data: list[Any],
     key: Callable[[Any], str],
     max_token_size: int,
     tokenizer: Tokenizer,
+    token_count: Callable[[Any], int | None] | None = None,
 ) -> list[int]:
-    """Truncate a list of data by token size"""
+    """Truncate a list of data by token size
+
+    token_count may return a precomputed token count for an item, e.g. one derived
+    from counts stored at write time. Other items are tokenized through count_tokens.
+    """
     if max_token_size <= 0:
         return []
     tokens = 0
     for i, data in enumerate(list_data):
-        tokens += len(tokenizer.encode(key(data)))
+        item_tokens = token_count(data) if token_count is not None else None
+        if item_tokens is None:
+            item_tokens = count_tokens(key(data), tokenizer)
+        tokens += item_tokens
         if tokens > max_token_size:
             return list_data[:i]
     return list_data
@@ -1348,6 +1808,93 @@ def cosine_similarity(v1, v2):
     return dot_product / (norm1 * norm2)
 
 
+class LLMCacheFront:
+    """
+    Bounded in-process LRU/TTL cache in front of an LLM response cache storage.
+
+    Holds the response and create_time of recently read or written cache keys,
+    and remembers keys known to be missing so save_to_cache can skip its
+    duplicate-check read. Entries expire after ttl seconds, so changes made by
+    other processes are picked up eventually.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (expires_at, entry), entry is None for keys known to be missing
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any] | None]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key: str) -> tuple[bool, dict[str, Any] | None]:
+        """Return (known, entry), entry is None for keys known to be missing"""
+        item = self._entries.get(key)
+        if item is None:
+            return False, None
+        if item[0] < time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, item[1]
+
+    def put(self, key: str, entry: dict[str, Any] | None) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, entry)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, keys: Iterable[str] | None = None) -> None:
+        """Drop the given keys, or every entry if keys is None"""
+        if keys is None:
+            self._entries.clear()
+            return
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def get_llm_cache_front(hashing_kv) -> LLMCacheFront | None:
+    """Return the in-process cache front of an LLM response cache storage
+
+    The front is created on first use and sized by LLM_CACHE_FRONT_MAX_ENTRIES
+    and LLM_CACHE_FRONT_TTL. Returns None when it is disabled.
+    """
+    if hashing_kv is None:
+        return None
+    front = getattr(hashing_kv, "_llm_cache_front", None)
+    if isinstance(front, LLMCacheFront):
+        return front
+    max_entries = get_env_value(
+        "LLM_CACHE_FRONT_MAX_ENTRIES", DEFAULT_LLM_CACHE_FRONT_MAX_ENTRIES, int
+    )
+    if max_entries <= 0:
+        return None
+    front = LLMCacheFront(
+        max_entries,
+        get_env_value("LLM_CACHE_FRONT_TTL", DEFAULT_LLM_CACHE_FRONT_TTL, float),
+    )
+    hashing_kv._llm_cache_front = front
+    return front
+
+
+def invalidate_llm_cache_front(hashing_kv, keys: Iterable[str] | None = None) -> None:
+    """Drop cache keys (or everything) from the cache front of hashing_kv"""
+    front = getattr(hashing_kv, "_llm_cache_front", None)
+    if isinstance(front, LLMCacheFront):
+        front.invalidate(keys)
+
+
 async def handle_cache(
     hashing_kv,
     args_hash,
@@ -1372,13 +1919,28 @@ async def handle_cache(
 
     # Use flattened cache key format: {mode}:{cache_type}:{hash}
     flattened_key = generate_cache_key(mode, cache_type, args_hash)
+
+    front = get_llm_cache_front(hashing_kv)
+    if front is not None:
+        _, cache_entry = front.lookup(flattened_key)
+        # Keys known to be missing are read again, another process may have saved them
+        if cache_entry:
+            front.hits += 1
+            logger.debug(f"Flattened cache hit in memory(key:{flattened_key})")
+            return cache_entry["return"], cache_entry["create_time"]
+        front.misses += 1
+
     cache_entry = await hashing_kv.get_by_id(flattened_key)
     if cache_entry:
         logger.debug(f"Flattened cache hit(key:{flattened_key})")
         content = cache_entry["return"]
         timestamp = cache_entry.get("create_time", 0)
+        if front is not None:
+            front.put(flattened_key, {"return": content, "create_time": timestamp})
         return content, timestamp
 
+    if front is not None:
+        front.put(flattened_key, None)
     logger.debug(f"Cache missed(mode:{mode} type:{cache_type})")
     return None
 
@@ -1415,8 +1977,14 @@ async def save_to_cache(hashing_kv, cache_data: CacheData):
         cache_data.mode, cache_data.cache_type, cache_data.args_hash
     )
 
-    # Check if we already have identical content cached
-    existing_cache = await hashing_kv.get_by_id(flattened_key)
+    # Check if we already have identical content cached, reading the storage
+    # only when the key is not known locally
+    front = get_llm_cache_front(hashing_kv)
+    known, existing_cache = (
+        front.lookup(flattened_key) if front is not None else (False, None)
+    )
+    if not known:
+        existing_cache = await hashing_kv.get_by_id(flattened_key)
     if existing_cache:
         existing_content = existing_cache.get("return")
         if existing_content == cache_data.content:
@@ -1440,6 +2008,11 @@ async def save_to_cache(hashing_kv, cache_data: CacheData):
 
     # Save using flattened key
     await hashing_kv.upsert({flattened_key: cache_entry})
+    if front is not None:
+        front.put(
+            flattened_key,
+            {"return": cache_data.content, "create_time": int(time.time())},
+        )
 
 
 def safe_unicode_decode(content):
@@ -1909,6 +2482,109 @@ def remove_think_tags(text: str) -> str:
     ).strip()
 
 
+def _prepare_llm_call(
+    user_prompt: str,
+    system_prompt: str | None = None,
+    history_messages: list[dict[str, str]] | None = None,
+) -> tuple[str, str | None, list[dict[str, str]] | None, str]:
+    """Sanitize LLM call inputs and build the prompt text that keys the LLM cache
+
+    Returns:
+        tuple: (user_prompt, system_prompt, history_messages, cache_prompt)
+    """
+    # Sanitize input text to prevent UTF-8 encoding errors for all LLM providers
+    safe_user_prompt = sanitize_text_for_encoding(user_prompt)
+    safe_system_prompt = (
+        sanitize_text_for_encoding(system_prompt) if system_prompt else None
+    )
+
+    # Sanitize history messages if provided
+    safe_history_messages = None
+    if history_messages:
+        safe_history_messages = []
+        for i, msg in enumerate(history_messages):
+            safe_msg = msg.copy()
+            if "content" in safe_msg:
+                safe_msg["content"] = sanitize_text_for_encoding(safe_msg["content"])
+            safe_history_messages.append(safe_msg)
+        history = json.dumps(safe_history_messages, ensure_ascii=False)
+    else:
+        history = None
+
+    prompt_parts = []
+    if safe_user_prompt:
+        prompt_parts.append(safe_user_prompt)
+    if safe_system_prompt:
+        prompt_parts.append(safe_system_prompt)
+    if history:
+        prompt_parts.append(history)
+    return (
+        safe_user_prompt,
+        safe_system_prompt,
+        safe_history_messages,
+        "\n".join(prompt_parts),
+    )
+
+
+async def get_cached_llm_result(
+    user_prompt: str,
+    llm_response_cache: "BaseKVStorage | None",
+    system_prompt: str | None = None,
+    history_messages: list[dict[str, str]] | None = None,
+    cache_type: str = "extract",
+) -> tuple[str, int] | None:
+    """Look up the cached response use_llm_func_with_cache would return for a call
+
+    Returns:
+        tuple[str, int] | None: (content, create_time) if cached, None otherwise
+    """
+    if not llm_response_cache:
+        return None
+    _, _, _, _prompt = _prepare_llm_call(user_prompt, system_prompt, history_messages)
+    return await handle_cache(
+        llm_response_cache,
+        compute_args_hash(_prompt),
+        _prompt,
+        "default",
+        cache_type=cache_type,
+    )
+
+
+async def save_llm_result_to_cache(
+    content: str,
+    user_prompt: str,
+    llm_response_cache: "BaseKVStorage | None",
+    system_prompt: str | None = None,
+    history_messages: list[dict[str, str]] | None = None,
+    cache_type: str = "extract",
+    chunk_id: str | None = None,
+    cache_keys_collector: list = None,
+) -> None:
+    """Cache a response as if use_llm_func_with_cache had made the call itself
+
+    Used when one LLM call answers several cacheable calls (e.g. packed chunk
+    extraction), so each of them can later be served and rebuilt on its own.
+    """
+    if not llm_response_cache or not llm_response_cache.global_config.get(
+        "enable_llm_cache_for_entity_extract"
+    ):
+        return
+    _, _, _, _prompt = _prepare_llm_call(user_prompt, system_prompt, history_messages)
+    arg_hash = compute_args_hash(_prompt)
+    await save_to_cache(
+        llm_response_cache,
+        CacheData(
+            args_hash=arg_hash,
+            content=content,
+            prompt=_prompt,
+            cache_type=cache_type,
+            chunk_id=chunk_id,
+        ),
+    )
+    if cache_keys_collector is not None:
+        cache_keys_collector.append(generate_cache_key("default", cache_type, arg_hash))
+
+
 async def use_llm_func_with_cache(
     user_prompt: str,
     use_llm_func: callable,
@@ -1943,35 +2619,11 @@ async def use_llm_func_with_cache(
             - For cache hits: (content, cache_create_time)
             - For cache misses: (content, current_timestamp)
     """
-    # Sanitize input text to prevent UTF-8 encoding errors for all LLM providers
-    safe_user_prompt = sanitize_text_for_encoding(user_prompt)
-    safe_system_prompt = (
-        sanitize_text_for_encoding(system_prompt) if system_prompt else None
+    safe_user_prompt, safe_system_prompt, safe_history_messages, _prompt = (
+        _prepare_llm_call(user_prompt, system_prompt, history_messages)
     )
 
-    # Sanitize history messages if provided
-    safe_history_messages = None
-    if history_messages:
-        safe_history_messages = []
-        for i, msg in enumerate(history_messages):
-            safe_msg = msg.copy()
-            if "content" in safe_msg:
-                safe_msg["content"] = sanitize_text_for_encoding(safe_msg["content"])
-            safe_history_messages.append(safe_msg)
-        history = json.dumps(safe_history_messages, ensure_ascii=False)
-    else:
-        history = None
-
     if llm_response_cache:
-        prompt_parts = []
-        if safe_user_prompt:
-            prompt_parts.append(safe_user_prompt)
-        if safe_system_prompt:
-            prompt_parts.append(safe_system_prompt)
-        if history:
-            prompt_parts.append(history)
-        _prompt = "\n".join(prompt_parts)
-
         arg_hash = compute_args_hash(_prompt)
         # Generate cache key for this LLM call
         cache_key = generate_cache_key("default", cache_type, arg_hash)
@@ -2477,46 +3129,39 @@ async def pick_by_vector_similarity(
                 "Using pre-computed query embedding for vector similarity chunk selection"
             )
 
-        # Get chunk embeddings from vector database
-        chunk_vectors = await chunks_vdb.get_vectors_by_ids(all_chunk_ids)
+        # Get chunk embeddings from vector database as one (n, dim) matrix
+        found_ids, chunk_matrix = await chunks_vdb.get_vector_matrix_by_ids(
+            all_chunk_ids
+        )
         logger.debug(
-            f"Vector similarity chunk selection: {len(chunk_vectors)} chunk vectors Retrieved"
+            f"Vector similarity chunk selection: {len(found_ids)} chunk vectors Retrieved"
         )
 
-        if not chunk_vectors or len(chunk_vectors) != len(all_chunk_ids):
-            if not chunk_vectors:
+        if not found_ids or len(found_ids) != len(all_chunk_ids):
+            if not found_ids:
                 logger.warning(
                     "Vector similarity chunk selection: no vectors retrieved from chunks_vdb"
                 )
             else:
                 logger.warning(
-                    f"Vector similarity chunk selection: found {len(chunk_vectors)} but expecting {len(all_chunk_ids)}"
+                    f"Vector similarity chunk selection: found {len(found_ids)} but expecting {len(all_chunk_ids)}"
                 )
             return []
 
-        # Calculate cosine similarities
-        similarities = []
-        valid_vectors = 0
-        for chunk_id in all_chunk_ids:
-            if chunk_id in chunk_vectors:
-                chunk_embedding = chunk_vectors[chunk_id]
-                try:
-                    # Calculate cosine similarity
-                    similarity = cosine_similarity(query_embedding, chunk_embedding)
-                    similarities.append((chunk_id, similarity))
-                    valid_vectors += 1
-                except Exception as e:
-                    logger.warning(
-                        f"Vector similarity chunk selection: failed to calculate similarity for chunk {chunk_id}: {e}"
-                    )
-            else:
-                logger.warning(
-                    f"Vector similarity chunk selection:  no vector found for chunk {chunk_id}"
-                )
+        # Cosine similarity of every chunk in one matmul against the normalized query
+        query_vector = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        query_vector = query_vector / (np.linalg.norm(query_vector) or 1.0)
+        chunk_norms = np.linalg.norm(chunk_matrix, axis=1)
+        chunk_norms[chunk_norms == 0] = 1.0
+        similarities = (chunk_matrix @ query_vector) / chunk_norms
 
-        # Sort by similarity (highest first) and select top num_of_chunks
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        selected_chunks = [chunk_id for chunk_id, _ in similarities[:num_of_chunks]]
+        # Select the top num_of_chunks without sorting all candidates
+        if num_of_chunks < len(found_ids):
+            top = np.argpartition(-similarities, num_of_chunks - 1)[:num_of_chunks]
+        else:
+            top = np.arange(len(found_ids))
+        top = top[np.argsort(-similarities[top], kind="stable")]
+        selected_chunks = [found_ids[i] for i in top]
 
         logger.debug(
             f"Vector similarity chunk selection: {len(selected_chunks)} chunks from {len(all_chunk_ids)} candidates"
@@ -2551,6 +3196,8 @@ class TokenTracker:
         self.prompt_tokens = 0
         self.completion_tokens = 0
         self.total_tokens = 0
+        self.cached_tokens = 0
+        self.cache_creation_tokens = 0
         self.call_count = 0
 
     def add_usage(self, token_counts):
@@ -2558,9 +3205,13 @@ class TokenTracker:
 
         Args:
             token_counts: A dictionary containing prompt_tokens, completion_tokens, total_tokens
+                and optionally cached_tokens (prompt tokens served from the provider's
+                prompt cache) and cache_creation_tokens (prompt tokens written to it)
         """
         self.prompt_tokens += token_counts.get("prompt_tokens", 0)
         self.completion_tokens += token_counts.get("completion_tokens", 0)
+        self.cached_tokens += token_counts.get("cached_tokens", 0) or 0
+        self.cache_creation_tokens += token_counts.get("cache_creation_tokens", 0) or 0
 
         # If total_tokens is provided, use it directly; otherwise calculate the sum
         if "total_tokens" in token_counts:
@@ -2578,6 +3229,8 @@ class TokenTracker:
             "prompt_tokens": self.prompt_tokens,
             "completion_tokens": self.completion_tokens,
             "total_tokens": self.total_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cache_creation_tokens": self.cache_creation_tokens,
             "call_count": self.call_count,
         }
 
@@ -2585,12 +3238,20 @@ class TokenTracker:
         usage = self.get_usage()
         return (
             f"LLM call count: {usage['call_count']}, "
-            f"Prompt tokens: {usage['prompt_tokens']}, "
+            f"Prompt tokens: {usage['prompt_tokens']} "
+            f"(cached: {usage['cached_tokens']}), "
             f"Completion tokens: {usage['completion_tokens']}, "
             f"Total tokens: {usage['total_tokens']}"
         )
 
 
+def _accepts_document_ids(func: Callable) -> bool:
+    try:
+        return "document_ids" in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+
 async def apply_rerank_if_enabled(
     query: str,
     retrieved_docs: list[dict],
@@ -2635,11 +3296,22 @@ async def apply_rerank_if_enabled(
             )
             document_texts.append(content)
 
+        rerank_kwargs = {}
+        if _accepts_document_ids(rerank_func):
+            # Rerankers that cache scores (e.g. the local cross-encoder) key them by chunk id
+            rerank_kwargs["document_ids"] = [
+                doc.get("chunk_id")
+                or doc.get("id")
+                or compute_mdhash_id(text, prefix="chunk-")
+                for doc, text in zip(retrieved_docs, document_texts)
+            ]
+
         # Call the new rerank function that returns index-based results
         rerank_results = await rerank_func(
             query=query,
             documents=document_texts,
             top_n=top_n,
+            **rerank_kwargs,
         )
 
         # Process rerank results based on return format
@@ -2675,6 +3347,74 @@ async def apply_rerank_if_enabled(
         return retrieved_docs
 
 
+async def fetch_chunk_contents(
+    chunks: list[dict], text_chunks_db: "BaseKVStorage | None"
+) -> list[dict]:
+    """Fill in the content of chunks merged without content, keeping their order
+
+    Chunks that cannot be found in text_chunks_db are dropped.
+    """
+    missing_ids = [
+        chunk["chunk_id"] for chunk in chunks if chunk.get("content") is None
+    ]
+    if not missing_ids:
+        return chunks
+    chunk_data_list = (
+        await text_chunks_db.get_by_ids(missing_ids)
+        if text_chunks_db is not None
+        else []
+    )
+    chunk_data_by_id = dict(zip(missing_ids, chunk_data_list))
+
+    filled_chunks = []
+    for chunk in chunks:
+        if chunk.get("content") is None:
+            chunk_data = chunk_data_by_id.get(chunk["chunk_id"])
+            if chunk_data is None or chunk_data.get("content") is None:
+                continue
+            chunk = {
+                **chunk,
+                "content": chunk_data["content"],
+                "file_path": chunk_data.get("file_path", "unknown_source"),
+            }
+        filled_chunks.append(chunk)
+    return filled_chunks
+
+
+async def truncate_chunks_by_token_budget(
+    chunks: list[dict],
+    max_token_size: int,
+    tokenizer: Tokenizer,
+    text_chunks_db: "BaseKVStorage | None" = None,
+    estimated_chunk_tokens: int = 1200,
+) -> list[dict]:
+    """Keep the leading chunks whose JSON form fits into max_token_size
+
+    Gives the same result as truncate_list_by_token_size, but chunks without content
+    are fetched from text_chunks_db in ranked batches sized to the remaining budget
+    with a running token count, and no chunk after the budget is exhausted is fetched
+    or tokenized.
+    """
+    if max_token_size <= 0:
+        return []
+    kept_chunks = []
+    used_tokens = 0
+    position = 0
+    while position < len(chunks):
+        remaining_tokens = max_token_size - used_tokens
+        batch_size = remaining_tokens // max(estimated_chunk_tokens, 1) + 1
+        batch = chunks[position : position + batch_size]
+        position += len(batch)
+        for chunk in await fetch_chunk_contents(batch, text_chunks_db):
+            used_tokens += count_tokens(
+                json.dumps(chunk, ensure_ascii=False), tokenizer
+            )
+            if used_tokens > max_token_size:
+                return kept_chunks
+            kept_chunks.append(chunk)
+    return kept_chunks
+
+
 async def process_chunks_unified(
     query: str,
     unique_chunks: list[dict],
@@ -2682,10 +3422,15 @@ async def process_chunks_unified(
     global_config: dict,
     source_type: str = "mixed",
     chunk_token_limit: int = None,  # Add parameter for dynamic token limit
+    text_chunks_db: "BaseKVStorage | None" = None,
 ) -> list[dict]:
     """
     Unified processing for text chunks: deduplication, chunk_top_k limiting, reranking, and token truncation.
 
+    Chunks whose content is None are fetched from text_chunks_db. Without reranking
+    they are fetched in ranked batches during token truncation, so chunks beyond the
+    token budget are never read from storage.
+
     Args:
         query: Search query for reranking
         chunks: List of text chunks to process
@@ -2693,6 +3438,7 @@ async def process_chunks_unified(
         global_config: Global configuration dictionary
         source_type: Source type for logging ("vector", "entity", "relationship", "mixed")
         chunk_token_limit: Dynamic token limit for chunks (if None, uses default)
+        text_chunks_db: Storage to fetch the content of chunks merged without content
 
     Returns:
         Processed and filtered list of text chunks
@@ -2704,6 +3450,8 @@ async def process_chunks_unified(
 
     # 1. Apply reranking if enabled and query is provided
     if query_param.enable_rerank and query and unique_chunks:
+        # The reranker scores every candidate, so all content is needed up front
+        unique_chunks = await fetch_chunk_contents(unique_chunks, text_chunks_db)
         rerank_top_k = query_param.chunk_top_k or len(unique_chunks)
         unique_chunks = await apply_rerank_if_enabled(
             query=query,
@@ -2760,19 +3508,20 @@ async def process_chunks_unified(
 
         original_count = len(unique_chunks)
 
-        unique_chunks = truncate_list_by_token_size(
+        unique_chunks = await truncate_chunks_by_token_budget(
             unique_chunks,
-            key=lambda x: "\n".join(
-                json.dumps(item, ensure_ascii=False) for item in [x]
-            ),
             max_token_size=chunk_token_limit,
             tokenizer=tokenizer,
+            text_chunks_db=text_chunks_db,
+            estimated_chunk_tokens=global_config.get("chunk_token_size", 1200),
         )
 
         logger.debug(
             f"Token truncation: {len(unique_chunks)} chunks from {original_count} "
             f"(chunk available tokens: {chunk_token_limit}, source: {source_type})"
         )
+    else:
+        unique_chunks = await fetch_chunk_contents(unique_chunks, text_chunks_db)
 
     # 5. add id field to each chunk
     final_chunks = []
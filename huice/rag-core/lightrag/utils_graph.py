@@ -303,6 +303,9 @@ async def _edit_entity_impl(
 
     new_node_data = {**node_data, **updated_data}
     new_node_data["entity_id"] = new_entity_name
+    if "description" in updated_data:
+        # Stale description token count, 0 marks it unknown
+        new_node_data["description_tokens"] = 0
 # pylint: disable  Mi80OmFIVnBZMlhsa0xUb3Y2bzZlbXBTVFE9PTo3ZWZjNWY5Ng==
 
     if "entity_name" in new_node_data:
@@ -782,6 +785,9 @@ async def aedit_relation(
 
             # 2. Update relation information in the graph
             new_edge_data = {**edge_data, **updated_data}
+            if "description" in updated_data:
+                # Stale description token count, 0 marks it unknown
+                new_edge_data["description_tokens"] = 0
             await chunk_entity_relation_graph.upsert_edge(
                 source_entity, target_entity, new_edge_data
             )
@@ -1672,6 +1678,10 @@ def _merge_attributes(
             # Default strategy: keep first value
             merged_data[key] = values[0]
 
+    # A stored description token count is stale after merging, 0 marks it unknown
+    if "description_tokens" in merged_data:
+        merged_data["description_tokens"] = 0
+
     return merged_data
 
 
@@ -11,6 +11,9 @@ AuroraAI Project.
 
 import pytest
 
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.utils import Tokenizer, TokenizerInterface
+
 
 def pytest_configure(config):
     """Register custom markers for LightRAG tests."""
@@ -149,4 +152,116 @@ def run_integration_tests(request):
         return True
 
     # Fall back to environment variable
-    return os.getenv("LIGHTRAG_RUN_INTEGRATION", "false").lower() == "true"
\ No newline at end of file
+    return os.getenv("LIGHTRAG_RUN_INTEGRATION", "false").lower() == "true"
+
+
+class CharTokenizer(TokenizerInterface):
+    """Tokenizer with one token per character, so token counts are predictable."""
+
+    def encode(self, content: str):
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens):
+        return "".join(chr(token) for token in tokens)
+
+
+class MemoryGraph:
+    """In-memory undirected graph storage recording point/batched reads and writes."""
+
+    def __init__(self):
+        self.nodes = {}
+        self.edges = {}  # Keyed by the sorted endpoint pair
+        self.point_reads = []
+        self.batch_reads = []
+        self.single_writes = []
+        self.node_batches = []
+        self.edge_batches = []
+
+    async def get_node(self, node_id):
+        self.point_reads.append(("get_node", node_id))
+        return self.nodes.get(node_id)
+
+    async def has_node(self, node_id):
+        self.point_reads.append(("has_node", node_id))
+        return node_id in self.nodes
+
+    async def get_edge(self, src, tgt):
+        self.point_reads.append(("get_edge", src, tgt))
+        return self.edges.get(tuple(sorted((src, tgt))))
+
+    async def has_edge(self, src, tgt):
+        self.point_reads.append(("has_edge", src, tgt))
+        return tuple(sorted((src, tgt))) in self.edges
+
+    async def get_nodes_batch(self, node_ids):
+        self.batch_reads.append(("nodes", len(node_ids)))
+        return {
+            node_id: self.nodes[node_id]
+            for node_id in node_ids
+            if node_id in self.nodes
+        }
+
+    async def get_edges_batch(self, pairs):
+        self.batch_reads.append(("edges", len(pairs)))
+        edges = {}
+        for pair in pairs:
+            edge_key = tuple(sorted((pair["src"], pair["tgt"])))
+            if edge_key in self.edges:
+                edges[(pair["src"], pair["tgt"])] = self.edges[edge_key]
+        return edges
+
+    async def upsert_node(self, node_id, node_data):
+        self.single_writes.append(node_id)
+        self.nodes[node_id] = dict(node_data)
+
+    async def upsert_edge(self, src, tgt, edge_data):
+        self.single_writes.append((src, tgt))
+        self.edges[tuple(sorted((src, tgt)))] = dict(edge_data)
+
+    async def upsert_nodes_batch(self, nodes):
+        self.node_batches.append([node_id for node_id, _ in nodes])
+        for node_id, node_data in nodes:
+            self.nodes[node_id] = dict(node_data)
+
+    async def upsert_edges_batch(self, edges):
+        self.edge_batches.append([(src, tgt) for src, tgt, _ in edges])
+        for src, tgt, edge_data in edges:
+            self.edges[tuple(sorted((src, tgt)))] = dict(edge_data)
+
+
+@pytest.fixture
+def char_tokenizer():
+    """Tokenizer counting one token per character."""
+    return Tokenizer(model_name="char", tokenizer=CharTokenizer())
+
+
+@pytest.fixture
+def shared_data():
+    """Fresh single-process shared storage data, finalized after the test."""
+    finalize_share_data()
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+@pytest.fixture
+def memory_graph():
+    """Empty in-memory graph storage recording its reads and writes."""
+    return MemoryGraph()
+
+
+@pytest.fixture
+def merge_config(char_tokenizer):
+    """Minimal global_config for merge_nodes_and_edges without LLM summaries."""
+    return {
+        "workspace": "",
+        "tokenizer": char_tokenizer,
+        "llm_model_max_async": 2,
+        "summary_context_size": 10000,
+        "summary_max_tokens": 500,
+        "force_llm_summary_on_merge": 8,
+        "max_source_ids_per_entity": 100,
+        "max_source_ids_per_relation": 100,
+        "source_ids_limit_method": "FIFO",
+        "max_file_paths": 100,
+    }
@@ -6,11 +6,13 @@ AuroraAI Project.
 import pytest
 
 from lightrag.exceptions import ChunkTokenLimitExceededError
-from lightrag.operate import chunking_by_token_size
+from lightrag import operate
+from lightrag.operate import chunking_by_token_size, iter_chunks_by_token_size
 from lightrag.utils import Tokenizer, TokenizerInterface
 
 # pragma: no cover  MC80OmFIVnBZMlhsa0xUb3Y2bzZUSFY2UVE9PTphYzEzOTQxYQ==
 
+
 class DummyTokenizer(TokenizerInterface):
     """Simple 1:1 character-to-token mapping."""
 
@@ -69,6 +71,26 @@ class MultiTokenCharacterTokenizer(TokenizerInterface):
         return "".join(result)
 
 
+class ByteTokenizer(TokenizerInterface):
+    """UTF-8 byte-level tokenizer exposing decode_bytes, like tiktoken."""
+
+    def __init__(self):
+        self.encode_calls = 0
+        self.decoded_tokens = 0
+
+    def encode(self, content: str):
+        self.encode_calls += 1
+        return list(content.encode("utf-8"))
+
+    def decode(self, tokens):
+        return bytes(tokens).decode("utf-8", errors="replace")
+
+    def decode_bytes(self, tokens):
+        if len(tokens) > 1:
+            self.decoded_tokens += len(tokens)
+        return bytes(tokens)
+
+
 def make_tokenizer() -> Tokenizer:
     return Tokenizer(model_name="dummy", tokenizer=DummyTokenizer())
 
@@ -96,6 +118,8 @@ def test_split_by_character_only_within_limit():
     )
 
     assert [chunk["content"] for chunk in chunks] == ["alpha", "beta"]
+
+
 # pylint: disable  MS80OmFIVnBZMlhsa0xUb3Y2bzZUSFY2UVE9PTphYzEzOTQxYQ==
 
 
@@ -178,6 +202,7 @@ def test_split_by_character_only_one_over_limit():
     assert err.chunk_tokens == 11
     assert err.chunk_token_limit == 10
 
+
 # fmt: off  Mi80OmFIVnBZMlhsa0xUb3Y2bzZUSFY2UVE9PTphYzEzOTQxYQ==
 
 # ============================================================================
@@ -270,8 +295,10 @@ def test_split_multiple_chunks_with_mixed_sizes():
     assert chunks[0]["content"] == "small"
     assert chunks[0]["tokens"] == 5
 
+
 # fmt: off  My80OmFIVnBZMlhsa0xUb3Y2bzZUSFY2UVE9PTphYzEzOTQxYQ==
 
+
 @pytest.mark.offline
 def test_split_exact_boundary():
     """Test splitting at exact chunk boundaries."""
@@ -1072,4 +1099,135 @@ def test_decode_preserves_content():
     for original in test_strings:
         tokens = tokenizer.encode(original)
         decoded = tokenizer.decode(tokens)
-        assert decoded == original, f"Failed to decode: {original}"
\ No newline at end of file
+        assert decoded == original, f"Failed to decode: {original}"
+
+
+# ============================================================================
+# Offset-based Slicing and Streaming Tests
+# ============================================================================
+
+
+@pytest.mark.offline
+def test_offset_slicing_matches_decode_for_ascii():
+    """Chunks sliced by offset equal decoded windows for single-byte text."""
+    byte_tokenizer = ByteTokenizer()
+    tokenizer = Tokenizer(model_name="bytes", tokenizer=byte_tokenizer)
+    content = "".join(f"word{i} " for i in range(200))
+
+    chunks = chunking_by_token_size(
+        tokenizer, content, chunk_token_size=50, chunk_overlap_token_size=10
+    )
+    tokens = list(content.encode("utf-8"))
+    expected = [
+        bytes(tokens[start : start + 50]).decode("utf-8").strip()
+        for start in range(0, len(tokens), 40)
+    ]
+    assert [chunk["content"] for chunk in chunks] == expected
+    assert byte_tokenizer.encode_calls == 1
+    # One decode to validate the input, then about one decode per window
+    assert byte_tokenizer.decoded_tokens <= len(tokens) + 50 * len(chunks)
+
+
+@pytest.mark.offline
+@pytest.mark.parametrize(
+    "make", [make_tokenizer, lambda: Tokenizer("b", ByteTokenizer())]
+)
+def test_overlap_not_smaller_than_chunk_size(make):
+    """An overlap of chunk size or more never advances, as before streaming."""
+    content = "0123456789abcdefghij"
+
+    with pytest.raises(ValueError):
+        chunking_by_token_size(
+            make(), content, chunk_token_size=10, chunk_overlap_token_size=10
+        )
+    assert (
+        chunking_by_token_size(
+            make(), content, chunk_token_size=10, chunk_overlap_token_size=12
+        )
+        == []
+    )
+
+
+@pytest.mark.offline
+def test_offset_slicing_keeps_multibyte_characters_whole():
+    """Windows splitting a multi-byte character never yield replacement chars."""
+    tokenizer = Tokenizer(model_name="bytes", tokenizer=ByteTokenizer())
+    content = "知识图谱检索增强生成" * 20
+
+    chunks = chunking_by_token_size(
+        tokenizer, content, chunk_token_size=16, chunk_overlap_token_size=4
+    )
+
+    assert all("\ufffd" not in chunk["content"] for chunk in chunks)
+    assert all(chunk["content"] in content for chunk in chunks)
+    assert chunks[0]["content"] == content[:5]
+    assert chunks[-1]["content"] == content[-len(chunks[-1]["content"]) :]
+
+
+@pytest.mark.offline
+def test_split_by_character_encodes_each_piece_once():
+    """Split mode no longer encodes the whole document up front."""
+    byte_tokenizer = ByteTokenizer()
+    tokenizer = Tokenizer(model_name="bytes", tokenizer=byte_tokenizer)
+
+    chunks = chunking_by_token_size(
+        tokenizer,
+        "short\n\n" + "x" * 30 + "\n\nend",
+        split_by_character="\n\n",
+        chunk_token_size=20,
+        chunk_overlap_token_size=5,
+    )
+
+    assert byte_tokenizer.encode_calls == 3
+    assert [chunk["content"] for chunk in chunks] == [
+        "short",
+        "x" * 20,
+        "x" * 15,
+        "end",
+    ]
+
+
+@pytest.mark.offline
+def test_segmented_encoding_matches_single_segment(monkeypatch):
+    """Encoding long input in segments yields the same chunks."""
+    content = "\n".join(f"Paragraph {i} has some words in it." for i in range(300))
+    expected = chunking_by_token_size(
+        make_tokenizer(), content, chunk_token_size=64, chunk_overlap_token_size=8
+    )
+
+    byte_tokenizer = ByteTokenizer()
+    monkeypatch.setattr(operate, "CHUNKING_SEGMENT_CHARS", 100)
+    chunks = chunking_by_token_size(
+        Tokenizer(model_name="bytes", tokenizer=byte_tokenizer),
+        content,
+        chunk_token_size=64,
+        chunk_overlap_token_size=8,
+    )
+
+    assert chunks == expected
+    assert byte_tokenizer.encode_calls > 1
+
+
+@pytest.mark.offline
+def test_iter_chunks_is_lazy():
+    """The streaming variant yields chunks before consuming the whole input."""
+    byte_tokenizer = ByteTokenizer()
+    tokenizer = Tokenizer(model_name="bytes", tokenizer=byte_tokenizer)
+    content = "abc " * (operate.CHUNKING_SEGMENT_CHARS // 2)
+
+    chunks = iter_chunks_by_token_size(
+        tokenizer, content, chunk_token_size=100, chunk_overlap_token_size=0
+    )
+    first = next(chunks)
+
+    assert first == {
+        "tokens": 100,
+        "content": content[:100].strip(),
+        "chunk_order_index": 0,
+    }
+    assert byte_tokenizer.encode_calls == 1
+    assert len(list(chunks)) + 1 == len(
+        chunking_by_token_size(
+            tokenizer, content, chunk_token_size=100, chunk_overlap_token_size=0
+        )
+    )
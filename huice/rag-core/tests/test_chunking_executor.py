@@ -0,0 +1,110 @@
+"""
+Test suite for ChunkingExecutor
+
+This test verifies:
+1. Thread mode returns the same chunks and chunk IDs as inline chunking
+2. Asynchronous chunking functions, and callables returning awaitables, run inline
+3. Process mode falls back to threads when the chunking function cannot be pickled
+4. No more than max_pending documents are handed to the pool at once
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import asyncio
+import threading
+
+import pytest
+
+from lightrag.operate import chunking_by_token_size
+from lightrag.utils import ChunkingExecutor, compute_mdhash_id
+
+CHUNK_ARGS = (None, False, 2, 10)
+
+
+@pytest.mark.offline
+class TestChunkingExecutor:
+    async def test_thread_mode_matches_inline(self, char_tokenizer):
+        content = "The quick brown fox jumps over the lazy dog"
+        inline = ChunkingExecutor(char_tokenizer, chunking_by_token_size, "inline")
+        threaded = ChunkingExecutor(char_tokenizer, chunking_by_token_size, "thread")
+        try:
+            expected = await inline.chunk(content, *CHUNK_ARGS)
+            assert await threaded.chunk(content, *CHUNK_ARGS) == expected
+        finally:
+            threaded.shutdown()
+
+        assert [chunk_id for chunk_id, _ in expected] == [
+            compute_mdhash_id(dp["content"], prefix="chunk-") for _, dp in expected
+        ]
+
+    async def test_async_chunking_func_runs_inline(self, char_tokenizer):
+        loop_thread = threading.get_ident()
+        seen_threads = []
+
+        async def async_chunking(tokenizer, content, *args):
+            seen_threads.append(threading.get_ident())
+            return [{"tokens": 1, "content": content, "chunk_order_index": 0}]
+
+        executor = ChunkingExecutor(char_tokenizer, async_chunking, "process")
+        assert executor.mode == "inline"
+        result = await executor.chunk("text", *CHUNK_ARGS)
+        assert result[0][1]["content"] == "text"
+        assert seen_threads == [loop_thread]
+
+        # Not a coroutine function, detected from its first result
+        executor = ChunkingExecutor(
+            char_tokenizer, lambda *args: async_chunking(*args), "thread"
+        )
+        try:
+            result = await executor.chunk("more text", *CHUNK_ARGS)
+            assert result[0][1]["content"] == "more text"
+            assert executor.mode == "inline"
+            assert seen_threads == [loop_thread, loop_thread]
+        finally:
+            executor.shutdown()
+
+    async def test_invalid_result_raises(self, char_tokenizer):
+        executor = ChunkingExecutor(char_tokenizer, lambda *args: "oops", "thread")
+        try:
+            with pytest.raises(TypeError):
+                await executor.chunk("text", *CHUNK_ARGS)
+        finally:
+            executor.shutdown()
+
+    def test_process_mode_falls_back_for_unpicklable_func(self, char_tokenizer):
+        executor = ChunkingExecutor(
+            char_tokenizer, lambda *args: chunking_by_token_size(*args), "process"
+        )
+        assert executor.mode == "thread"
+
+    async def test_pending_jobs_are_bounded(self, char_tokenizer):
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_chunking(tokenizer, content, *args):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            threading.Event().wait(0.02)
+            with lock:
+                running -= 1
+            return [{"tokens": 1, "content": content, "chunk_order_index": 0}]
+
+        executor = ChunkingExecutor(
+            char_tokenizer, slow_chunking, "thread", max_workers=8, max_pending=2
+        )
+        try:
+            results = await asyncio.gather(
+                *(executor.chunk(f"doc {i}", *CHUNK_ARGS) for i in range(6))
+            )
+        finally:
+            executor.shutdown()
+
+        assert [r[0][1]["content"] for r in results] == [f"doc {i}" for i in range(6)]
+        assert peak <= 2
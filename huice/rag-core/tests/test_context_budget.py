@@ -0,0 +1,131 @@
+"""
+Test suite for the budget-aware query context builder
+
+This test verifies:
+1. Chunks merged without content are fetched in ranked order only up to the token budget
+2. The lazily fetched result matches eager truncation of fully fetched chunks
+3. Missing chunks are skipped and the next ranked chunks take their place
+4. With reranking enabled all candidates are fetched before scoring
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import json
+
+import pytest
+
+from lightrag.base import QueryParam
+from lightrag.utils import (
+    process_chunks_unified,
+    truncate_chunks_by_token_budget,
+    truncate_list_by_token_size,
+)
+
+
+class CountingKV:
+    """Text chunk storage recording which chunk ids were fetched"""
+
+    def __init__(self, data):
+        self.data = data
+        self.fetched = []
+
+    async def get_by_ids(self, ids):
+        self.fetched.extend(ids)
+        return [self.data.get(chunk_id) for chunk_id in ids]
+
+
+def make_storage(count=20):
+    return CountingKV(
+        {
+            f"chunk-{i}": {"content": f"content {i:02d} " * 5, "file_path": "a.md"}
+            for i in range(count)
+        }
+    )
+
+
+def make_stubs(storage):
+    return [
+        {"content": None, "file_path": "unknown_source", "chunk_id": chunk_id}
+        for chunk_id in storage.data
+    ]
+
+
+@pytest.mark.offline
+class TestChunkTokenBudget:
+    async def test_fetches_only_chunks_within_budget(self, char_tokenizer):
+        storage = make_storage()
+        # Each serialized chunk is ~110 characters, the budget fits three of them
+        kept = await truncate_chunks_by_token_budget(
+            make_stubs(storage),
+            max_token_size=350,
+            tokenizer=char_tokenizer,
+            text_chunks_db=storage,
+            estimated_chunk_tokens=110,
+        )
+        assert [chunk["chunk_id"] for chunk in kept] == [
+            "chunk-0",
+            "chunk-1",
+            "chunk-2",
+        ]
+        assert len(storage.fetched) <= 5
+
+        eager = [
+            {"content": data["content"], "file_path": "a.md", "chunk_id": chunk_id}
+            for chunk_id, data in storage.data.items()
+        ]
+        expected = truncate_list_by_token_size(
+            eager,
+            key=lambda x: json.dumps(x, ensure_ascii=False),
+            max_token_size=350,
+            tokenizer=char_tokenizer,
+        )
+        assert kept == expected
+
+    async def test_missing_chunks_are_skipped(self, char_tokenizer):
+        storage = make_storage(6)
+        del storage.data["chunk-1"]
+        stubs = make_stubs(make_storage(6))
+        kept = await truncate_chunks_by_token_budget(
+            stubs, 350, char_tokenizer, storage, estimated_chunk_tokens=110
+        )
+        assert [chunk["chunk_id"] for chunk in kept] == [
+            "chunk-0",
+            "chunk-2",
+            "chunk-3",
+        ]
+        assert stubs[0]["content"] is None
+
+    async def test_process_chunks_unified_with_lazy_content(self, char_tokenizer):
+        storage = make_storage()
+        vector_chunk = {"content": "vector hit", "file_path": "v.md", "chunk_id": "v"}
+        config = {"tokenizer": char_tokenizer, "chunk_token_size": 110}
+
+        param = QueryParam(chunk_top_k=10, enable_rerank=False)
+        result = await process_chunks_unified(
+            "query",
+            [vector_chunk, *make_stubs(storage)],
+            param,
+            config,
+            chunk_token_limit=300,
+            text_chunks_db=storage,
+        )
+        assert [chunk["id"] for chunk in result] == ["DC1", "DC2", "DC3"]
+        assert result[0]["content"] == "vector hit"
+        assert result[1]["file_path"] == "a.md"
+        assert len(storage.fetched) < 10
+
+        storage.fetched.clear()
+        param = QueryParam(chunk_top_k=10, enable_rerank=True)
+        await process_chunks_unified(
+            "query",
+            make_stubs(storage),
+            param,
+            config,
+            chunk_token_limit=300,
+            text_chunks_db=storage,
+        )
+        assert len(storage.fetched) == 20
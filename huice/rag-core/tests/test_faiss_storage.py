@@ -0,0 +1,186 @@
+"""
+Test suite for FaissVectorDBStorage
+
+This test verifies:
+1. Custom IDs are resolved through the reverse ID map after upserts and deletes
+2. Deletes remove vectors in place without renumbering the remaining IDs
+3. Vectors are kept in the index instead of metadata and survive persistence
+4. Legacy IndexFlatIP files with vectors in metadata are migrated on load
+5. Vectors are reconstructed in one batch as a float32 matrix
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+import faiss
+
+from lightrag.kg.faiss_impl import FaissVectorDBStorage
+from lightrag.kg.shared_storage import initialize_share_data
+from lightrag.utils import EmbeddingFunc
+
+DIM = 8
+
+
+async def _mock_embedding(texts: list[str], **kwargs) -> np.ndarray:
+    """Deterministic embedding derived from the text so tests are repeatable"""
+    vectors = []
+    for text in texts:
+        rng = np.random.default_rng(abs(hash(text)) % (2**32))
+        vectors.append(rng.random(DIM))
+    return np.array(vectors, dtype=np.float32)
+
+
+@pytest.fixture
+def working_dir():
+    path = tempfile.mkdtemp(prefix="faiss_test_")
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+async def _make_storage(working_dir: str) -> FaissVectorDBStorage:
+    initialize_share_data()
+    storage = FaissVectorDBStorage(
+        namespace="chunks",
+        workspace="",
+        global_config={
+            "working_dir": working_dir,
+            "embedding_batch_num": 4,
+            "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": -1.0},
+        },
+        embedding_func=EmbeddingFunc(embedding_dim=DIM, func=_mock_embedding),
+        meta_fields={"content", "src_id", "tgt_id"},
+    )
+    await storage.initialize()
+    return storage
+
+
+@pytest.mark.offline
+class TestFaissVectorDBStorage:
+    async def test_delete_keeps_remaining_ids_stable(self, working_dir):
+        storage = await _make_storage(working_dir)
+        data = {f"chunk-{i}": {"content": f"text {i}"} for i in range(10)}
+        await storage.upsert(data)
+
+        before = await storage.get_vectors_by_ids(["chunk-7"])
+        await storage.delete(["chunk-1", "chunk-3", "missing"])
+
+        assert storage._index.ntotal == 8
+        assert await storage.get_by_id("chunk-1") is None
+        assert (await storage.get_by_id("chunk-7"))["content"] == "text 7"
+        after = await storage.get_vectors_by_ids(["chunk-7"])
+        np.testing.assert_allclose(before["chunk-7"], after["chunk-7"])
+
+        results = await storage.query("text 7", top_k=1)
+        assert results[0]["id"] == "chunk-7"
+
+    async def test_upsert_replaces_existing_id(self, working_dir):
+        storage = await _make_storage(working_dir)
+        await storage.upsert({"chunk-a": {"content": "old"}})
+        await storage.upsert({"chunk-a": {"content": "new"}})
+
+        assert storage._index.ntotal == 1
+        assert (await storage.get_by_id("chunk-a"))["content"] == "new"
+
+    async def test_persistence_roundtrip(self, working_dir):
+        storage = await _make_storage(working_dir)
+        await storage.upsert({f"chunk-{i}": {"content": f"text {i}"} for i in range(5)})
+        await storage.delete(["chunk-0"])
+        assert await storage.index_done_callback()
+
+        with open(storage._meta_file, encoding="utf-8") as f:
+            stored = json.load(f)
+        assert all("__vector__" not in meta for meta in stored.values())
+
+        reloaded = await _make_storage(working_dir)
+        assert reloaded._index.ntotal == 4
+        assert await reloaded.get_by_id("chunk-0") is None
+        await reloaded.upsert({"chunk-new": {"content": "fresh"}})
+        assert reloaded._index.ntotal == 5
+        assert (await reloaded.get_by_id("chunk-4"))["content"] == "text 4"
+
+    async def test_legacy_flat_index_is_migrated(self, working_dir):
+        vectors = (await _mock_embedding(["a", "b"])).astype(np.float32)
+        faiss.normalize_L2(vectors)
+        legacy = faiss.IndexFlatIP(DIM)
+        legacy.add(vectors)
+        index_file = os.path.join(working_dir, "faiss_index_chunks.index")
+        faiss.write_index(legacy, index_file)
+        with open(index_file + ".meta.json", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    str(i): {"__id__": cid, "content": cid, "__vector__": v.tolist()}
+                    for i, (cid, v) in enumerate(zip(["a", "b"], vectors))
+                },
+                f,
+            )
+
+        storage = await _make_storage(working_dir)
+        assert isinstance(storage._index, faiss.IndexIDMap2)
+        assert "__vector__" not in await storage.get_by_id("b")
+        restored = await storage.get_vectors_by_ids(["b"])
+        np.testing.assert_allclose(restored["b"], vectors[1], rtol=1e-6)
+
+    async def test_delete_entity_relation(self, working_dir):
+        storage = await _make_storage(working_dir)
+        await storage.upsert(
+            {
+                "rel-1": {"content": "x", "src_id": "A", "tgt_id": "B"},
+                "rel-2": {"content": "y", "src_id": "B", "tgt_id": "C"},
+                "rel-3": {"content": "z", "src_id": "C", "tgt_id": "D"},
+            }
+        )
+        await storage.delete_entity_relation("B")
+
+        assert await storage.get_by_id("rel-1") is None
+        assert await storage.get_by_id("rel-2") is None
+        assert await storage.get_by_id("rel-3") is not None
+
+    async def test_entity_relation_index_follows_upserts_and_reloads(self, working_dir):
+        storage = await _make_storage(working_dir)
+        await storage.upsert(
+            {
+                "rel-1": {"content": "x", "src_id": "A", "tgt_id": "B"},
+                "rel-2": {"content": "y", "src_id": "A", "tgt_id": "C"},
+            }
+        )
+        # Re-pointing a relation must drop it from its old endpoint
+        await storage.upsert({"rel-2": {"content": "y", "src_id": "C", "tgt_id": "D"}})
+        assert storage._entity_relation_index["A"] == {"rel-1"}
+        assert await storage.index_done_callback()
+
+        reloaded = await _make_storage(working_dir)
+        assert reloaded._entity_relation_index == {
+            "A": {"rel-1"},
+            "B": {"rel-1"},
+            "C": {"rel-2"},
+            "D": {"rel-2"},
+        }
+        await reloaded.delete_entity_relation("D")
+        assert await reloaded.get_by_id("rel-2") is None
+        assert "C" not in reloaded._entity_relation_index
+
+    async def test_vector_matrix_by_ids(self, working_dir):
+        storage = await _make_storage(working_dir)
+        await storage.upsert({f"chunk-{i}": {"content": f"text {i}"} for i in range(5)})
+
+        found_ids, matrix = await storage.get_vector_matrix_by_ids(
+            ["chunk-3", "missing", "chunk-0"]
+        )
+        vectors = await storage.get_vectors_by_ids(["chunk-3", "chunk-0"])
+        assert found_ids == ["chunk-3", "chunk-0"]
+        assert matrix.dtype == np.float32
+        np.testing.assert_allclose(matrix, [vectors["chunk-3"], vectors["chunk-0"]])
+        assert (await storage.get_vector_matrix_by_ids(["missing"]))[0] == []
@@ -0,0 +1,153 @@
+"""
+Test suite for batched graph writes during the merge phase
+
+This test verifies:
+1. Each merge batch of graph_upsert_batch_size names writes with one upsert_nodes_batch/upsert_edges_batch call
+2. A failing merge leaves the completed merges written to the graph
+3. The BaseGraphStorage fallback upserts batches row by row, e.g. for NetworkXStorage
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import asyncio
+import shutil
+import tempfile
+
+import pytest
+
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.operate import merge_nodes_and_edges
+
+
+async def failing_llm(*args, **kwargs):
+    raise RuntimeError("summary failed")
+
+
+@pytest.fixture
+def config(merge_config):
+    return {
+        **merge_config,
+        "llm_model_func": failing_llm,
+        "addon_params": {},
+        "summary_length_recommended": 100,
+    }
+
+
+def make_chunk_results(failing_entity=None):
+    nodes = {
+        name: [
+            {
+                "entity_name": name,
+                "entity_type": "person",
+                "description": f"{name} is a pilot.",
+                "source_id": "chunk-1",
+                "file_path": "a.md",
+            }
+        ]
+        for name in ["Zorblat", "Quixa", "Vendrix", "Plutonia", "Marlo"]
+    }
+    if failing_entity is not None:
+        # Enough descriptions to force an LLM summary, which fails
+        nodes[failing_entity] = [
+            {**nodes[failing_entity][0], "description": f"Fact {i}."} for i in range(8)
+        ]
+    edges = {
+        (src, tgt): [
+            {
+                "src_id": src,
+                "tgt_id": tgt,
+                "description": f"{src} flies with {tgt}.",
+                "keywords": "flight",
+                "source_id": "chunk-1",
+                "file_path": "a.md",
+                "weight": 1.0,
+            }
+        ]
+        for src, tgt in [
+            ("Zorblat", "Quixa"),
+            ("Zorblat", "Vendrix"),
+            ("Quixa", "Vendrix"),
+            ("Marlo", "Orbix"),
+        ]
+    }
+    return [(nodes, edges)]
+
+
+async def run_merge(graph, config, batch_size, failing_entity=None):
+    await merge_nodes_and_edges(
+        make_chunk_results(failing_entity),
+        graph,
+        None,
+        None,
+        {**config, "graph_upsert_batch_size": batch_size},
+        doc_id="doc-1",
+        pipeline_status={"latest_message": "", "history_messages": []},
+        pipeline_status_lock=asyncio.Lock(),
+    )
+
+
+@pytest.mark.offline
+class TestGraphBatchUpsert:
+    async def test_merge_writes_in_batches(self, shared_data, memory_graph, config):
+        graph = memory_graph
+        await run_merge(graph, config, batch_size=2)
+
+        assert graph.single_writes == []
+        # Three entity batches, then Orbix created by the second relation batch
+        assert sorted(map(sorted, graph.node_batches)) == [
+            ["Marlo"],
+            ["Orbix"],
+            ["Plutonia", "Vendrix"],
+            ["Quixa", "Zorblat"],
+        ]
+        assert sorted(map(sorted, graph.edge_batches)) == [
+            [("Marlo", "Orbix"), ("Quixa", "Vendrix")],
+            [("Quixa", "Zorblat"), ("Vendrix", "Zorblat")],
+        ]
+        assert sorted(graph.batch_reads) == [
+            ("edges", 2),
+            ("edges", 2),
+            ("nodes", 1),
+            ("nodes", 2),
+            ("nodes", 2),
+            ("nodes", 3),
+            ("nodes", 4),
+        ]
+        assert graph.nodes["Orbix"]["entity_type"] == "UNKNOWN"
+        edge = await graph.get_edge("Zorblat", "Quixa")
+        assert edge["description"] == "Zorblat flies with Quixa."
+
+    async def test_failed_merge_keeps_completed_writes(
+        self, shared_data, memory_graph, config
+    ):
+        graph = memory_graph
+        with pytest.raises(RuntimeError, match="summary failed"):
+            await run_merge(graph, config, batch_size=2, failing_entity="Plutonia")
+
+        assert "Plutonia" not in graph.nodes
+        # Merges that ran next to the failing one were written, not dropped
+        assert {"Zorblat", "Quixa", "Vendrix"} <= set(graph.nodes)
+
+    async def test_networkx_falls_back_to_single_upserts(self, shared_data, config):
+        working_dir = tempfile.mkdtemp(prefix="graph_batch_test_")
+        try:
+            storage = NetworkXStorage(
+                namespace="chunk_entity_relation",
+                workspace="",
+                global_config={"working_dir": working_dir},
+                embedding_func=None,
+            )
+            await storage.initialize()
+            await run_merge(storage, config, batch_size=3)
+
+            assert await storage.get_node("Plutonia") is not None
+            assert await storage.has_edge("Vendrix", "Quixa")
+            assert (await storage.get_node("Orbix"))["entity_type"] == "UNKNOWN"
+            edge = await storage.get_edge("Marlo", "Orbix")
+            assert edge["description"] == "Marlo flies with Orbix."
+        finally:
+            shutil.rmtree(working_dir, ignore_errors=True)
@@ -0,0 +1,132 @@
+"""
+Test suite for JsonKVStorage append-only log mode
+
+This test verifies:
+1. Flushes append only changed and deleted keys instead of rewriting the snapshot
+2. Snapshot plus log are replayed on initialize
+3. The log is compacted into the snapshot once it grows past the threshold
+4. Disabling log mode folds a pending log back into the snapshot
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+
+
+@pytest.fixture
+def working_dir():
+    path = tempfile.mkdtemp(prefix="json_kv_log_test_")
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+def append_log_env(monkeypatch):
+    monkeypatch.setenv("JSON_KV_APPEND_LOG", "true")
+    # Keep compaction out of the way unless a test lowers the threshold
+    monkeypatch.setenv("JSON_KV_LOG_COMPACT_MIN_BYTES", str(1024 * 1024))
+
+
+async def _make_storage(working_dir: str) -> JsonKVStorage:
+    # Fresh shared data so initialize() loads from disk like a new process
+    finalize_share_data()
+    initialize_share_data()
+    storage = JsonKVStorage(
+        namespace="text_chunks",
+        workspace="",
+        global_config={"working_dir": working_dir},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+def _read_log(storage: JsonKVStorage) -> list[dict]:
+    with open(storage._log_file_name, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.mark.offline
+class TestJsonKVAppendLog:
+    async def test_flush_appends_only_changed_keys(self, working_dir, append_log_env):
+        storage = await _make_storage(working_dir)
+        await storage.upsert({f"k{i}": {"content": f"v{i}"} for i in range(5)})
+        await storage.index_done_callback()
+        assert len(_read_log(storage)) == 5
+        assert not os.path.exists(storage._file_name)
+
+        await storage.upsert({"k1": {"content": "changed"}})
+        await storage.delete(["k2", "missing"])
+        await storage.index_done_callback()
+
+        records = _read_log(storage)[5:]
+        assert [(r["op"], r["key"]) for r in records] == [
+            ("upsert", "k1"),
+            ("delete", "k2"),
+        ]
+
+    async def test_snapshot_and_log_replayed_on_initialize(
+        self, working_dir, append_log_env
+    ):
+        storage = await _make_storage(working_dir)
+        await storage.upsert({"a": {"content": "1"}, "b": {"content": "2"}})
+        await storage.index_done_callback()
+        storage._compact_log()
+        await storage.upsert({"a": {"content": "3"}})
+        await storage.delete(["b"])
+        await storage.index_done_callback()
+
+        with open(storage._log_file_name, "a", encoding="utf-8") as f:
+            f.write('{"op": "upsert", "key": "torn"')
+
+        reloaded = await _make_storage(working_dir)
+        assert (await reloaded.get_by_id("a"))["content"] == "3"
+        assert await reloaded.get_by_id("b") is None
+        assert await reloaded.get_by_id("torn") is None
+
+    async def test_log_compacts_past_threshold(
+        self, working_dir, append_log_env, monkeypatch
+    ):
+        monkeypatch.setenv("JSON_KV_LOG_COMPACT_MIN_BYTES", "1")
+        storage = await _make_storage(working_dir)
+        await storage.upsert({"a": {"content": "1"}})
+        await storage.index_done_callback()
+
+        assert not os.path.exists(storage._log_file_name)
+        with open(storage._file_name, encoding="utf-8") as f:
+            assert json.load(f)["a"]["content"] == "1"
+
+    async def test_pending_log_folded_when_mode_disabled(
+        self, working_dir, append_log_env, monkeypatch
+    ):
+        storage = await _make_storage(working_dir)
+        await storage.upsert({"a": {"content": "1"}})
+        await storage.index_done_callback()
+
+        monkeypatch.setenv("JSON_KV_APPEND_LOG", "false")
+        reloaded = await _make_storage(working_dir)
+        assert (await reloaded.get_by_id("a"))["content"] == "1"
+        assert not os.path.exists(reloaded._log_file_name)
+        with open(reloaded._file_name, encoding="utf-8") as f:
+            assert "a" in json.load(f)
+
+    async def test_drop_resets_snapshot_and_log(self, working_dir, append_log_env):
+        storage = await _make_storage(working_dir)
+        await storage.upsert({"a": {"content": "1"}})
+        await storage.index_done_callback()
+        await storage.drop()
+
+        reloaded = await _make_storage(working_dir)
+        assert await reloaded.is_empty()
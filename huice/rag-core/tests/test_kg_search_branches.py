@@ -0,0 +1,140 @@
+"""
+Test suite for concurrent retrieval branches in _perform_kg_search
+
+This test verifies:
+1. Local, global and vector branches run concurrently
+2. A branch exceeding search_branch_timeout is dropped and reported
+3. Errors other than the deadline, including inner timeouts, are still raised
+4. The query and keyword strings are embedded in a single batched call at query priority
+5. An embedding call still running at the deadline is cancelled, not awaited
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from lightrag import operate
+from lightrag.base import QueryParam
+
+
+def _text_chunks_db(embedding_calls: list | None = None, embedding_delay: float = 0):
+    async def embed(texts, _priority=10):
+        if embedding_calls is not None:
+            embedding_calls.append((list(texts), _priority))
+        await asyncio.sleep(embedding_delay)
+        return [[1.0, float(i)] for i in range(len(texts))]
+
+    return SimpleNamespace(
+        global_config={"kg_chunk_pick_method": "VECTOR"}, embedding_func=embed
+    )
+
+
+@pytest.fixture
+def slow_branches(monkeypatch):
+    delays = {"local": 0.2, "global": 0.2, "vector": 0.2}
+
+    async def fake_node_data(*args, query_embedding=None):
+        assert query_embedding == [1.0, 1.0]
+        await asyncio.sleep(delays["local"])
+        return [{"entity_name": "A"}], [{"src_tgt": ("A", "B")}]
+
+    async def fake_edge_data(*args, query_embedding=None):
+        assert query_embedding == [1.0, 2.0]
+        await asyncio.sleep(delays["global"])
+        return [{"src_tgt": ("B", "C")}], [{"entity_name": "C"}]
+
+    async def fake_vector_context(query, chunks_vdb, query_param, query_embedding):
+        assert query_embedding == [1.0, 0.0]
+        await asyncio.sleep(delays["vector"])
+        return [{"chunk_id": "chunk-1", "content": "text"}]
+
+    monkeypatch.setattr(operate, "_get_node_data", fake_node_data)
+    monkeypatch.setattr(operate, "_get_edge_data", fake_edge_data)
+    monkeypatch.setattr(operate, "_get_vector_context", fake_vector_context)
+    return delays
+
+
+async def _search(
+    param: QueryParam, embedding_calls: list | None = None, embedding_delay: float = 0
+) -> dict:
+    return await operate._perform_kg_search(
+        "query",
+        "low",
+        "high",
+        None,
+        None,
+        None,
+        _text_chunks_db(embedding_calls, embedding_delay),
+        param,
+        chunks_vdb=object(),
+    )
+
+
+@pytest.mark.offline
+class TestKGSearchBranches:
+    async def test_branches_run_concurrently(self, slow_branches):
+        start = time.perf_counter()
+        result = await _search(QueryParam(mode="mix"))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.5
+        assert [e["entity_name"] for e in result["final_entities"]] == ["A", "C"]
+        assert len(result["final_relations"]) == 2
+        assert "chunk-1" in result["chunk_tracking"]
+        assert result["query_embedding"] == [1.0, 0.0]
+        assert result["timed_out_branches"] == []
+
+    async def test_slow_branch_times_out(self, slow_branches):
+        slow_branches["global"] = 5
+        start = time.perf_counter()
+        result = await _search(QueryParam(mode="mix", search_branch_timeout=0.5))
+
+        assert time.perf_counter() - start < 2
+        assert result["timed_out_branches"] == ["global"]
+        assert [e["entity_name"] for e in result["final_entities"]] == ["A"]
+        assert result["vector_chunks"]
+
+    async def test_local_mode_only_runs_local_branch(self, slow_branches):
+        result = await _search(QueryParam(mode="local"))
+        assert [e["entity_name"] for e in result["final_entities"]] == ["A"]
+        assert result["vector_chunks"] == []
+
+    async def test_branch_errors_are_raised(self, monkeypatch, slow_branches):
+        async def failing(*args, **kwargs):
+            raise RuntimeError("graph down")
+
+        monkeypatch.setattr(operate, "_get_node_data", failing)
+        with pytest.raises(RuntimeError, match="graph down"):
+            await _search(QueryParam(mode="hybrid"))
+
+    async def test_inner_timeouts_are_raised(self, monkeypatch, slow_branches):
+        async def storage_timeout(*args, **kwargs):
+            raise asyncio.TimeoutError("graph query timed out")
+
+        monkeypatch.setattr(operate, "_get_node_data", storage_timeout)
+        with pytest.raises(asyncio.TimeoutError, match="graph query timed out"):
+            await _search(QueryParam(mode="hybrid", search_branch_timeout=5))
+
+    async def test_slow_embedding_is_cancelled_at_deadline(self, slow_branches):
+        start = time.perf_counter()
+        result = await _search(
+            QueryParam(mode="mix", search_branch_timeout=0.3), embedding_delay=5
+        )
+
+        assert time.perf_counter() - start < 2
+        assert sorted(result["timed_out_branches"]) == ["global", "local", "vector"]
+        assert result["query_embedding"] is None
+
+    async def test_query_and_keywords_embedded_in_one_call(self, slow_branches):
+        embedding_calls = []
+        await _search(QueryParam(mode="mix"), embedding_calls)
+        # Queries do not wait behind ingest embeddings, like vector storage queries
+        assert embedding_calls == [(["query", "low", "high"], 5)]
@@ -0,0 +1,110 @@
+"""
+Test suite for the in-process LLM cache front
+
+This test verifies:
+1. Repeated lookups are served from memory after the first storage read
+2. save_to_cache skips its duplicate-check read for keys known locally
+3. Entries are evicted in LRU order and expire after the TTL
+4. Invalidation drops entries so the storage is read again
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import time
+
+import pytest
+
+from lightrag.utils import (
+    CacheData,
+    LLMCacheFront,
+    get_llm_cache_front,
+    handle_cache,
+    invalidate_llm_cache_front,
+    save_to_cache,
+)
+
+
+class CountingKV:
+    """Minimal LLM cache storage counting its reads"""
+
+    def __init__(self):
+        self.global_config = {
+            "enable_llm_cache": True,
+            "enable_llm_cache_for_entity_extract": True,
+        }
+        self.data = {}
+        self.reads = 0
+
+    async def get_by_id(self, key):
+        self.reads += 1
+        return self.data.get(key)
+
+    async def upsert(self, data):
+        for key, value in data.items():
+            self.data[key] = {**value, "create_time": 123}
+
+
+@pytest.fixture(autouse=True)
+def front_env(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_FRONT_MAX_ENTRIES", "16")
+    monkeypatch.setenv("LLM_CACHE_FRONT_TTL", "600")
+
+
+@pytest.mark.offline
+class TestLLMCacheFront:
+    async def test_lookups_served_from_memory(self):
+        kv = CountingKV()
+        kv.data["default:extract:h1"] = {"return": "cached", "create_time": 7}
+
+        assert await handle_cache(kv, "h1", "p", cache_type="extract") == ("cached", 7)
+        assert await handle_cache(kv, "h1", "p", cache_type="extract") == ("cached", 7)
+        assert kv.reads == 1
+        assert get_llm_cache_front(kv).stats()["hits"] == 1
+
+    async def test_save_after_miss_skips_duplicate_read(self):
+        kv = CountingKV()
+        assert await handle_cache(kv, "h2", "p", cache_type="extract") is None
+        await save_to_cache(kv, CacheData("h2", "answer", "p", cache_type="extract"))
+        assert kv.reads == 1
+
+        # Known locally: a duplicate save neither reads nor writes the storage
+        kv.data.clear()
+        await save_to_cache(kv, CacheData("h2", "answer", "p", cache_type="extract"))
+        assert kv.reads == 1 and not kv.data
+        content, create_time = await handle_cache(kv, "h2", "p", cache_type="extract")
+        assert content == "answer"
+        assert abs(create_time - time.time()) < 5
+
+    async def test_missing_keys_are_read_again(self):
+        kv = CountingKV()
+        assert await handle_cache(kv, "h3", "p", cache_type="extract") is None
+        kv.data["default:extract:h3"] = {"return": "from peer", "create_time": 1}
+        assert await handle_cache(kv, "h3", "p", cache_type="extract") == (
+            "from peer",
+            1,
+        )
+
+    async def test_invalidate_forces_storage_read(self):
+        kv = CountingKV()
+        await save_to_cache(kv, CacheData("h4", "answer", "p", cache_type="extract"))
+        kv.data.clear()
+        invalidate_llm_cache_front(kv, ["default:extract:h4"])
+        assert await handle_cache(kv, "h4", "p", cache_type="extract") is None
+
+    def test_lru_eviction_and_ttl(self, monkeypatch):
+        front = LLMCacheFront(max_entries=2, ttl=10)
+        front.put("a", {"return": "1", "create_time": 0})
+        front.put("b", {"return": "2", "create_time": 0})
+        front.lookup("a")
+        front.put("c", {"return": "3", "create_time": 0})
+        assert front.lookup("b") == (False, None)
+        assert front.lookup("a")[0]
+        assert front.evictions == 1
+
+        now = time.monotonic()
+        monkeypatch.setattr("lightrag.utils.time.monotonic", lambda: now + 60)
+        assert front.lookup("a") == (False, None)
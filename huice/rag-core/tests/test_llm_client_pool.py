@@ -0,0 +1,159 @@
+"""
+Test suite for the pooled LLM/embedding client registry
+
+This test verifies:
+1. Calls with the same configuration share one client, other configurations get their own
+2. Closed clients and clients of other event loops are not handed out
+3. close_pooled_clients() closes sync and async clients and empties the registry
+4. Clients are only released once every registered owner released them
+5. Pool limits are read from the environment
+6. The shared aiohttp session is reused until it is closed
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import asyncio
+
+import pytest
+
+from lightrag.llm import client_pool
+from lightrag.llm.client_pool import (
+    acquire_pooled_clients,
+    close_pooled_clients,
+    freeze_client_key,
+    get_aiohttp_session,
+    get_pooled_client,
+    hash_secret,
+    httpx_client_kwargs,
+    release_pooled_clients,
+)
+
+
+class FakeClient:
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+class SyncClient:
+    def __init__(self):
+        self.close_calls = 0
+
+    def close(self):
+        self.close_calls += 1
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    client_pool._pooled_clients.clear()
+    client_pool._pool_owners.clear()
+    yield
+    client_pool._pooled_clients.clear()
+    client_pool._pool_owners.clear()
+
+
+@pytest.mark.offline
+class TestClientPool:
+    async def test_same_config_shares_client(self):
+        created = []
+
+        def factory():
+            created.append(FakeClient())
+            return created[-1]
+
+        key = freeze_client_key({"base_url": "http://a", "configs": {"x": [1, 2]}})
+        same = freeze_client_key({"configs": {"x": [1, 2]}, "base_url": "http://a"})
+        other = freeze_client_key({"base_url": "http://b", "configs": {"x": [1, 2]}})
+
+        first = get_pooled_client("openai", key, factory)
+        assert get_pooled_client("openai", same, factory) is first
+        assert get_pooled_client("openai", other, factory) is not first
+        assert get_pooled_client("ollama", key, factory) is not first
+        assert len(created) == 3
+
+    async def test_closed_client_is_replaced(self):
+        first = get_pooled_client("openai", "k", FakeClient)
+        await first.aclose()
+        assert get_pooled_client("openai", "k", FakeClient) is not first
+
+    def test_clients_are_bound_to_their_event_loop(self):
+        async def fetch():
+            return get_pooled_client("openai", "k", FakeClient)
+
+        first = asyncio.run(fetch())
+        second = asyncio.run(fetch())
+        assert first is not second
+        # The client of the finished loop was dropped from the registry
+        assert len(client_pool._pooled_clients) == 1
+
+    async def test_close_pooled_clients(self):
+        async_client = get_pooled_client("openai", "k", FakeClient)
+        sync_client = get_pooled_client("zhipu", "k", SyncClient, loop_bound=False)
+        custom = get_pooled_client(
+            "ollama", "k", SyncClient, close=lambda c: setattr(c, "close_calls", 9)
+        )
+
+        assert await close_pooled_clients() == 3
+        assert async_client.closed
+        assert sync_client.close_calls == 1
+        assert custom.close_calls == 9
+        assert client_pool._pooled_clients == {}
+        assert get_pooled_client("openai", "k", FakeClient) is not async_client
+
+    async def test_release_waits_for_other_owners(self):
+        class Owner:
+            pass
+
+        first, second, collected = Owner(), Owner(), Owner()
+        acquire_pooled_clients(first)
+        acquire_pooled_clients(second)
+        acquire_pooled_clients(collected)
+        client = get_pooled_client("openai", "k", FakeClient)
+
+        assert await release_pooled_clients(first) == 0
+        assert not client.closed
+        # Owners that are garbage collected no longer keep the clients open
+        del collected
+        assert await release_pooled_clients(second) == 1
+        assert client.closed
+
+    def test_freeze_handles_unhashable_values(self):
+        marker = object.__new__(type("Unhashable", (), {"__hash__": None}))
+        key = freeze_client_key({"http_client": marker, "tags": {"b", "a"}})
+        assert hash(key) == hash(
+            freeze_client_key({"tags": {"a", "b"}, "http_client": marker})
+        )
+        assert hash_secret("sk-123") != "sk-123"
+        assert hash_secret(None) is None
+
+    def test_pool_limits_from_env(self, monkeypatch):
+        monkeypatch.setenv("LLM_HTTP_MAX_CONNECTIONS", "7")
+        monkeypatch.setenv("LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", "3")
+        monkeypatch.setenv("LLM_HTTP_KEEPALIVE_EXPIRY", "12.5")
+        monkeypatch.setattr(client_pool, "_h2_available", lambda: False)
+
+        kwargs = httpx_client_kwargs()
+        assert kwargs["limits"].max_connections == 7
+        assert kwargs["limits"].max_keepalive_connections == 3
+        assert kwargs["limits"].keepalive_expiry == 12.5
+        assert kwargs["http2"] is False
+
+    async def test_aiohttp_session_is_shared(self, monkeypatch):
+        pytest.importorskip("aiohttp")
+        monkeypatch.setenv("LLM_HTTP_MAX_CONNECTIONS", "5")
+
+        session = get_aiohttp_session("jina")
+        assert get_aiohttp_session("jina") is session
+        assert session.connector.limit == 5
+
+        await close_pooled_clients()
+        assert session.closed
+        fresh = get_aiohttp_session("jina")
+        assert fresh is not session
+        await close_pooled_clients()
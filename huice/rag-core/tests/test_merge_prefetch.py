@@ -0,0 +1,181 @@
+"""
+Test suite for the batched reads of the merge phase
+
+This test verifies:
+1. Existing nodes, edges and chunk-tracking records are read with one batched call per merge batch
+2. Existing data from the batched reads is merged like with per-entity reads
+3. Relations sharing an entity see each other's updates
+4. A merge needing an LLM summary is rerun on its own, the rest of its batch is kept
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import asyncio
+
+import pytest
+
+from lightrag.constants import GRAPH_FIELD_SEP
+from lightrag.operate import merge_nodes_and_edges
+from lightrag.utils import make_relation_chunk_key
+
+
+class CountingKV:
+    """In-memory chunk-tracking storage recording point and batched reads"""
+
+    def __init__(self, data=None):
+        self.data = data or {}
+        self.point_reads = []
+        self.batch_reads = []
+
+    async def get_by_id(self, id):
+        self.point_reads.append(id)
+        return self.data.get(id)
+
+    async def get_by_ids(self, ids):
+        self.batch_reads.append(list(ids))
+        return [self.data.get(id) for id in ids]
+
+    async def upsert(self, data):
+        self.data.update(data)
+
+
+def entity(name, chunk_id):
+    return {
+        "entity_name": name,
+        "entity_type": "person",
+        "description": f"{name} is a pilot.",
+        "source_id": chunk_id,
+        "file_path": "a.md",
+    }
+
+
+def relation(src, tgt, chunk_id):
+    return {
+        "src_id": src,
+        "tgt_id": tgt,
+        "description": f"{src} flies with {tgt}.",
+        "keywords": "flight",
+        "source_id": chunk_id,
+        "file_path": "a.md",
+        "weight": 1.0,
+    }
+
+
+@pytest.mark.offline
+class TestMergePrefetch:
+    async def test_merge_reads_existing_data_in_batches(
+        self, shared_data, memory_graph, merge_config
+    ):
+        graph = memory_graph
+        graph.nodes["Zorblat"] = {
+            "entity_id": "Zorblat",
+            "entity_type": "person",
+            "description": "Zorblat is a captain.",
+            "source_id": "chunk-0",
+            "file_path": "old.md",
+        }
+        graph.nodes["Quixa"] = {**graph.nodes["Zorblat"], "entity_id": "Quixa"}
+        graph.edges[("Quixa", "Zorblat")] = relation("Zorblat", "Quixa", "chunk-0")
+        entity_chunks = CountingKV({"Zorblat": {"chunk_ids": ["chunk-0"], "count": 1}})
+        relation_chunks = CountingKV(
+            {
+                make_relation_chunk_key("Zorblat", "Quixa"): {
+                    "chunk_ids": ["chunk-0"],
+                    "count": 1,
+                }
+            }
+        )
+
+        chunk_results = [
+            (
+                {name: [entity(name, "chunk-1")] for name in ["Zorblat", "Marlo"]},
+                {
+                    ("Zorblat", "Quixa"): [relation("Zorblat", "Quixa", "chunk-1")],
+                    ("Marlo", "Orbix"): [relation("Marlo", "Orbix", "chunk-2")],
+                    ("Marlo", "Vendrix"): [relation("Marlo", "Vendrix", "chunk-3")],
+                },
+            )
+        ]
+        await merge_nodes_and_edges(
+            chunk_results,
+            graph,
+            None,
+            None,
+            merge_config,
+            doc_id="doc-1",
+            pipeline_status={"latest_message": "", "history_messages": []},
+            pipeline_status_lock=asyncio.Lock(),
+            entity_chunks_storage=entity_chunks,
+            relation_chunks_storage=relation_chunks,
+        )
+
+        assert graph.point_reads == []
+        assert entity_chunks.point_reads == [] and relation_chunks.point_reads == []
+        # One batch of entities, then one batch of relations with their endpoints
+        assert graph.batch_reads == [("nodes", 2), ("nodes", 5), ("edges", 3)]
+        assert [sorted(ids) for ids in entity_chunks.batch_reads] == [
+            ["Marlo", "Zorblat"],
+            ["Marlo", "Orbix", "Quixa", "Vendrix", "Zorblat"],
+        ]
+        assert [len(ids) for ids in relation_chunks.batch_reads] == [3]
+
+        zorblat = graph.nodes["Zorblat"]
+        assert zorblat["source_id"] == GRAPH_FIELD_SEP.join(["chunk-0", "chunk-1"])
+        assert "Zorblat is a captain." in zorblat["description"]
+        edge = graph.edges[("Quixa", "Zorblat")]
+        assert edge["source_id"] == GRAPH_FIELD_SEP.join(["chunk-0", "chunk-1"])
+
+        # Both relations of Marlo are tracked, the second saw the first one's update
+        assert entity_chunks.data["Marlo"]["chunk_ids"] == [
+            "chunk-1",
+            "chunk-2",
+            "chunk-3",
+        ]
+        assert graph.nodes["Marlo"]["source_id"].split(GRAPH_FIELD_SEP) == [
+            "chunk-1",
+            "chunk-2",
+            "chunk-3",
+        ]
+        assert graph.nodes["Orbix"]["entity_type"] == "UNKNOWN"
+
+    async def test_llm_summary_merges_are_deferred(
+        self, shared_data, memory_graph, merge_config
+    ):
+        graph = memory_graph
+        prompts = []
+
+        async def summarize(prompt, **kwargs):
+            prompts.append(prompt)
+            return "Marlo is a veteran pilot."
+
+        nodes = {name: [entity(name, "chunk-1")] for name in ["Zorblat", "Quixa"]}
+        # Enough descriptions to force an LLM summary
+        nodes["Marlo"] = [
+            {**entity("Marlo", f"chunk-{i}"), "description": f"Fact {i}."}
+            for i in range(8)
+        ]
+        await merge_nodes_and_edges(
+            [(nodes, {})],
+            graph,
+            None,
+            None,
+            {
+                **merge_config,
+                "llm_model_func": summarize,
+                "addon_params": {},
+                "summary_length_recommended": 100,
+            },
+            doc_id="doc-1",
+            pipeline_status={"latest_message": "", "history_messages": []},
+            pipeline_status_lock=asyncio.Lock(),
+        )
+
+        assert len(prompts) == 1
+        assert graph.nodes["Marlo"]["description"] == "Marlo is a veteran pilot."
+        # The batch wrote the other entities, the deferred merge wrote Marlo alone
+        assert graph.node_batches == [["Zorblat", "Quixa"]]
+        assert graph.single_writes == ["Marlo"]
@@ -0,0 +1,124 @@
+"""
+Test suite for buffered vector upserts of the merge phase
+
+This test verifies:
+1. Entity and relation payloads of a merge batch are upserted in full batches of embedding_batch_num
+2. Old relation vectors are deleted with one call before the new ones are written
+3. A failed upsert is retried with the same batch, and fails the merge once retries run out
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import asyncio
+from itertools import pairwise
+
+import pytest
+
+from lightrag.operate import merge_nodes_and_edges
+
+
+class RecordingVDB:
+    def __init__(self, failures=0):
+        self.data = {}
+        self.upserts = []
+        self.deletes = []
+        self.failures = failures
+
+    async def upsert(self, data):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("embedding endpoint unavailable")
+        self.upserts.append(sorted(data))
+        self.data.update(data)
+
+    async def delete(self, ids):
+        self.deletes.append(list(ids))
+
+
+def make_chunk_results(count):
+    names = [f"Pilot{i:02d}" for i in range(count)]
+    nodes = {
+        name: [
+            {
+                "entity_name": name,
+                "entity_type": "person",
+                "description": f"{name} is a pilot.",
+                "source_id": "chunk-1",
+                "file_path": "a.md",
+            }
+        ]
+        for name in names
+    }
+    edges = {
+        (src, tgt): [
+            {
+                "src_id": src,
+                "tgt_id": tgt,
+                "description": f"{src} flies with {tgt}.",
+                "keywords": "flight",
+                "source_id": "chunk-1",
+                "file_path": "a.md",
+                "weight": 1.0,
+            }
+        ]
+        for src, tgt in pairwise(names)
+    }
+    return [(nodes, edges)]
+
+
+async def run_merge(graph, config, entity_vdb, relationships_vdb, count=25):
+    await merge_nodes_and_edges(
+        make_chunk_results(count),
+        graph,
+        entity_vdb,
+        relationships_vdb,
+        {**config, "embedding_batch_num": 10},
+        doc_id="doc-1",
+        pipeline_status={"latest_message": "", "history_messages": []},
+        pipeline_status_lock=asyncio.Lock(),
+    )
+
+
+@pytest.mark.offline
+class TestMergeVectorBuffer:
+    async def test_merge_upserts_in_embedding_batches(
+        self, shared_data, memory_graph, merge_config
+    ):
+        entity_vdb = RecordingVDB()
+        relationships_vdb = RecordingVDB()
+        await run_merge(memory_graph, merge_config, entity_vdb, relationships_vdb)
+
+        assert sorted(len(batch) for batch in entity_vdb.upserts) == [5, 10, 10]
+        assert len(entity_vdb.data) == 25
+        assert sorted(len(batch) for batch in relationships_vdb.upserts) == [4, 10, 10]
+        assert len(relationships_vdb.data) == 24
+        # Both directions of each relation are deleted in one call
+        assert [len(ids) for ids in relationships_vdb.deletes] == [48]
+        assert entity_vdb.deletes == []
+
+    async def test_failed_upsert_is_retried(
+        self, shared_data, memory_graph, merge_config
+    ):
+        entity_vdb = RecordingVDB(failures=1)
+        relationships_vdb = RecordingVDB(failures=1)
+        await run_merge(
+            memory_graph, merge_config, entity_vdb, relationships_vdb, count=10
+        )
+
+        assert [len(batch) for batch in entity_vdb.upserts] == [10]
+        assert len(entity_vdb.data) == 10
+        assert [len(batch) for batch in relationships_vdb.upserts] == [9]
+        assert len(relationships_vdb.data) == 9
+
+    async def test_upsert_failing_after_retries_fails_the_merge(
+        self, shared_data, memory_graph, merge_config
+    ):
+        entity_vdb = RecordingVDB(failures=3)
+        with pytest.raises(Exception, match="entity_upsert failed"):
+            await run_merge(memory_graph, merge_config, entity_vdb, None, count=10)
+
+        assert entity_vdb.upserts == []
@@ -0,0 +1,122 @@
+"""
+Test suite for NanoVectorDBStorage
+
+This test verifies:
+1. The entity → relation ID index tracks upserts and deletes
+2. delete_entity_relation removes only relations touching the entity
+3. The index is rebuilt when the storage is reloaded from disk
+4. Vectors come back as one matrix and drive vector-similarity chunk selection
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from lightrag.kg.nano_vector_db_impl import NanoVectorDBStorage
+from lightrag.kg.shared_storage import initialize_share_data
+from lightrag.utils import EmbeddingFunc, cosine_similarity, pick_by_vector_similarity
+
+DIM = 8
+
+
+async def _mock_embedding(texts: list[str], **kwargs) -> np.ndarray:
+    return np.random.rand(len(texts), DIM).astype(np.float32)
+
+
+@pytest.fixture
+def working_dir():
+    path = tempfile.mkdtemp(prefix="nano_vdb_test_")
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+async def _make_storage(working_dir: str) -> NanoVectorDBStorage:
+    initialize_share_data()
+    storage = NanoVectorDBStorage(
+        namespace="relationships",
+        workspace="",
+        global_config={
+            "working_dir": working_dir,
+            "embedding_batch_num": 4,
+            "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": 0.2},
+        },
+        embedding_func=EmbeddingFunc(embedding_dim=DIM, func=_mock_embedding),
+        meta_fields={"src_id", "tgt_id", "content"},
+    )
+    await storage.initialize()
+    return storage
+
+
+@pytest.mark.offline
+class TestNanoVectorDBStorage:
+    async def test_delete_entity_relation_uses_index(self, working_dir):
+        storage = await _make_storage(working_dir)
+        await storage.upsert(
+            {
+                "rel-1": {"content": "x", "src_id": "A", "tgt_id": "B"},
+                "rel-2": {"content": "y", "src_id": "B", "tgt_id": "C"},
+                "rel-3": {"content": "z", "src_id": "C", "tgt_id": "D"},
+            }
+        )
+        await storage.delete_entity_relation("B")
+
+        assert await storage.get_by_id("rel-1") is None
+        assert await storage.get_by_id("rel-2") is None
+        assert await storage.get_by_id("rel-3") is not None
+        assert storage._entity_relation_index == {"C": {"rel-3"}, "D": {"rel-3"}}
+
+    async def test_index_survives_reload(self, working_dir):
+        storage = await _make_storage(working_dir)
+        await storage.upsert(
+            {
+                "rel-1": {"content": "x", "src_id": "A", "tgt_id": "B"},
+                "rel-2": {"content": "y", "src_id": "A", "tgt_id": "C"},
+            }
+        )
+        await storage.delete(["rel-2"])
+        assert await storage.index_done_callback()
+
+        reloaded = await _make_storage(working_dir)
+        assert reloaded._entity_relation_index == {"A": {"rel-1"}, "B": {"rel-1"}}
+
+    async def test_vector_matrix_matches_vector_dict(self, working_dir):
+        storage = await _make_storage(working_dir)
+        await storage.upsert({f"rel-{i}": {"content": f"text {i}"} for i in range(6)})
+
+        ids = ["rel-4", "missing", "rel-1", "rel-4"]
+        found_ids, matrix = await storage.get_vector_matrix_by_ids(ids)
+        vectors = await storage.get_vectors_by_ids(ids)
+
+        assert sorted(found_ids) == ["rel-1", "rel-4"]
+        assert matrix.dtype == np.float32 and matrix.shape == (2, DIM)
+        for row, chunk_id in zip(matrix, found_ids):
+            np.testing.assert_array_equal(row, np.asarray(vectors[chunk_id]))
+
+    async def test_pick_by_vector_similarity_matches_pairwise_scores(self, working_dir):
+        storage = await _make_storage(working_dir)
+        await storage.upsert({f"rel-{i}": {"content": f"text {i}"} for i in range(20)})
+        query_embedding = np.random.rand(DIM).astype(np.float32)
+        entity_info = [
+            {"sorted_chunks": [f"rel-{i}" for i in range(0, 12)]},
+            {"sorted_chunks": [f"rel-{i}" for i in range(8, 20)]},
+        ]
+
+        vectors = await storage.get_vectors_by_ids([f"rel-{i}" for i in range(20)])
+        expected = sorted(
+            vectors,
+            key=lambda cid: cosine_similarity(query_embedding, vectors[cid]),
+            reverse=True,
+        )
+        for num_of_chunks in (1, 5, 20, 50):
+            selected = await pick_by_vector_similarity(
+                "q", None, storage, num_of_chunks, entity_info, None, query_embedding
+            )
+            assert selected == expected[:num_of_chunks]
@@ -0,0 +1,296 @@
+"""
+Test suite for NetworkXStorage persistence
+
+This test verifies:
+1. The binary snapshot round-trips node IDs, edges and typed attributes
+2. GraphML stays the default format; existing files are migrated when binary is opted into
+3. GraphML can still be exported alongside the binary snapshot
+4. Peers apply published node/edge deltas instead of reloading the graph file
+5. The delta log stays bounded: a full log forces a save, and single-process mode
+   records no deltas
+6. The label index answers label search and popular labels like a full scan
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import os
+import shutil
+import tempfile
+
+import networkx as nx
+import pytest
+
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import (
+    finalize_share_data,
+    get_namespace_deltas,
+    get_namespace_snapshot_position,
+    initialize_share_data,
+)
+
+
+@pytest.fixture
+def working_dir():
+    path = tempfile.mkdtemp(prefix="networkx_test_")
+    # Shared delta logs are keyed by namespace, so start every test from scratch
+    finalize_share_data()
+    initialize_share_data()
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+def multiprocess_dir(working_dir):
+    # Deltas are only recorded when other worker processes may replay them
+    finalize_share_data()
+    initialize_share_data(workers=2)
+    yield working_dir
+    finalize_share_data()
+
+
+async def _make_storage(working_dir: str) -> NetworkXStorage:
+    storage = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config={"working_dir": working_dir},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+def _sample_graph() -> nx.Graph:
+    graph = nx.Graph()
+    graph.add_node(
+        "Alice", entity_type="person", description="Ünïcode 描述", created_at=17
+    )
+    graph.add_node("Bob", entity_type="person", weight=0.5, flag=True)
+    graph.add_node("Lonely")
+    graph.add_edge("Alice", "Bob", weight=2.0, keywords="friend", rank=3)
+    graph.add_edge("Bob", "Bob", weight=1, extra=[1, "two"])
+    return graph
+
+
+@pytest.mark.offline
+class TestNetworkXBinaryFormat:
+    def test_binary_roundtrip(self, working_dir):
+        graph = _sample_graph()
+        file_name = os.path.join(working_dir, "graph.npz")
+        NetworkXStorage.write_nx_graph_binary(graph, file_name)
+        loaded = NetworkXStorage.load_nx_graph_binary(file_name)
+
+        assert list(loaded.nodes(data=True)) == list(graph.nodes(data=True))
+        assert {frozenset((u, v)): d for u, v, d in loaded.edges(data=True)} == {
+            frozenset((u, v)): d for u, v, d in graph.edges(data=True)
+        }
+        assert type(loaded.nodes["Alice"]["created_at"]) is int
+        # Mixed int/float columns are widened to float, like GraphML typing
+        assert type(loaded.edges["Bob", "Bob"]["weight"]) is float
+
+    def test_empty_graph_roundtrip(self, working_dir):
+        file_name = os.path.join(working_dir, "graph.npz")
+        NetworkXStorage.write_nx_graph_binary(nx.Graph(), file_name)
+        loaded = NetworkXStorage.load_nx_graph_binary(file_name)
+        assert loaded.number_of_nodes() == 0
+
+    async def test_graphml_is_default(self, working_dir, monkeypatch):
+        monkeypatch.delenv("NETWORKX_GRAPH_FORMAT", raising=False)
+        storage = await _make_storage(working_dir)
+        await storage.upsert_edge("A", "B", {"weight": 1.0})
+        assert await storage.index_done_callback()
+
+        assert nx.read_graphml(storage._graphml_xml_file).has_edge("A", "B")
+        assert not os.path.exists(storage._binary_graph_file)
+
+    async def test_graphml_migrated_on_save(self, working_dir, monkeypatch):
+        monkeypatch.setenv("NETWORKX_GRAPH_FORMAT", "binary")
+        monkeypatch.delenv("NETWORKX_GRAPHML_EXPORT", raising=False)
+        graphml_file = os.path.join(working_dir, "graph_chunk_entity_relation.graphml")
+        nx.write_graphml(_sample_graph().subgraph(["Alice", "Lonely"]), graphml_file)
+
+        storage = await _make_storage(working_dir)
+        assert await storage.has_node("Alice")
+        await storage.upsert_node("Carol", {"entity_type": "person"})
+        assert await storage.index_done_callback()
+
+        assert os.path.exists(storage._binary_graph_file)
+        assert not os.path.exists(graphml_file)
+        assert os.path.exists(graphml_file + ".bak")
+
+        reloaded = await _make_storage(working_dir)
+        assert await reloaded.has_node("Alice")
+        assert await reloaded.has_node("Carol")
+
+    async def test_graphml_export(self, working_dir, monkeypatch):
+        monkeypatch.setenv("NETWORKX_GRAPH_FORMAT", "binary")
+        monkeypatch.setenv("NETWORKX_GRAPHML_EXPORT", "true")
+        storage = await _make_storage(working_dir)
+        await storage.upsert_edge("A", "B", {"weight": 1.0})
+        assert await storage.index_done_callback()
+
+        exported = nx.read_graphml(storage._graphml_xml_file)
+        assert exported.has_edge("A", "B")
+        assert os.path.exists(storage._binary_graph_file)
+
+
+@pytest.mark.offline
+class TestNetworkXDeltaSync:
+    async def test_peer_applies_deltas_without_reload(
+        self, multiprocess_dir, monkeypatch
+    ):
+        writer = await _make_storage(multiprocess_dir)
+        reader = await _make_storage(multiprocess_dir)
+        await writer.upsert_node("A", {"entity_type": "person"})
+        await writer.upsert_edge("A", "B", {"weight": 1.0})
+        assert await writer.index_done_callback()
+
+        def fail_reload():
+            raise AssertionError("peer should not reload the graph file")
+
+        monkeypatch.setattr(reader, "_load_graph", fail_reload)
+        assert await reader.get_node("A") == {"entity_type": "person"}
+        assert await reader.has_edge("A", "B")
+
+        await writer.remove_edges([("A", "B")])
+        await writer.delete_node("B")
+        assert not await reader.has_edge("A", "B")
+        assert not await reader.has_node("B")
+        assert not reader.storage_updated.value
+
+    async def test_both_peers_changes_survive_save(self, multiprocess_dir):
+        first = await _make_storage(multiprocess_dir)
+        second = await _make_storage(multiprocess_dir)
+        await first.upsert_node("A", {"entity_type": "x"})
+        await second.upsert_node("B", {"entity_type": "y"})
+        assert await second.index_done_callback()
+        assert await first.index_done_callback()
+
+        graph = first._load_graph()
+        assert set(graph.nodes()) == {"A", "B"}
+
+    async def test_peer_behind_window_reloads(self, multiprocess_dir, monkeypatch):
+        monkeypatch.setenv("NETWORKX_SYNC_MAX_DELTAS", "2")
+        writer = await _make_storage(multiprocess_dir)
+        reader = await _make_storage(multiprocess_dir)
+        for i in range(5):
+            await writer.upsert_node(f"N{i}", {"entity_type": "x"})
+        assert await writer.index_done_callback()
+        await writer.upsert_node("N5", {"entity_type": "x"})
+
+        reloads = []
+        original_load = reader._load_graph
+        monkeypatch.setattr(
+            reader, "_load_graph", lambda: reloads.append(1) or original_load()
+        )
+        assert sorted(await reader.get_all_labels()) == [f"N{i}" for i in range(6)]
+        assert reloads == [1]
+
+    async def test_drop_propagates_to_peer(self, multiprocess_dir):
+        writer = await _make_storage(multiprocess_dir)
+        reader = await _make_storage(multiprocess_dir)
+        await writer.upsert_node("A", {"entity_type": "x"})
+        assert await reader.has_node("A")
+
+        await writer.drop()
+        assert not await reader.has_node("A")
+        await reader.upsert_node("C", {"entity_type": "x"})
+        assert await writer.has_node("C")
+
+    async def test_full_log_forces_snapshot(self, multiprocess_dir, monkeypatch):
+        monkeypatch.setenv("NETWORKX_SYNC_MAX_DELTAS", "2")
+        writer = await _make_storage(multiprocess_dir)
+        for i in range(5):
+            await writer.upsert_node(f"N{i}", {"entity_type": "x"})
+
+        # Saved without index_done_callback, so old deltas could be trimmed
+        epoch, snapshot_seq = await get_namespace_snapshot_position(
+            writer.namespace, workspace=""
+        )
+        assert snapshot_seq >= 3
+        assert await get_namespace_deltas(writer.namespace, 0, epoch, "") is None
+        assert set(writer._load_graph().nodes()) >= {"N0", "N1", "N2"}
+
+    async def test_single_process_records_no_deltas(self, working_dir):
+        writer = await _make_storage(working_dir)
+        reader = await _make_storage(working_dir)
+        assert await reader.get_all_labels() == []
+        await writer.upsert_node("A", {"entity_type": "x"})
+        await writer.upsert_node("B", {"entity_type": "x"})
+        assert await get_namespace_deltas(writer.namespace, 0, 0, "") == (0, [])
+        assert not await reader.has_node("A")
+
+        # The saved graph reaches other instances in this process
+        assert await writer.index_done_callback()
+        assert sorted(await reader.get_all_labels()) == ["A", "B"]
+        assert await writer.has_node("B")
+
+
+def _scan_search(graph: nx.Graph, query: str, limit: int) -> list[str]:
+    """Reference implementation: score every node label"""
+    query_lower = query.lower().strip()
+    matches = []
+    for node in graph.nodes():
+        node_lower = str(node).lower()
+        if query_lower not in node_lower:
+            continue
+        if node_lower == query_lower:
+            score = 1000
+        elif node_lower.startswith(query_lower):
+            score = 500
+        else:
+            score = 100 - len(str(node))
+            if f" {query_lower}" in node_lower or f"_{query_lower}" in node_lower:
+                score += 50
+        matches.append((str(node), score))
+    matches.sort(key=lambda x: (-x[1], x[0]))
+    return [label for label, _ in matches[:limit]]
+
+
+@pytest.mark.offline
+class TestNetworkXLabelIndex:
+    async def test_search_matches_full_scan(self, working_dir):
+        storage = await _make_storage(working_dir)
+        labels = ["Apple", "apple pie", "Pineapple", "Big_Apple", "Ap", "Banana", "a"]
+        for label in labels:
+            await storage.upsert_node(label, {"entity_type": "fruit"})
+        await storage.delete_node("Banana")
+
+        graph = await storage._get_graph()
+        for query in ["apple", "APP", "ap", "a", "p", "pie", "nana", "xyz"]:
+            for limit in (1, 3, 50):
+                assert await storage.search_labels(query, limit) == _scan_search(
+                    graph, query, limit
+                ), (query, limit)
+
+    async def test_popular_labels_follow_degree_changes(self, working_dir):
+        storage = await _make_storage(working_dir)
+        await storage.upsert_edge("Hub", "A", {"weight": 1.0})
+        await storage.upsert_edge("Hub", "B", {"weight": 1.0})
+        await storage.upsert_edge("Hub", "C", {"weight": 1.0})
+        await storage.upsert_edge("A", "B", {"weight": 1.0})
+        assert (await storage.get_popular_labels(2))[0] == "Hub"
+
+        await storage.delete_node("Hub")
+        popular = await storage.get_popular_labels(10)
+        assert "Hub" not in popular
+        assert set(popular[:2]) == {"A", "B"}
+        assert len(popular) == len(set(popular)) == 3
+
+        await storage.remove_edges([("A", "B")])
+        await storage.upsert_edge("C", "D", {"weight": 1.0})
+        assert await storage.get_popular_labels(1) == ["C"]
+
+    async def test_index_rebuilt_on_reload(self, working_dir):
+        storage = await _make_storage(working_dir)
+        await storage.upsert_edge("Alpha", "Beta", {"weight": 1.0})
+        assert await storage.index_done_callback()
+
+        reloaded = await _make_storage(working_dir)
+        assert await reloaded.search_labels("alp") == ["Alpha"]
+        await reloaded.drop()
+        assert await reloaded.search_labels("alp") == []
+        assert await reloaded.get_popular_labels() == []
@@ -0,0 +1,172 @@
+"""
+Test suite for packed entity extraction
+
+This test verifies:
+1. Small chunks are packed into one extraction call and split back per chunk
+2. The split results are cached per chunk, so re-extraction needs no LLM call
+3. Cached per-chunk results are found by the rebuild lookup
+4. Chunks missing from the packed output are extracted on their own
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import re
+import time
+
+import pytest
+
+from lightrag.operate import (
+    _get_cached_extraction_results,
+    _split_packed_extraction_result,
+    extract_entities,
+)
+
+NAMES = ["Alice", "Bob", "Carol"]
+
+
+class MemoryKV:
+    """Minimal KV storage for the LLM cache and text chunks"""
+
+    def __init__(self, data=None):
+        self.global_config = {
+            "enable_llm_cache": True,
+            "enable_llm_cache_for_entity_extract": True,
+        }
+        self.data = dict(data or {})
+
+    async def get_by_id(self, key):
+        return self.data.get(key)
+
+    async def get_by_ids(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def upsert(self, data):
+        for key, value in data.items():
+            # Stamped in whole seconds like the real storages
+            self.data[key] = {**value, "create_time": int(time.time())}
+
+
+class FakeExtractor:
+    """Extracts every known name of a text as an entity, section by section"""
+
+    def __init__(self, skip_sections=()):
+        self.calls = []
+        self.skip_sections = set(skip_sections)
+
+    async def __call__(self, prompt, system_prompt=None, history_messages=None):
+        self.calls.append(prompt)
+        if history_messages:
+            return "<|COMPLETE|>"
+        text = prompt.split("Text:\n```\n", 1)[1]
+        sections = re.split(r"<\|CHUNK_(\d+)\|>", text)
+        if len(sections) == 1:
+            return self._records(text) + "\n<|COMPLETE|>"
+        output = []
+        for index, section in zip(sections[1::2], sections[2::2]):
+            if int(index) not in self.skip_sections:
+                output.append(f"<|CHUNK_{index}|>\n{self._records(section)}")
+        return "\n".join(output) + "\n<|COMPLETE|>"
+
+    @staticmethod
+    def _records(text):
+        return "\n".join(
+            f"entity<|#|>{name}<|#|>person<|#|>{name} is a person."
+            for name in NAMES
+            if name in text
+        )
+
+
+def make_chunks():
+    return {
+        f"chunk-{i}": {
+            "tokens": 5,
+            "content": f"{name} works here.",
+            "full_doc_id": "doc-1",
+            "chunk_order_index": i,
+            "file_path": "faq.md",
+        }
+        for i, name in enumerate(NAMES)
+    }
+
+
+def make_config(llm, pack_tokens=100):
+    return {
+        "llm_model_func": llm,
+        "entity_extract_max_gleaning": 1,
+        "addon_params": {},
+        "entity_extract_pack_tokens": pack_tokens,
+        "entity_extract_pack_max_chunks": 8,
+        "llm_model_max_async": 4,
+    }
+
+
+def entities_by_chunk(results):
+    return {nodes[name][0]["source_id"]: name for nodes, _ in results for name in nodes}
+
+
+@pytest.mark.offline
+class TestPackedExtraction:
+    def test_split_packed_result(self):
+        result = (
+            "noise\n<|CHUNK_1|>\nentity<|#|>A<|#|>x<|#|>d\n"
+            "<|chunk_3|>\n<|CHUNK_2|>\nentity<|#|>B<|#|>x<|#|>d\n<|COMPLETE|>"
+        )
+        sections = _split_packed_extraction_result(result, ["c1", "c2", "c3", "c4"])
+        assert sections == {
+            "c1": "entity<|#|>A<|#|>x<|#|>d\n<|COMPLETE|>",
+            "c2": "entity<|#|>B<|#|>x<|#|>d\n<|COMPLETE|>",
+            "c3": "<|COMPLETE|>",
+        }
+
+    async def test_chunks_packed_and_cached_per_chunk(self):
+        llm = FakeExtractor()
+        chunks = make_chunks()
+        cache = MemoryKV()
+        text_chunks = MemoryKV(chunks)
+
+        results = await extract_entities(
+            chunks,
+            make_config(llm),
+            llm_response_cache=cache,
+            text_chunks_storage=text_chunks,
+        )
+        # One packed extraction call plus one packed gleaning call
+        assert len(llm.calls) == 2
+        assert entities_by_chunk(results) == {
+            "chunk-0": "Alice",
+            "chunk-1": "Bob",
+            "chunk-2": "Carol",
+        }
+        assert {entry["chunk_id"] for entry in cache.data.values()} == set(chunks)
+        assert all(len(text_chunks.data[key]["llm_cache_list"]) == 2 for key in chunks)
+
+        cached = await _get_cached_extraction_results(cache, set(chunks), text_chunks)
+        assert "Bob" in cached["chunk-1"][0][0]
+        # The gleaning section is saved strictly after the extraction section
+        assert cached["chunk-1"][0][1] < cached["chunk-1"][1][1]
+
+        # Extracting again, packed or not, is served from the per-chunk cache
+        for pack_tokens in (100, 0):
+            rerun = FakeExtractor()
+            results = await extract_entities(
+                chunks, make_config(rerun, pack_tokens), llm_response_cache=cache
+            )
+            assert rerun.calls == []
+            assert len(entities_by_chunk(results)) == 3
+
+    async def test_pack_limits_and_missing_sections(self):
+        llm = FakeExtractor(skip_sections={2})
+        results = await extract_entities(make_chunks(), make_config(llm))
+        # Packed calls for all chunks, then the missing one on its own
+        assert len(llm.calls) == 4
+        assert entities_by_chunk(results)["chunk-1"] == "Bob"
+
+        llm = FakeExtractor()
+        await extract_entities(make_chunks(), make_config(llm, pack_tokens=10))
+        # Two chunks fit into 10 tokens, the third is extracted on its own
+        assert len(llm.calls) == 4
+        assert sum("2 independent sections" in call for call in llm.calls) == 1
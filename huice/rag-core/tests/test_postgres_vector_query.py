@@ -0,0 +1,74 @@
+"""
+Test suite for PostgreSQL vector queries with bound parameters
+
+This test verifies:
+1. PGVectorStorage.query sends the embedding as a bound parameter, not SQL text
+2. The SQL text is identical across queries, so its prepared statement is reused
+3. VCHORDRQ session settings are applied in a single round-trip
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import numpy as np
+import pytest
+
+from lightrag.kg.postgres_impl import PGVectorStorage, PostgreSQLDB
+from lightrag.namespace import NameSpace
+
+
+class RecordingDB:
+    workspace = "test"
+
+    def __init__(self):
+        self.queries = []
+
+    async def query(self, sql, params=None, multirows=False):
+        self.queries.append((sql, params))
+        return []
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, sql):
+        self.statements.append(sql)
+
+
+@pytest.mark.offline
+class TestPostgresVectorQuery:
+    async def test_embedding_is_bound_parameter(self):
+        db = RecordingDB()
+        storage = PGVectorStorage(
+            namespace=NameSpace.VECTOR_STORE_CHUNKS,
+            workspace="test",
+            global_config={
+                "embedding_batch_num": 10,
+                "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": 0.2},
+            },
+            embedding_func=None,
+            db=db,
+        )
+        await storage.query("q1", top_k=5, query_embedding=[0.125, 0.5])
+        await storage.query("q2", top_k=5, query_embedding=[0.75, 0.25])
+
+        (sql1, params1), (sql2, params2) = db.queries
+        assert sql1 == sql2
+        assert "0.125" not in sql1 and "$4::vector" in sql1
+        assert params1[:3] == ["test", pytest.approx(0.8), 5]
+        assert isinstance(params1[3], np.ndarray)
+        assert params2[3].tolist() == [0.75, 0.25]
+
+    async def test_vchordrq_settings_in_one_round_trip(self):
+        db = PostgreSQLDB.__new__(PostgreSQLDB)
+        db.vchordrq_probes = "10"
+        db.vchordrq_epsilon = 1.9
+        connection = RecordingConnection()
+        await db.configure_vchordrq(connection)
+        assert connection.statements == [
+            "SET vchordrq.probes TO '10'; SET vchordrq.epsilon TO 1.9"
+        ]
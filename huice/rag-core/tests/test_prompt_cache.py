@@ -0,0 +1,155 @@
+"""
+Test suite for prompt-prefix caching support
+
+This test verifies:
+1. Extraction calls share one static system prompt, the chunk text is sent last
+2. RAG response prompts keep per-query settings after the static instructions
+3. Cacheable message segments are marked with cache_control without mutating input,
+   query prompts only up to their per-query context
+4. Cached prompt tokens of OpenAI and Anthropic usage are reported to TokenTracker
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+from types import SimpleNamespace
+
+import pytest
+
+from lightrag.llm.prompt_cache import (
+    cacheable_system_blocks,
+    cached_token_counts,
+    mark_cacheable_messages,
+)
+from lightrag.operate import extract_entities
+from lightrag.prompt import PROMPTS
+from lightrag.utils import TokenTracker
+
+
+@pytest.mark.offline
+class TestStaticPromptPrefix:
+    async def test_extraction_system_prompt_is_static(self):
+        calls = []
+
+        async def llm(prompt, system_prompt=None, history_messages=None):
+            calls.append((prompt, system_prompt))
+            return "<|COMPLETE|>"
+
+        chunks = {
+            f"chunk-{i}": {"tokens": 3, "content": text, "chunk_order_index": i}
+            for i, text in enumerate(
+                ["Zorblat met Quixa.", "Vendrix lives in Plutonia."]
+            )
+        }
+        config = {
+            "llm_model_func": llm,
+            "entity_extract_max_gleaning": 1,
+            "addon_params": {},
+            "llm_model_max_async": 2,
+        }
+        await extract_entities(chunks, config)
+
+        assert len(calls) == 4
+        assert len({system_prompt for _, system_prompt in calls}) == 1
+        system_prompt = calls[0][1]
+        assert "Zorblat" not in system_prompt and "Plutonia" not in system_prompt
+        user_prompts = [prompt for prompt, _ in calls]
+        assert sum("Zorblat met Quixa." in prompt for prompt in user_prompts) == 1
+
+    def test_rag_response_settings_follow_context(self):
+        prompts = [
+            PROMPTS["rag_response"].format(
+                response_type=response_type,
+                user_prompt=user_prompt,
+                context_data="CONTEXT",
+            )
+            for response_type, user_prompt in [
+                ("Bullet Points", "n/a"),
+                ("Single Paragraph", "Be brief"),
+            ]
+        ]
+        static_prefix = prompts[0].split("CONTEXT")[0]
+        assert prompts[1].startswith(static_prefix)
+        assert "Single Paragraph" in prompts[1].split("CONTEXT")[1]
+
+
+@pytest.mark.offline
+class TestPromptCacheHelpers:
+    def test_mark_cacheable_messages(self):
+        messages = [
+            {"role": "system", "content": "static"},
+            {"role": "user", "content": "first"},
+            {"role": "assistant", "content": "answer"},
+            {"role": "user", "content": "follow up"},
+        ]
+        marked = mark_cacheable_messages(messages)
+        assert marked[0]["content"] == [
+            {"type": "text", "text": "static", "cache_control": {"type": "ephemeral"}}
+        ]
+        assert marked[2]["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert marked[1] == messages[1] and marked[3] == messages[3]
+        assert messages[0]["content"] == "static"
+
+        single = mark_cacheable_messages([{"role": "user", "content": "q"}])
+        assert single == [{"role": "user", "content": "q"}]
+
+    def test_query_context_is_not_cached(self):
+        system_prompts = [
+            PROMPTS["rag_response"].format(
+                response_type="Multiple Paragraphs",
+                user_prompt="n/a",
+                context_data=f"CONTEXT {i}",
+            )
+            for i in range(2)
+        ]
+        blocks = [cacheable_system_blocks(prompt) for prompt in system_prompts]
+        # The cached prefix is identical across queries and holds no query data
+        assert blocks[0][0] == blocks[1][0]
+        assert blocks[0][0]["cache_control"] == {"type": "ephemeral"}
+        assert "CONTEXT" not in blocks[0][0]["text"]
+        assert "cache_control" not in blocks[0][1]
+        assert "".join(block["text"] for block in blocks[1]) == system_prompts[1]
+
+        marked = mark_cacheable_messages(
+            [
+                {"role": "system", "content": system_prompts[0]},
+                {"role": "user", "content": "q"},
+            ]
+        )
+        assert marked[0]["content"] == blocks[0]
+
+        # Prompts without a context section are static and cached as a whole
+        assert cacheable_system_blocks("static") == [
+            {"type": "text", "text": "static", "cache_control": {"type": "ephemeral"}}
+        ]
+
+    def test_cached_token_counts_reported(self):
+        openai_usage = SimpleNamespace(
+            prompt_tokens=2000,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=1536),
+        )
+        anthropic_usage = SimpleNamespace(
+            input_tokens=50,
+            cache_read_input_tokens=1800,
+            cache_creation_input_tokens=0,
+        )
+        assert cached_token_counts(openai_usage) == {
+            "cached_tokens": 1536,
+            "cache_creation_tokens": 0,
+        }
+        assert cached_token_counts(anthropic_usage)["cached_tokens"] == 1800
+        assert cached_token_counts(SimpleNamespace(prompt_tokens=5)) == {
+            "cached_tokens": 0,
+            "cache_creation_tokens": 0,
+        }
+
+        tracker = TokenTracker()
+        tracker.add_usage({"prompt_tokens": 2000, **cached_token_counts(openai_usage)})
+        tracker.add_usage({"prompt_tokens": 10, "cache_creation_tokens": 1024})
+        usage = tracker.get_usage()
+        assert usage["cached_tokens"] == 1536
+        assert usage["cache_creation_tokens"] == 1024
+        assert "cached: 1536" in str(tracker)
@@ -0,0 +1,163 @@
+"""
+Test suite for the adaptive LLM rate limiter
+
+This test verifies:
+1. Token buckets hand out their capacity and then pace callers by the refill rate
+2. A 429 response halves concurrency and pauses new calls, successes grow it back
+3. Prompt tokens are estimated with the Tokenizer for TPM budgets
+4. priority_limit_async_func_call paces calls by TPM and exposes queue metrics
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import asyncio
+import time
+
+import pytest
+
+from lightrag.utils import (
+    AdaptiveRateLimiter,
+    TokenBucket,
+    is_rate_limit_error,
+    priority_limit_async_func_call,
+)
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+@pytest.mark.offline
+class TestTokenBucket:
+    def test_capacity_then_refill_rate(self):
+        bucket = TokenBucket(120, period=60)
+        assert bucket.reserve(100) == 0.0
+        assert bucket.reserve(20) == 0.0
+        # Two more units are covered after one second at 2 units/s
+        assert bucket.reserve(2) == pytest.approx(1.0, abs=0.05)
+        assert bucket.reserve(2) == pytest.approx(2.0, abs=0.05)
+
+
+@pytest.mark.offline
+class TestAdaptiveRateLimiter:
+    def test_rate_limit_error_detection(self):
+        assert is_rate_limit_error(RateLimitError())
+        assert not is_rate_limit_error(ValueError())
+
+        class FakeAttempt:
+            failed = True
+
+            def exception(self):
+                return RateLimitError()
+
+        wrapped = Exception("retries exhausted")
+        wrapped.last_attempt = FakeAttempt()
+        assert is_rate_limit_error(wrapped)
+
+    async def test_429_halves_concurrency_and_cools_down(self):
+        limiter = AdaptiveRateLimiter(8, cooldown=0.2)
+        await limiter.acquire((), {})
+        await limiter.release(0.1, RateLimitError())
+        assert limiter.concurrency_limit == 4
+        assert limiter.stats()["rate_limited"] == 1
+
+        start = time.monotonic()
+        await limiter.acquire((), {})
+        assert time.monotonic() - start >= 0.15
+        await limiter.release(0.1)
+
+        for _ in range(40):
+            await limiter.acquire((), {})
+            await limiter.release(0.1)
+        assert limiter.concurrency_limit == 8
+
+    async def test_high_latency_shrinks_concurrency(self):
+        limiter = AdaptiveRateLimiter(10, latency_target=1.0)
+        for _ in range(5):
+            await limiter.acquire((), {})
+            await limiter.release(5.0)
+        assert limiter.concurrency_limit < 10
+
+        fixed = AdaptiveRateLimiter(10, adaptive=False)
+        await fixed.acquire((), {})
+        await fixed.release(0.1, RateLimitError())
+        assert fixed.concurrency_limit == 10
+
+    def test_estimate_tokens_with_tokenizer(self, char_tokenizer):
+        tokenizer = char_tokenizer
+        limiter = AdaptiveRateLimiter(1, max_tpm=1000, tokenizer=tokenizer)
+        kwargs = {
+            "system_prompt": "sys",
+            "history_messages": [{"role": "user", "content": "hi"}],
+        }
+        assert limiter.estimate_tokens(("hello",), kwargs) == 10
+        assert limiter.estimate_tokens((["ab", "cd"],), {}) == 4
+        assert AdaptiveRateLimiter(1).estimate_tokens(("x" * 40,), {}) == 11
+
+
+@pytest.mark.offline
+class TestPriorityLimitRateLimits:
+    async def test_token_budget_paces_calls(self):
+        # 600 tokens per minute refill at 10 tokens/s
+        @priority_limit_async_func_call(4, max_rpm=600, max_tpm=600, queue_name="test")
+        async def call(prompt):
+            return prompt
+
+        try:
+            assert await call("x" * 2400) == "x" * 2400
+            start = time.monotonic()
+            assert await call("abcd") == "abcd"
+            # The budget is exhausted, so 2 tokens take ~0.2s to become available
+            assert time.monotonic() - start >= 0.15
+
+            metrics = call.metrics()
+            assert metrics["completed"] == 2
+            assert metrics["in_flight"] == 0
+            assert metrics["queue_depth"] == 0
+            assert metrics["tokens_reserved"] == 603
+            assert metrics["rpm_available"] == pytest.approx(598, abs=1)
+        finally:
+            await call.shutdown()
+
+    async def test_metrics_track_waits_and_in_flight(self):
+        release = asyncio.Event()
+
+        @priority_limit_async_func_call(1, queue_name="test")
+        async def call(prompt):
+            await release.wait()
+            return prompt
+
+        try:
+            tasks = [asyncio.create_task(call(str(i))) for i in range(3)]
+            await asyncio.sleep(0.05)
+            metrics = call.metrics()
+            assert metrics["in_flight"] == 1
+            assert metrics["pending"] == 3
+            assert "concurrency_limit" not in metrics
+
+            release.set()
+            assert await asyncio.gather(*tasks) == ["0", "1", "2"]
+            metrics = call.metrics()
+            assert metrics["completed"] == 3
+            assert metrics["max_wait_time"] >= metrics["avg_wait_time"] > 0
+        finally:
+            await call.shutdown()
+
+    async def test_rate_limited_calls_shrink_concurrency(self):
+        @priority_limit_async_func_call(4, adaptive_concurrency=True, queue_name="test")
+        async def call(prompt):
+            raise RateLimitError("slow down")
+
+        try:
+            with pytest.raises(RateLimitError):
+                await call("a")
+            metrics = call.metrics()
+            assert metrics["failed"] == 1
+            assert metrics["concurrency_limit"] == 2
+            assert metrics["rate_limited"] == 1
+        finally:
+            await call.shutdown()
@@ -0,0 +1,127 @@
+"""
+Test suite for rerank bindings
+
+This test verifies:
+1. The local reranker orders documents by score and honours top_n
+2. Local scores are cached per (query, chunk id) and only new chunks are scored
+3. apply_rerank_if_enabled passes chunk ids only to rerankers that accept them
+4. Remote rerank calls reuse one pooled aiohttp session
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import pytest
+
+from lightrag.llm import client_pool
+from lightrag.llm.client_pool import close_pooled_clients, get_aiohttp_session
+from lightrag.rerank import LocalCrossEncoderReranker, generic_rerank_api
+from lightrag.utils import apply_rerank_if_enabled
+
+
+class CountingReranker(LocalCrossEncoderReranker):
+    """Scores a document by how many query words it contains, without a model"""
+
+    def __init__(self, **kwargs):
+        super().__init__(model="test-model", **kwargs)
+        self.scored = []
+
+    def predict(self, pairs):
+        self.scored.extend(doc for _, doc in pairs)
+        return [
+            float(sum(word in doc for word in query.split())) for query, doc in pairs
+        ]
+
+
+@pytest.mark.offline
+class TestLocalReranker:
+    async def test_orders_by_score(self):
+        reranker = CountingReranker(cache_size=0)
+        docs = ["nothing here", "capital of France", "France"]
+        results = await reranker("capital of France", docs, top_n=2)
+        assert [r["index"] for r in results] == [1, 2]
+        assert results[0]["relevance_score"] == 3.0
+        assert await reranker("q", []) == []
+
+    async def test_scores_cached_by_chunk_id(self):
+        reranker = CountingReranker(cache_size=100)
+        await reranker("paris", ["a paris", "b"], document_ids=["c1", "c2"])
+        results = await reranker(
+            "paris", ["a paris", "b", "paris"], document_ids=["c1", "c2", "c3"]
+        )
+        assert reranker.scored == ["a paris", "b", "paris"]
+        assert [r["index"] for r in results][2] == 1
+        assert reranker.score_cache.stats()["hits"] == 2
+
+        # Another query does not reuse the cached scores
+        await reranker("london", ["a paris"], document_ids=["c1"])
+        assert reranker.scored[-1] == "a paris"
+
+    async def test_apply_rerank_passes_chunk_ids(self):
+        reranker = CountingReranker(cache_size=100)
+        docs = [
+            {"chunk_id": "chunk-1", "content": "red apple"},
+            {"chunk_id": "chunk-2", "content": "apple"},
+        ]
+        config = {"rerank_model_func": reranker}
+        reranked = await apply_rerank_if_enabled("red apple", docs, config)
+        assert [d["chunk_id"] for d in reranked] == ["chunk-1", "chunk-2"]
+        assert sorted(key.split(":")[1] for key in reranker.score_cache._entries) == [
+            "chunk-1",
+            "chunk-2",
+        ]
+
+        seen = {}
+
+        async def remote_rerank(query, documents, top_n=None):
+            seen["documents"] = documents
+            return [{"index": 1, "relevance_score": 0.9}]
+
+        config = {"rerank_model_func": remote_rerank}
+        reranked = await apply_rerank_if_enabled("apple", docs, config)
+        assert seen["documents"] == ["red apple", "apple"]
+        assert reranked[0]["chunk_id"] == "chunk-2"
+
+
+@pytest.mark.offline
+class TestRemoteRerankSession:
+    async def test_requests_share_pooled_session(self):
+        web = pytest.importorskip("aiohttp.web")
+        client_pool._pooled_clients.clear()
+
+        async def handler(request):
+            payload = await request.json()
+            return web.json_response(
+                {
+                    "results": [
+                        {"index": i, "relevance_score": 1.0 / (i + 1)}
+                        for i in range(len(payload["documents"]))
+                    ]
+                }
+            )
+
+        app = web.Application()
+        app.router.add_post("/rerank", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            url = f"http://127.0.0.1:{port}/rerank"
+            first = await generic_rerank_api("q", ["a", "b"], "m", url, None)
+            session = get_aiohttp_session("rerank")
+            second = await generic_rerank_api("q", ["a"], "m", url, None)
+            assert get_aiohttp_session("rerank") is session
+            assert first == [
+                {"index": 0, "relevance_score": 1.0},
+                {"index": 1, "relevance_score": 0.5},
+            ]
+            assert len(second) == 1
+        finally:
+            await close_pooled_clients()
+            await runner.cleanup()
+        assert session.closed
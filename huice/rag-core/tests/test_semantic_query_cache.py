@@ -0,0 +1,146 @@
+"""
+Test suite for the semantic query cache of LightRAG.aquery_llm
+
+This test verifies:
+1. Near-duplicate queries with the same query parameters reuse the cached answer
+2. Cached answers are scoped per mode and query parameters
+3. Expired answers are not served
+4. aclear_cache and knowledge base changes drop the semantic cache
+5. The lookup's query embedding is reused by the query
+6. A storage that cannot hold the cache disables it with a single warning
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pytest
+
+import lightrag.lightrag as lightrag_module
+from lightrag import LightRAG, QueryParam
+from lightrag.base import QueryResult
+from lightrag.utils import EmbeddingFunc
+
+
+async def letter_embedding(texts: list[str], **kwargs) -> np.ndarray:
+    """Letter histogram, so rephrasings with the same words are near-identical"""
+    vectors = np.zeros((len(texts), 26), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for ch in text.lower():
+            if "a" <= ch <= "z":
+                vectors[row, ord(ch) - ord("a")] += 1
+    return vectors
+
+
+async def mock_llm(prompt, system_prompt=None, history_messages=None, **kwargs):
+    return "llm answer"
+
+
+@pytest.fixture
+async def rag(monkeypatch, shared_data, char_tokenizer):
+    working_dir = tempfile.mkdtemp(prefix="semantic_cache_test_")
+    instance = LightRAG(
+        working_dir=working_dir,
+        llm_model_func=mock_llm,
+        embedding_func=EmbeddingFunc(embedding_dim=26, func=letter_embedding),
+        tokenizer=char_tokenizer,
+        embedding_cache_config={"enabled": True, "similarity_threshold": 0.95},
+    )
+    await instance.initialize_storages()
+
+    calls = []
+    embeddings = []
+
+    async def fake_naive_query(query, *args, **kwargs):
+        calls.append(query)
+        embeddings.append(kwargs.get("query_embedding"))
+        return QueryResult(
+            content=f"answer {len(calls)}",
+            raw_data={"status": "success", "data": {"query": query}, "metadata": {}},
+        )
+
+    monkeypatch.setattr(lightrag_module, "naive_query", fake_naive_query)
+    instance.naive_calls = calls
+    instance.naive_embeddings = embeddings
+    yield instance
+    await instance.finalize_storages()
+    shutil.rmtree(working_dir, ignore_errors=True)
+
+
+@pytest.mark.offline
+class TestSemanticQueryCache:
+    async def test_paraphrase_reuses_cached_answer(self, rag):
+        param = QueryParam(mode="naive")
+        first = await rag.aquery_llm("What is the capital city of France?", param)
+        second = await rag.aquery_llm("what is the capital city of france", param)
+
+        assert rag.naive_calls == ["What is the capital city of France?"]
+        assert second["llm_response"]["content"] == first["llm_response"]["content"]
+        assert second["data"] == {"query": "What is the capital city of France?"}
+
+        await rag.aquery_llm("Explain how photosynthesis works in plants", param)
+        assert len(rag.naive_calls) == 2
+
+    async def test_cache_is_scoped_by_query_params(self, rag):
+        await rag.aquery_llm("capital of France", QueryParam(mode="naive"))
+        await rag.aquery_llm(
+            "capital of France", QueryParam(mode="naive", response_type="Bullet Points")
+        )
+        await rag.aquery_llm("capital of France", QueryParam(mode="naive", stream=True))
+        assert len(rag.naive_calls) == 3
+
+    async def test_expired_answers_are_not_served(self, rag, monkeypatch):
+        rag.embedding_cache_config["ttl"] = 60
+        await rag.aquery_llm("capital of France", QueryParam(mode="naive"))
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 120)
+        await rag.aquery_llm("capital of France", QueryParam(mode="naive"))
+        assert len(rag.naive_calls) == 2
+
+    async def test_clear_cache_drops_semantic_cache(self, rag):
+        await rag.aquery_llm("capital of France", QueryParam(mode="naive"))
+        await rag.aclear_cache()
+        await rag.aquery_llm("capital of France", QueryParam(mode="naive"))
+        assert len(rag.naive_calls) == 2
+
+    async def test_insert_and_graph_edits_drop_semantic_cache(self, rag):
+        param = QueryParam(mode="naive")
+        await rag.aquery_llm("capital of France", param)
+        await rag.ainsert("Paris is the capital of France.")
+        await rag.aquery_llm("capital of France", param)
+        assert len(rag.naive_calls) == 2
+
+        await rag.acreate_entity("Paris", {"description": "Capital of France"})
+        await rag.aquery_llm("capital of France", param)
+        assert len(rag.naive_calls) == 3
+
+    async def test_lookup_embedding_is_reused(self, rag):
+        await rag.aquery_llm("capital of France", QueryParam(mode="naive"))
+        expected = await letter_embedding(["capital of France"])
+        assert np.allclose(rag.naive_embeddings[0], expected[0])
+
+    async def test_unsupported_storage_disables_cache(self, rag, monkeypatch):
+        async def unsupported(*args, **kwargs):
+            raise ValueError("query_cache is not supported")
+
+        monkeypatch.setattr(rag.query_cache_vdb, "query", unsupported)
+        warnings = []
+        monkeypatch.setattr(
+            lightrag_module.logger,
+            "warning",
+            lambda message, *args, **kwargs: warnings.append(message),
+        )
+        param = QueryParam(mode="naive")
+        await rag.aquery_llm("capital of France", param)
+        await rag.aquery_llm("capital of France", param)
+
+        assert rag.query_cache_vdb is None
+        assert len(rag.naive_calls) == 2
+        assert len([m for m in warnings if "Semantic query cache disabled" in m]) == 1
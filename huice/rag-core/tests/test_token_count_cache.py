@@ -0,0 +1,191 @@
+"""
+Test suite for stored and cached token counts
+
+This test verifies:
+1. Merged entities and relations are stored with the token count of their description
+2. Query-time truncation uses the stored counts instead of tokenizing descriptions
+3. Texts without a stored count are tokenized once per process through the LRU cache
+4. Merging or editing graph data resets a stale stored count to unknown
+"""
+
+"""
+Copyright (c) 2025 Dean Wu. All rights reserved.
+AuroraAI Project.
+"""
+
+
+import pytest
+
+from lightrag.base import QueryParam
+from lightrag.operate import (
+    _apply_token_truncation,
+    _merge_edges_then_upsert,
+    _merge_nodes_then_upsert,
+)
+from lightrag.utils import (
+    Tokenizer,
+    TokenizerInterface,
+    count_tokens,
+    stored_description_tokens,
+    truncate_list_by_token_size,
+)
+from lightrag.utils_graph import _merge_attributes
+
+
+class CountingTokenizer(TokenizerInterface):
+    """One token per character, recording every encoded text"""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, content: str):
+        self.encoded.append(content)
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens):
+        return "".join(chr(token) for token in tokens)
+
+
+class MemoryGraph:
+    def __init__(self):
+        self.nodes = {}
+        self.edges = {}
+
+    async def get_node(self, node_id):
+        return self.nodes.get(node_id)
+
+    async def has_node(self, node_id):
+        return node_id in self.nodes
+
+    async def upsert_node(self, node_id, node_data):
+        self.nodes[node_id] = {**self.nodes.get(node_id, {}), **node_data}
+
+    async def has_edge(self, src, tgt):
+        return (src, tgt) in self.edges
+
+    async def get_edge(self, src, tgt):
+        return self.edges.get((src, tgt))
+
+    async def upsert_edge(self, src, tgt, edge_data):
+        self.edges[(src, tgt)] = dict(edge_data)
+
+
+def make_tokenizer():
+    return Tokenizer(model_name="counting", tokenizer=CountingTokenizer())
+
+
+@pytest.mark.offline
+class TestStoredDescriptionTokens:
+    async def test_merge_stores_description_tokens(self):
+        graph = MemoryGraph()
+        tokenizer = make_tokenizer()
+        config = {
+            "tokenizer": tokenizer,
+            "max_source_ids_per_entity": 100,
+            "max_source_ids_per_relation": 100,
+            "source_ids_limit_method": "FIFO",
+            "max_file_paths": 100,
+        }
+        node = await _merge_nodes_then_upsert(
+            "Zorblat",
+            [
+                {
+                    "entity_type": "person",
+                    "description": "A pilot.",
+                    "source_id": "chunk-1",
+                    "file_path": "a.md",
+                }
+            ],
+            graph,
+            None,
+            config,
+        )
+        assert node["description_tokens"] == len("A pilot.")
+        assert graph.nodes["Zorblat"]["description_tokens"] == 8
+
+        graph.nodes["Quixa"] = {**graph.nodes["Zorblat"], "entity_id": "Quixa"}
+        await _merge_edges_then_upsert(
+            "Zorblat",
+            "Quixa",
+            [
+                {
+                    "description": "Flies with Quixa.",
+                    "keywords": "flight",
+                    "source_id": "chunk-1",
+                    "file_path": "a.md",
+                    "weight": 1.0,
+                }
+            ],
+            graph,
+            None,
+            None,
+            config,
+        )
+        edge = graph.edges[("Zorblat", "Quixa")]
+        assert stored_description_tokens(edge) == len("Flies with Quixa.")
+
+    async def test_truncation_uses_stored_counts(self):
+        tokenizer = make_tokenizer()
+        entities = [
+            {
+                "entity_name": f"E{i}",
+                "entity_type": "thing",
+                "description": "d" * 50,
+                "description_tokens": 50,
+            }
+            for i in range(5)
+        ]
+        relations = [
+            {
+                "src_id": "E0",
+                "tgt_id": "E1",
+                "description": "r" * 40,
+                "description_tokens": 40,
+            }
+        ]
+        result = await _apply_token_truncation(
+            {"final_entities": entities, "final_relations": relations},
+            QueryParam(max_entity_tokens=250, max_relation_tokens=100),
+            {"tokenizer": tokenizer},
+        )
+        # Each entry costs its description plus ~50 tokens of JSON around it
+        assert len(result["entities_context"]) == 2
+        assert len(result["relations_context"]) == 1
+        encoded = tokenizer.tokenizer.encoded
+        assert encoded and not any("d" * 50 in text for text in encoded)
+
+
+@pytest.mark.offline
+class TestTokenCountCache:
+    def test_repeated_texts_are_tokenized_once(self):
+        tokenizer = make_tokenizer()
+        texts = ["alpha text", "beta text", "alpha text"]
+        for _ in range(3):
+            kept = truncate_list_by_token_size(
+                texts, key=lambda x: x, max_token_size=100, tokenizer=tokenizer
+            )
+            assert kept == texts
+        assert sorted(tokenizer.tokenizer.encoded) == ["alpha text", "beta text"]
+        assert count_tokens("alpha text", tokenizer) == 10
+
+        kept = truncate_list_by_token_size(
+            texts,
+            key=lambda x: x,
+            max_token_size=15,
+            tokenizer=tokenizer,
+            token_count=lambda x: 5,
+        )
+        assert kept == texts
+
+    def test_stale_counts_are_reset(self):
+        merged = _merge_attributes(
+            [
+                {"description": "a", "description_tokens": 1},
+                {"description": "b", "description_tokens": 1},
+            ],
+            {"description": "concatenate"},
+        )
+        assert merged["description"] == "a<SEP>b"
+        assert stored_description_tokens(merged) is None
+        assert stored_description_tokens({"description_tokens": "12"}) == 12
+        assert stored_description_tokens({}) is None